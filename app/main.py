@@ -2,26 +2,101 @@
 Main FastAPI application setup.
 """
 
+import asyncio
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from app.routers import providers
+from app.routers import calls, metrics, providers, status
+from app.services.provider_service import (
+    call_api_client,
+    call_registry,
+    call_scheduler,
+    care_compare_client,
+    job_store,
+    llm_client,
+    provider_store,
+    specialty_router,
+    symptom_cache,
+)
+from app.services.startup import startup_state, warm_up
+from app.utils.constants import (
+    CALL_POLL_INTERVAL_SECONDS,
+    CALL_WEBHOOK_SECRET,
+    CALL_WEBHOOK_URL,
+    PROVIDER_SNAPSHOT_REFRESH_SECONDS,
+    PROVIDER_SOURCE,
+    WARMUP_CONCURRENCY,
+    WARMUP_RADIUS,
+    WARMUP_ZIP_CODES,
+)
+from app.utils.logging_config import RequestIdMiddleware, configure_logging, stop_logging
 
 # Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler()],
-)
+configure_logging()
 logger = logging.getLogger("provider_finder")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks."""
+    # Anyone could otherwise forge call transcripts through the webhook
+    if CALL_WEBHOOK_URL and not CALL_WEBHOOK_SECRET:
+        raise RuntimeError("CALL_WEBHOOK_SECRET must be set when CALL_WEBHOOK_URL is")
+    # Load indexes and warm caches in the background; /ready reports when
+    # they are done so requests never pay for a cold start
+    warm_up_task = asyncio.create_task(
+        warm_up(
+            startup_state,
+            WARMUP_ZIP_CODES,
+            WARMUP_RADIUS,
+            PROVIDER_SOURCE,
+            WARMUP_CONCURRENCY,
+        )
+    )
+    # Keep rebuilding the local provider index whenever the snapshot changes
+    refresh_task = asyncio.create_task(
+        provider_store.run_refresh_loop(PROVIDER_SNAPSHOT_REFRESH_SECONDS)
+    )
+
+    # Calls are completed by webhooks; this only checks on overdue ones
+    poller_task = asyncio.create_task(
+        call_registry.run_fallback_poller(
+            call_api_client.get_call, CALL_POLL_INTERVAL_SECONDS
+        )
+    )
+    yield
+
+    warm_up_task.cancel()
+    refresh_task.cancel()
+    poller_task.cancel()
+    await job_store.aclose()
+    await call_scheduler.aclose()
+    await specialty_router.flush_decision_log()
+    try:
+        await asyncio.to_thread(symptom_cache.save)
+    except Exception as e:
+        logger.error("Failed to persist symptom cache: %s", e)
+    # Release pooled upstream connections
+    await llm_client.aclose()
+    await call_api_client.aclose()
+    await care_compare_client.aclose()
+    # Flush queued log records
+    stop_logging()
+
+
 app = FastAPI(
     title="Provider Finder API",
     description="API for finding and connecting with healthcare providers",
     version="1.0.0",
+    lifespan=lifespan,
 )
+app.add_middleware(RequestIdMiddleware)
 
 # Include routers
 app.include_router(providers.router)
+app.include_router(calls.router)
+app.include_router(status.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -147,3 +147,14 @@ class Request(BaseModel):
     patient_info: PatientInfo = Field(..., alias="patientInfo")
     symptom_description: Optional[str] = Field(None, alias="symptomDescription")
     radius: Optional[float] = Field(25.0, alias="radius")
+
+
+class RecommendationJob(BaseModel):
+    """Status and results so far of a background recommendation job."""
+
+    job_id: str
+    status: str  # "running", "complete" or "failed"
+    recommendations: List[Dict] = []
+    error: Optional[str] = None
+    created_at: float
+    completed_at: Optional[float] = None
@@ -0,0 +1,62 @@
+"""
+API routes for outbound call callbacks.
+"""
+
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Body, Header, HTTPException
+
+from app.services.provider_service import (
+    call_registry,
+    call_scheduler,
+    transcript_batcher,
+    transcript_fast_path,
+)
+from app.utils.constants import CALL_WEBHOOK_SECRET
+
+router = APIRouter(
+    prefix="/calls",
+    tags=["calls"],
+)
+
+
+@router.post("/webhook")
+async def receive_call_webhook(
+    call: dict = Body(...),
+    x_webhook_secret: Optional[str] = Header(default=None),
+):
+    """
+    Receive a call-completion event from the call API.
+
+    Args:
+        call: The completed call record, including its pathway logs
+
+    Returns:
+        Whether a waiting call worker was woken up
+    """
+    if CALL_WEBHOOK_SECRET and not hmac.compare_digest(
+        x_webhook_secret or "", CALL_WEBHOOK_SECRET
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook secret")
+    call_id = call.get("call_id") or call.get("c_id")
+    if not call_id:
+        raise HTTPException(status_code=400, detail="Missing call_id")
+    return {"delivered": call_registry.resolve(call_id, call)}
+
+
+@router.get("/stats")
+async def get_call_stats():
+    """
+    Report call scheduling and completion counters.
+
+    Returns:
+        Scheduler queue and concurrency counters, pending calls and how
+        completed calls were detected, and how transcripts were extracted
+    """
+    return {
+        "scheduler": call_scheduler.stats(),
+        "registry": call_registry.stats(),
+        "transcript_fast_path": transcript_fast_path.stats(),
+        "transcript_batcher": transcript_batcher.stats(),
+    }
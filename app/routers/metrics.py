@@ -0,0 +1,105 @@
+"""
+Prometheus metrics endpoint.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.services.provider_service import (
+    call_registry,
+    call_scheduler,
+    dependency_guards,
+    job_store,
+    provider_search_cache,
+    request_flights,
+    specialty_router,
+    symptom_cache,
+    transcript_batcher,
+    transcript_fast_path,
+)
+from app.utils.logging_config import log_stats
+from app.utils.metrics import CONTENT_TYPE, registry, stats_families
+from app.utils.resilience import CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN
+
+router = APIRouter(tags=["status"])
+
+
+def _collect_components():
+    yield from stats_families(
+        "provider_finder_cache", provider_search_cache.stats(), {"cache": "provider_search"}
+    )
+    yield from stats_families("provider_finder_cache", symptom_cache.stats(), {"cache": "symptom"})
+    router_stats = specialty_router.stats()
+    yield (
+        "provider_finder_specialty_routes_total",
+        "counter",
+        "Symptom descriptions answered by each specialty routing tier",
+        [({"tier": tier}, float(count)) for tier, count in router_stats["tiers"].items()],
+    )
+    yield from stats_families(
+        "provider_finder_specialty_router",
+        {key: value for key, value in router_stats.items() if key != "tiers"},
+    )
+    for name, flight in request_flights.items():
+        yield from stats_families("provider_finder_coalescing", flight.stats(), {"operation": name})
+    for name, guard in dependency_guards.items():
+        stats = guard.stats()
+        yield from stats_families("provider_finder_dependency", stats, {"dependency": name})
+        yield (
+            "provider_finder_dependency_circuit_state",
+            "gauge",
+            "1 for the current circuit breaker state of each dependency",
+            [
+                ({"dependency": name, "state": state}, float(stats["circuit"]["state"] == state))
+                for state in (CIRCUIT_CLOSED, CIRCUIT_HALF_OPEN, CIRCUIT_OPEN)
+            ],
+        )
+    yield from stats_families("provider_finder_call_scheduler", call_scheduler.stats())
+    yield from stats_families("provider_finder_call_registry", call_registry.stats())
+    yield from stats_families("provider_finder_transcript_fast_path", transcript_fast_path.stats())
+    yield from stats_families("provider_finder_transcript_batcher", transcript_batcher.stats())
+    yield (
+        "provider_finder_jobs",
+        "gauge",
+        "Stored background recommendation jobs by status",
+        [({"status": status}, float(count)) for status, count in job_store.stats().items()],
+    )
+    logs = log_stats()
+    yield (
+        "provider_finder_log_records_dropped_total",
+        "counter",
+        "Log records dropped by sampling or rate limiting",
+        [
+            ({"logger": name, "reason": reason}, float(count))
+            for reason, counts in logs["dropped"].items()
+            for name, count in counts.items()
+        ],
+    )
+    yield (
+        "provider_finder_log_queue_full_total",
+        "counter",
+        "Log records dropped because the log queue was full",
+        [({}, float(logs["queue_full"]))],
+    )
+    yield (
+        "provider_finder_log_queued",
+        "gauge",
+        "Log records waiting to be written",
+        [({}, float(logs["queued"]))],
+    )
+
+
+registry.add_collector(_collect_components)
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """
+    Export metrics in the Prometheus text format.
+
+    Returns:
+        Stage latency histograms and in-flight gauges, upstream response
+        status counts, and cache, coalescing, circuit breaker and call
+        counters
+    """
+    return Response(content=registry.render(), media_type=CONTENT_TYPE)
@@ -2,17 +2,37 @@
 API routes for provider finder operations.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from app.models.schemas import (
     ProviderInfo,
     ProviderConfirmationInfo,
     ProviderRecommendations,
     PatientInfo,
+    RecommendationJob,
     Request,
 )
-from app.services.provider_service import recommend_providers, connect_providers
-import asyncio
+from app.services.call_scheduler import SchedulerBusyError
+from app.services.jobs import JobLimitError
+from app.services.provider_service import (
+    gather_or_cancel,
+    iter_recommendation_events,
+    job_store,
+    recommend_providers,
+    connect_providers,
+    provider_search_cache,
+    specialty_router,
+    symptom_cache,
+)
+from app.utils.constants import CALL_BUSY_RETRY_AFTER_SECONDS
+from app.utils.pipeline import server_timing_header
+from app.utils.serialization import (
+    dump_recommendations,
+    dumps,
+    encode_response,
+    parse_fields,
+)
 
 router = APIRouter(
     prefix="/providers",
@@ -24,20 +44,34 @@ router = APIRouter(
 @router.post("/recommend", response_model=List[ProviderRecommendations])
 async def get_provider_recommendations(
     request: Request,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated provider fields to return, e.g. "
+        "name,distance,physician.phone. Defaults to every field.",
+    ),
+    accept: Optional[str] = Header(None),
+    accept_encoding: Optional[str] = Header(None),
 ):
     """
     Recommend providers based on zip code and optional symptoms.
 
+    Per-stage timings of the recommendation are returned in the
+    Server-Timing header. The body is msgpack if the client accepts
+    application/msgpack, and large bodies are compressed with brotli or
+    gzip when accepted.
+
     Args:
         zip_code: Patient's zip code
         symptom_description: Description of patient's symptoms
-        radius: Search radius in kilometers
+        radius: Search radius in miles
+        fields: Provider fields to include in the response
 
     Returns:
         List of recommended providers
     """
+    timings = {}
     provider_recommendations = await recommend_providers(
-        request.zip_code, request.symptom_description, request.radius
+        request.zip_code, request.symptom_description, request.radius, timings=timings
     )
 
     if not provider_recommendations:
@@ -45,13 +79,93 @@ async def get_provider_recommendations(
             status_code=404,
             detail="No providers found matching your criteria. Try expanding your search radius.",
         )
-    confirmations = await asyncio.gather(
-        *[
-            connect_providers_worker(idx, provider_recommendation, request.patient_info)
-            for idx, provider_recommendation in enumerate(provider_recommendations)
-        ]
+    try:
+        confirmations = await gather_or_cancel(
+            *[
+                connect_providers_worker(idx, provider_recommendation, request.patient_info)
+                for idx, provider_recommendation in enumerate(provider_recommendations)
+            ]
+        )
+    except SchedulerBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many provider calls are waiting. Please try again later.",
+            headers={"Retry-After": str(CALL_BUSY_RETRY_AFTER_SECONDS)},
+        )
+    return encode_response(
+        dump_recommendations(confirmations, parse_fields(fields)),
+        accept=accept,
+        accept_encoding=accept_encoding,
+        headers={"Server-Timing": server_timing_header(timings)},
     )
-    return confirmations
+
+
+@router.post("/recommend/stream")
+async def stream_provider_recommendations(request: Request):
+    """
+    Recommend and connect providers, streaming progress as NDJSON.
+
+    Emits one JSON object per line: a "recommendation" event per specialty
+    as soon as its providers are selected, a "confirmation" event per
+    provider call as it resolves, then "done" (or "error" if nothing was
+    found).
+
+    Returns:
+        application/x-ndjson stream of events
+    """
+    events = iter_recommendation_events(
+        request.zip_code,
+        request.symptom_description,
+        request.radius,
+        request.patient_info,
+    )
+    return StreamingResponse(
+        (dumps(event) + b"\n" async for event in events),
+        media_type="application/x-ndjson",
+    )
+
+
+@router.post("/recommend/jobs", response_model=RecommendationJob, status_code=202)
+async def submit_provider_recommendation_job(request: Request):
+    """
+    Recommend and connect providers in the background.
+
+    Returns immediately. Poll GET /providers/recommend/jobs/{job_id} for
+    recommendations and call confirmations as they come in.
+
+    Returns:
+        The new job, including its ID
+    """
+    events = iter_recommendation_events(
+        request.zip_code,
+        request.symptom_description,
+        request.radius,
+        request.patient_info,
+    )
+    try:
+        return job_store.submit(events)
+    except JobLimitError:
+        await events.aclose()
+        raise HTTPException(
+            status_code=503,
+            detail="Too many recommendation jobs are running. Please try again later.",
+            headers={"Retry-After": str(CALL_BUSY_RETRY_AFTER_SECONDS)},
+        )
+
+
+@router.get("/recommend/jobs/{job_id}", response_model=RecommendationJob)
+async def get_provider_recommendation_job(job_id: str):
+    """
+    Report the progress of a background recommendation job.
+
+    Returns:
+        Job status with the recommendations so far; confirmations that are
+        still pending are null
+    """
+    job = job_store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
 
 
 async def connect_providers_worker(
@@ -80,10 +194,42 @@ async def connect_to_providers(
     Returns:
         List of provider confirmation details
     """
-    confirmations = await connect_providers(selected_providers, patientInfo)
+    try:
+        confirmations = await connect_providers(selected_providers, patientInfo)
+    except SchedulerBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many provider calls are waiting. Please try again later.",
+            headers={"Retry-After": str(CALL_BUSY_RETRY_AFTER_SECONDS)},
+        )
     if not confirmations:
         raise HTTPException(
             status_code=400,
             detail="Failed to connect with providers. Please try again later.",
         )
     return confirmations
+
+
+@router.get("/cache/stats")
+async def get_provider_cache_stats():
+    """
+    Report cache counters.
+
+    Returns:
+        Hit, miss and eviction counts plus current size per cache
+    """
+    return {
+        "provider_search": provider_search_cache.stats(),
+        "symptom": symptom_cache.stats(),
+    }
+
+
+@router.get("/specialty-router/stats")
+async def get_specialty_router_stats():
+    """
+    Report which specialty routing tier answered how many requests.
+
+    Returns:
+        Per-tier answer counts and the share that reached the LLM
+    """
+    return specialty_router.stats()
@@ -0,0 +1,48 @@
+"""
+API routes reporting the health of upstream dependencies.
+"""
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.services.provider_service import dependency_guards, request_flights
+from app.services.startup import startup_state
+from app.utils.resilience import CIRCUIT_CLOSED, guard_stats
+
+router = APIRouter(tags=["status"])
+
+
+@router.get("/status")
+async def get_status():
+    """
+    Report circuit breaker and concurrency limiter state per upstream dependency.
+
+    Returns:
+        "degraded" if any circuit is not closed, plus per-dependency details
+        and how many identical in-flight requests were coalesced
+    """
+    dependencies = guard_stats(dependency_guards)
+    degraded = any(
+        dependency["circuit"]["state"] != CIRCUIT_CLOSED
+        for dependency in dependencies.values()
+    )
+    return {
+        "status": "degraded" if degraded else "ok",
+        "dependencies": dependencies,
+        "coalescing": {name: flight.stats() for name, flight in request_flights.items()},
+    }
+
+
+@router.get("/ready")
+async def get_ready():
+    """
+    Report whether startup warm-up has finished.
+
+    Returns:
+        200 once every required startup step succeeded, 503 while starting
+        or after a required step failed; either way with per-step timings
+    """
+    return JSONResponse(
+        content=startup_state.stats(),
+        status_code=200 if startup_state.ready else 503,
+    )
@@ -0,0 +1,184 @@
+"""
+Registry of in-flight outbound calls awaiting completion.
+
+Call completion normally arrives through the webhook endpoint. Calls whose
+webhook is overdue are covered by a single fallback poller instead of one
+polling loop per call.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger("provider_finder.call_registry")
+
+
+def is_call_complete(call: dict) -> bool:
+    """Return True if a call record describes a finished call."""
+    return call.get("completed") is True or call.get("queue_status") == "complete"
+
+
+class _PendingCall:
+    __slots__ = ("future", "poll_after")
+
+    def __init__(self, future: asyncio.Future, poll_after: float):
+        self.future = future
+        self.poll_after = poll_after
+
+
+class CallRegistry:
+    """Maps pending call IDs to futures resolved by webhooks or the fallback poller."""
+
+    def __init__(
+        self,
+        webhook_grace_seconds: float = 15.0,
+        early_result_ttl_seconds: float = 300.0,
+        max_early_results: int = 1000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            webhook_grace_seconds: How long after registration a call may go
+                without a webhook before the fallback poller checks on it
+            early_result_ttl_seconds: How long to keep webhooks that arrive
+                before their call is registered
+            max_early_results: Most early webhooks kept; the oldest are
+                dropped first
+            clock: Monotonic time source, injectable for tests
+        """
+        self.webhook_grace_seconds = webhook_grace_seconds
+        self.early_result_ttl_seconds = early_result_ttl_seconds
+        self.max_early_results = max_early_results
+        self._clock = clock
+        self._pending: Dict[str, _PendingCall] = {}
+        self._early: Dict[str, Tuple[dict, float]] = {}
+        self.resolved_by_webhook = 0
+        self.resolved_by_poll = 0
+        self.timeouts = 0
+        self.polls = 0
+
+    def register(self, call_id: str) -> asyncio.Future:
+        """
+        Start tracking a call.
+
+        Returns:
+            Future resolved with the call record once the call completes
+        """
+        pending = self._pending.get(call_id)
+        if pending is not None:
+            return pending.future
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[call_id] = _PendingCall(
+            future, self._clock() + self.webhook_grace_seconds
+        )
+        early = self._early.pop(call_id, None)
+        if early is not None:
+            future.set_result(early[0])
+        return future
+
+    def resolve(self, call_id: str, call: dict, source: str = "webhook") -> bool:
+        """
+        Deliver the final record of a call.
+
+        Args:
+            call_id: The call ID
+            call: The call record
+            source: "webhook" or "poll", for the counters
+
+        Returns:
+            True if a waiting worker was woken up
+        """
+        pending = self._pending.get(call_id)
+        if pending is None or pending.future.done():
+            # The webhook can beat the worker's registration; keep it briefly
+            self._prune_early()
+            self._early.pop(call_id, None)
+            while self._early and len(self._early) >= self.max_early_results:
+                # Dicts keep insertion order, so this is the oldest
+                del self._early[next(iter(self._early))]
+            self._early[call_id] = (call, self._clock() + self.early_result_ttl_seconds)
+            return False
+        pending.future.set_result(call)
+        if source == "poll":
+            self.resolved_by_poll += 1
+        else:
+            self.resolved_by_webhook += 1
+        return True
+
+    def _prune_early(self):
+        now = self._clock()
+        for call_id in [k for k, (_, expires) in self._early.items() if expires <= now]:
+            del self._early[call_id]
+
+    async def wait(self, call_id: str, timeout: float) -> Optional[dict]:
+        """
+        Wait for a call to complete.
+
+        Returns:
+            The call record, or None if it did not complete within the timeout
+        """
+        future = self.register(call_id)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            return None
+        finally:
+            self._pending.pop(call_id, None)
+
+    def overdue(self) -> List[str]:
+        """Return pending calls whose webhook grace period has passed."""
+        now = self._clock()
+        return [
+            call_id
+            for call_id, pending in self._pending.items()
+            if pending.poll_after <= now and not pending.future.done()
+        ]
+
+    async def poll_overdue(
+        self, fetch_call: Callable[[str], Awaitable[dict]], max_batch: int = 50
+    ) -> int:
+        """
+        Fetch overdue calls in one concurrent batch and resolve finished ones.
+
+        Returns:
+            Number of calls resolved
+        """
+        call_ids = self.overdue()[:max_batch]
+        if not call_ids:
+            return 0
+        self.polls += len(call_ids)
+        calls = await asyncio.gather(
+            *[fetch_call(call_id) for call_id in call_ids], return_exceptions=True
+        )
+        resolved = 0
+        for call_id, call in zip(call_ids, calls):
+            if isinstance(call, Exception):
+                logger.warning("Polling call %s failed: %s", call_id, call)
+                continue
+            if is_call_complete(call) and self.resolve(call_id, call, source="poll"):
+                resolved += 1
+        return resolved
+
+    async def run_fallback_poller(
+        self, fetch_call: Callable[[str], Awaitable[dict]], interval_seconds: float
+    ):
+        """Poll overdue calls every interval until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.poll_overdue(fetch_call)
+            except Exception as e:
+                logger.error("Fallback call poller failed: %s", e)
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "early_results": len(self._early),
+            "resolved_by_webhook": self.resolved_by_webhook,
+            "resolved_by_poll": self.resolved_by_poll,
+            "timeouts": self.timeouts,
+            "polls": self.polls,
+        }
@@ -0,0 +1,254 @@
+"""
+Central scheduler for outbound provider calls.
+
+Every call goes through one scheduler so call throughput is governed by
+explicit limits: a global cap on concurrent calls, at most a few calls at a
+time to any one clinic phone number with a minimum gap between them, and a
+priority order for what runs next. The queue is bounded in length and in
+how long a call may wait, so callers fail fast with SchedulerBusyError
+instead of waiting behind every other request for the same numbers.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("provider_finder.call_scheduler")
+
+
+class SchedulerBusyError(Exception):
+    """The call queue is full, or a call waited too long to start."""
+
+
+class _ScheduledCall:
+    __slots__ = (
+        "priority", "seq", "phone_number", "factory", "future", "queued_at", "expiry"
+    )
+
+    def __init__(
+        self,
+        priority: int,
+        seq: int,
+        phone_number: str,
+        factory: Callable[[], Awaitable[Any]],
+        future: asyncio.Future,
+        queued_at: float,
+    ):
+        self.priority = priority
+        self.seq = seq
+        self.phone_number = phone_number
+        self.factory = factory
+        self.future = future
+        self.queued_at = queued_at
+        self.expiry: Optional[asyncio.TimerHandle] = None
+
+
+class CallScheduler:
+    """Priority queue of provider calls drained under global and per-number limits."""
+
+    def __init__(
+        self,
+        max_concurrent: int = 20,
+        per_number_max_concurrent: int = 1,
+        per_number_interval_seconds: float = 30.0,
+        max_queued: Optional[int] = None,
+        max_queue_wait_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_concurrent: Maximum calls in progress across all numbers
+            per_number_max_concurrent: Maximum calls in progress to one number
+            per_number_interval_seconds: Minimum time between starting two
+                calls to the same number
+            max_queued: Calls allowed to wait at once; further submissions
+                are rejected. None for no limit.
+            max_queue_wait_seconds: Calls that have not started within
+                this long are dropped from the queue and fail. None waits
+                indefinitely.
+            clock: Monotonic time source, injectable for tests
+        """
+        self.max_concurrent = max_concurrent
+        self.per_number_max_concurrent = per_number_max_concurrent
+        self.per_number_interval_seconds = per_number_interval_seconds
+        self.max_queued = max_queued
+        self.max_queue_wait_seconds = max_queue_wait_seconds
+        self._clock = clock
+        self._queue: List[_ScheduledCall] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._running_by_number: Dict[str, int] = {}
+        self._last_start_by_number: Dict[str, float] = {}
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks = set()
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_wait_seconds = 0.0
+
+    async def submit(
+        self,
+        phone_number: str,
+        factory: Callable[[], Awaitable[Any]],
+        priority: int = 0,
+    ) -> Any:
+        """
+        Queue a call and wait for its result.
+
+        Args:
+            phone_number: Number being called, used for the per-number limits
+            factory: Returns the coroutine that places the call and waits for it
+            priority: Lower values run first; ties run in submission order
+
+        Returns:
+            Whatever the call coroutine returns
+
+        Raises:
+            SchedulerBusyError: If the queue is full or the call did not
+                start within max_queue_wait_seconds
+        """
+        self._ensure_dispatcher()
+        if self.max_queued is not None and self._queued() >= self.max_queued:
+            self.rejected += 1
+            raise SchedulerBusyError(f"{self._queued()} calls are already queued")
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        call = _ScheduledCall(
+            priority, next(self._seq), phone_number, factory, future, self._clock()
+        )
+        if self.max_queue_wait_seconds is not None:
+            call.expiry = loop.call_later(self.max_queue_wait_seconds, self._expire, call)
+        self._queue.append(call)
+        self._wakeup.set()
+        return await future
+
+    def _queued(self) -> int:
+        return sum(1 for call in self._queue if not call.future.done())
+
+    def _expire(self, call: _ScheduledCall):
+        if call in self._queue and not call.future.done():
+            # Dropped from the queue on the next dispatch pass
+            self.rejected += 1
+            call.future.set_exception(
+                SchedulerBusyError(
+                    f"Call to {call.phone_number} did not start within "
+                    f"{self.max_queue_wait_seconds}s"
+                )
+            )
+            self._wakeup.set()
+
+    def _ensure_dispatcher(self):
+        loop = asyncio.get_running_loop()
+        if (
+            self._dispatcher is None
+            or self._dispatcher.done()
+            or self._dispatcher.get_loop() is not loop
+        ):
+            self._wakeup = asyncio.Event()
+            self._dispatcher = loop.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        while True:
+            self._wakeup.clear()
+            delay = self._start_ready_calls()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _start_ready_calls(self) -> Optional[float]:
+        """
+        Start queued calls in priority order while limits allow.
+
+        Returns:
+            Seconds until a rate-limited call becomes eligible, or None if
+            nothing is waiting on a timer
+        """
+        # Callers that gave up no longer need their call placed
+        self._queue = [call for call in self._queue if not call.future.done()]
+        self._queue.sort(key=lambda call: (call.priority, call.seq))
+        next_delay = None
+        now = self._clock()
+        for number, last_start in list(self._last_start_by_number.items()):
+            if (
+                now - last_start >= self.per_number_interval_seconds
+                and number not in self._running_by_number
+            ):
+                del self._last_start_by_number[number]
+        for call in list(self._queue):
+            if self._running >= self.max_concurrent:
+                break
+            number = call.phone_number
+            if self._running_by_number.get(number, 0) >= self.per_number_max_concurrent:
+                continue
+            last_start = self._last_start_by_number.get(number)
+            if last_start is not None:
+                ready_in = last_start + self.per_number_interval_seconds - now
+                if ready_in > 0:
+                    next_delay = ready_in if next_delay is None else min(next_delay, ready_in)
+                    continue
+            self._queue.remove(call)
+            self._start(call, now)
+        return next_delay
+
+    def _start(self, call: _ScheduledCall, now: float):
+        if call.expiry is not None:
+            call.expiry.cancel()
+        number = call.phone_number
+        self._running += 1
+        self._running_by_number[number] = self._running_by_number.get(number, 0) + 1
+        self._last_start_by_number[number] = now
+        self.started += 1
+        self.total_wait_seconds += now - call.queued_at
+        task = asyncio.get_running_loop().create_task(self._run(call))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, call: _ScheduledCall):
+        try:
+            result = await call.factory()
+        except Exception as e:
+            self.failed += 1
+            logger.error("Scheduled call to %s failed: %s", call.phone_number, e)
+            if not call.future.done():
+                call.future.set_exception(e)
+        else:
+            self.completed += 1
+            if not call.future.done():
+                call.future.set_result(result)
+        finally:
+            self._running -= 1
+            number = call.phone_number
+            self._running_by_number[number] -= 1
+            if not self._running_by_number[number]:
+                del self._running_by_number[number]
+            self._wakeup.set()
+
+    async def aclose(self):
+        """Stop dispatching and cancel calls that have not started."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            self._dispatcher = None
+        for call in self._queue:
+            if call.expiry is not None:
+                call.expiry.cancel()
+            call.future.cancel()
+        self._queue = []
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queued(),
+            "running": self._running,
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_wait_seconds": (
+                self.total_wait_seconds / self.started if self.started else 0.0
+            ),
+            "max_concurrent": self.max_concurrent,
+        }
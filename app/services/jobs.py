@@ -0,0 +1,168 @@
+"""
+Background recommendation jobs.
+
+A job consumes the same progress events as the streaming endpoint and folds
+them into a result that can be polled while calls are still in progress.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional
+
+from app.models.schemas import RecommendationJob
+
+logger = logging.getLogger("provider_finder.jobs")
+
+
+class JobLimitError(Exception):
+    """Too many jobs are already running."""
+
+JOB_RUNNING = "running"
+JOB_COMPLETE = "complete"
+JOB_FAILED = "failed"
+
+
+class _Job:
+    __slots__ = (
+        "job_id",
+        "status",
+        "recommendations",
+        "error",
+        "created_at",
+        "completed_at",
+        "task",
+    )
+
+    def __init__(self, job_id: str, created_at: float):
+        self.job_id = job_id
+        self.status = JOB_RUNNING
+        self.recommendations: Dict[int, dict] = {}
+        self.error: Optional[str] = None
+        self.created_at = created_at
+        self.completed_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def apply(self, event: dict):
+        """Fold one recommendation event into the job's results."""
+        kind = event.get("event")
+        if kind == "recommendation":
+            recommendation = dict(event["data"])
+            recommendation["provider_confirmation_infos"] = [None] * len(
+                recommendation.get("provider_infos") or []
+            )
+            self.recommendations[event["index"]] = recommendation
+        elif kind == "confirmation":
+            recommendation = self.recommendations.get(event["index"])
+            if recommendation is not None:
+                recommendation["provider_confirmation_infos"][
+                    event["provider_index"]
+                ] = event["data"]
+        elif kind == "error":
+            self.error = event.get("detail")
+
+    def snapshot(self) -> RecommendationJob:
+        return RecommendationJob(
+            job_id=self.job_id,
+            status=self.status,
+            recommendations=[
+                self.recommendations[idx] for idx in sorted(self.recommendations)
+            ],
+            error=self.error,
+            created_at=self.created_at,
+            completed_at=self.completed_at,
+        )
+
+
+class JobStore:
+    """Runs recommendation jobs in the background and keeps their results for polling."""
+
+    def __init__(
+        self,
+        max_jobs: int = 1000,
+        ttl_seconds: float = 3600.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Args:
+            max_jobs: Maximum number of jobs kept; the oldest finished jobs
+                are dropped first, and new jobs are rejected while this many
+                are running
+            ttl_seconds: How long finished jobs stay available
+            clock: Wall clock time source, injectable for tests
+        """
+        self.max_jobs = max_jobs
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._jobs: "OrderedDict[str, _Job]" = OrderedDict()
+
+    def submit(self, events: AsyncIterator[dict]) -> RecommendationJob:
+        """
+        Start a job that consumes the given event stream.
+
+        Returns:
+            The initial job status, including its ID
+
+        Raises:
+            JobLimitError: If max_jobs jobs are still running
+        """
+        self._prune()
+        if len(self._jobs) >= self.max_jobs:
+            raise JobLimitError(f"{len(self._jobs)} recommendation jobs are running")
+        job = _Job(uuid.uuid4().hex, self._clock())
+        self._jobs[job.job_id] = job
+        job.task = asyncio.create_task(self._run(job, events))
+        return job.snapshot()
+
+    async def _run(self, job: _Job, events: AsyncIterator[dict]):
+        try:
+            async for event in events:
+                job.apply(event)
+            job.status = JOB_FAILED if job.error and not job.recommendations else JOB_COMPLETE
+        except asyncio.CancelledError:
+            job.status = JOB_FAILED
+            job.error = "Job was cancelled"
+            raise
+        except Exception as e:
+            logger.error("Recommendation job %s failed: %s", job.job_id, e)
+            job.status = JOB_FAILED
+            job.error = str(e)
+        finally:
+            job.completed_at = self._clock()
+
+    def get(self, job_id: str) -> Optional[RecommendationJob]:
+        """Return the current status of a job, or None if it is unknown or expired."""
+        job = self._jobs.get(job_id)
+        return job.snapshot() if job is not None else None
+
+    def _prune(self):
+        now = self._clock()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.completed_at is not None and now - job.completed_at > self.ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+        if len(self._jobs) < self.max_jobs:
+            return
+        finished = [job_id for job_id, job in self._jobs.items() if job.completed_at is not None]
+        for job_id in finished[: len(self._jobs) - self.max_jobs + 1]:
+            del self._jobs[job_id]
+
+    async def aclose(self):
+        """Cancel jobs that are still running."""
+        tasks: List[asyncio.Task] = [
+            job.task for job in self._jobs.values() if job.task and not job.task.done()
+        ]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        counts = {JOB_RUNNING: 0, JOB_COMPLETE: 0, JOB_FAILED: 0}
+        for job in self._jobs.values():
+            counts[job.status] += 1
+        return counts
@@ -2,8 +2,16 @@
 Provider finder service functions.
 """
 
-from typing import List, Dict, Optional, Tuple
-import pgeocode
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Dict,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 import json
 import logging
 from app.models.schemas import (
@@ -15,22 +23,224 @@ from app.models.schemas import (
 )
 from app.utils.prompt import PromptGenerator
 from app.utils.llm_client import LLMClient, process_json_response
-import requests, re, json
+from app.utils.geocoding import loaded_zip_index
+from app.utils.json_stream import aiter_json_objects
+import re, json
 from datetime import datetime
 import asyncio
 import random
+from fastapi.encoders import jsonable_encoder
 from app.utils.constants import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_SECONDS,
+    CALL_API_CONCURRENCY_LIMIT,
+    CALL_MAX_CONCURRENT,
+    CALL_MAX_QUEUE_WAIT_SECONDS,
+    CALL_MAX_QUEUED,
+    CALL_PER_NUMBER_INTERVAL_SECONDS,
+    CALL_PER_NUMBER_MAX_CONCURRENT,
+    CALL_TRANSCRIPT_TIMEOUT_SECONDS,
+    CALL_WEBHOOK_GRACE_SECONDS,
+    CALL_WEBHOOK_URL,
+    CARE_COMPARE_CONCURRENCY_LIMIT,
+    CARE_COMPARE_LATENCY_THRESHOLD_SECONDS,
     DEFAULT_PROVIDER_RECOMMENDATIONS,
+    GENERAL_SPECIALTIES,
+    LLM_CONCURRENCY_LIMIT,
+    LLM_LATENCY_THRESHOLD_SECONDS,
+    LLM_MAX_CONNECTIONS,
+    LLM_STREAMING,
+    PROVIDER_CACHE_MAX_BYTES,
+    PROVIDER_CACHE_MAX_ENTRIES,
+    PROVIDER_CACHE_TTL_SECONDS,
+    PROVIDER_SNAPSHOT_PATH,
+    PROVIDER_SNAPSHOT_RECORD,
+    PROVIDERS_PER_SPECIALTY,
+    PROVIDER_RADIUS_MAX,
+    PROVIDER_RADIUS_MODE,
+    PROVIDER_RADIUS_STEPS,
+    PROVIDER_RADIUS_WIDEN,
+    PROVIDER_SOURCE,
+    RECOMMENDATION_JOB_MAX_JOBS,
+    RECOMMENDATION_JOB_TTL_SECONDS,
+    SPECIALTY_CLASSIFIER_THRESHOLD,
+    SPECIALTY_DECISION_LOG_MAX_BYTES,
+    SPECIALTY_DECISION_LOG_PATH,
+    SPECIALTY_PROMPT_CANDIDATES,
+    SYMPTOM_CACHE_MAX_ENTRIES,
+    SYMPTOM_CACHE_PATH,
+    SYMPTOM_CACHE_SIMILARITY_THRESHOLD,
+    TRANSCRIPT_BATCH_MAX_SIZE,
+    TRANSCRIPT_BATCH_WINDOW_SECONDS,
+)
+from app.services.call_registry import CallRegistry
+from app.services.call_scheduler import CallScheduler, SchedulerBusyError
+from app.services.jobs import JobStore
+from app.services.provider_store import ProviderStore, append_to_snapshot
+from app.services.specialty_router import SpecialtyRouter
+from app.utils.batcher import MicroBatcher
+from app.utils.cache import ProviderSearchCache
+from app.utils.call_api import CallAPIClient
+from app.utils.care_compare import CareCompareClient
+from app.utils.resilience import (
+    AdaptiveLimiter,
+    CircuitBreaker,
+    DependencyGuard,
+    DependencyUnavailableError,
+)
+from app.utils.semantic_cache import SymptomCache
+from app.utils.singleflight import SingleFlight
+from app.utils.metrics import track_stage
+from app.utils.pipeline import Pipeline
+from app.utils.provider_table import ProviderRow, ProviderTable, materialize
+from app.utils.specialties import (
+    SPECIALTIES_PATH,
+    SpecialtyCatalog,
+    resolve_specialty_key,
+)
+from app.utils.text import normalize_text
+from app.utils.transcript_parser import (
+    TranscriptFastPath,
+    conversation_turns,
+    format_transcript,
+)
+from app.utils.specialty_classifier import (
+    SpecialtyClassifier,
+    load_specialty_keywords,
+    read_decision_log,
 )
 
-prompt_generator = PromptGenerator("app/data/specialties.json")
+prompt_generator = PromptGenerator(SPECIALTIES_PATH)
 llm_api_key = ""  # Replace with your actual API key
 bland_ai_api_key = ""
 bland_ai_pathway_id = ""
-llm_client = LLMClient(api_key=llm_api_key)
+
+
+def _make_guard(
+    name: str, limit: int, max_limit: int, latency_threshold: Optional[float] = None
+) -> DependencyGuard:
+    return DependencyGuard(
+        name,
+        breaker=CircuitBreaker(
+            failure_threshold=BREAKER_FAILURE_THRESHOLD,
+            reset_timeout_seconds=BREAKER_RESET_SECONDS,
+        ),
+        limiter=AdaptiveLimiter(
+            initial_limit=limit,
+            max_limit=max_limit,
+            latency_threshold_seconds=latency_threshold,
+        ),
+    )
+
+
+llm_guard = _make_guard(
+    "llm", LLM_CONCURRENCY_LIMIT, LLM_MAX_CONNECTIONS, LLM_LATENCY_THRESHOLD_SECONDS
+)
+care_compare_guard = _make_guard(
+    "care_compare",
+    CARE_COMPARE_CONCURRENCY_LIMIT,
+    4 * CARE_COMPARE_CONCURRENCY_LIMIT,
+    CARE_COMPARE_LATENCY_THRESHOLD_SECONDS,
+)
+call_api_guard = _make_guard(
+    "call_api", CALL_API_CONCURRENCY_LIMIT, 4 * CALL_API_CONCURRENCY_LIMIT
+)
+dependency_guards = {
+    guard.name: guard for guard in (llm_guard, care_compare_guard, call_api_guard)
+}
+
+llm_client = LLMClient(api_key=llm_api_key, guard=llm_guard)
+call_api_client = CallAPIClient(api_key=bland_ai_api_key, guard=call_api_guard)
+care_compare_client = CareCompareClient(guard=care_compare_guard)
+call_registry = CallRegistry(webhook_grace_seconds=CALL_WEBHOOK_GRACE_SECONDS)
+call_scheduler = CallScheduler(
+    max_concurrent=CALL_MAX_CONCURRENT,
+    per_number_max_concurrent=CALL_PER_NUMBER_MAX_CONCURRENT,
+    per_number_interval_seconds=CALL_PER_NUMBER_INTERVAL_SECONDS,
+    max_queued=CALL_MAX_QUEUED,
+    max_queue_wait_seconds=CALL_MAX_QUEUE_WAIT_SECONDS,
+)
+job_store = JobStore(
+    max_jobs=RECOMMENDATION_JOB_MAX_JOBS, ttl_seconds=RECOMMENDATION_JOB_TTL_SECONDS
+)
+specialty_catalog = SpecialtyCatalog.load()
+provider_store = ProviderStore(PROVIDER_SNAPSHOT_PATH)
+provider_search_cache = ProviderSearchCache(
+    ttl_seconds=PROVIDER_CACHE_TTL_SECONDS,
+    max_entries=PROVIDER_CACHE_MAX_ENTRIES,
+    max_bytes=PROVIDER_CACHE_MAX_BYTES,
+)
+symptom_cache = SymptomCache(
+    max_entries=SYMPTOM_CACHE_MAX_ENTRIES,
+    similarity_threshold=SYMPTOM_CACHE_SIMILARITY_THRESHOLD,
+    path=SYMPTOM_CACHE_PATH,
+)
+
+
+
+def train_specialty_classifier(
+    decision_log_path: Optional[str] = SPECIALTY_DECISION_LOG_PATH,
+) -> SpecialtyClassifier:
+    """
+    Train the local specialty classifier.
+
+    Reads the whole decision log, so run it off the event loop.
+
+    Args:
+        decision_log_path: Logged LLM decisions to learn from, None or empty
+            to train on the catalog and keywords only
+
+    Returns:
+        The trained classifier
+    """
+    decisions = read_decision_log(decision_log_path) if decision_log_path else []
+    return SpecialtyClassifier.train(
+        specialty_catalog.specialties, decisions, load_specialty_keywords()
+    )
+
+
+specialty_router = SpecialtyRouter(
+    # Logged decisions are replayed by the startup warm-up; until then the
+    # classifier knows only the catalog and keywords
+    classifier=train_specialty_classifier(None),
+    catalog=specialty_catalog,
+    # Looked up at call time since the LLM mappers are defined further down
+    llm_mapper=lambda symptom_description: _map_symptoms_with_llm(symptom_description),
+    llm_streamer=(
+        (lambda symptom_description: _stream_symptoms_with_llm(symptom_description))
+        if LLM_STREAMING
+        else None
+    ),
+    cache=symptom_cache,
+    confidence_threshold=SPECIALTY_CLASSIFIER_THRESHOLD,
+    decision_log_path=SPECIALTY_DECISION_LOG_PATH,
+    decision_log_max_bytes=SPECIALTY_DECISION_LOG_MAX_BYTES,
+)
+
+# Identical concurrent requests share one in-flight upstream call
+provider_search_flight = SingleFlight("provider_search")
+symptom_mapping_flight = SingleFlight("symptom_mapping")
+request_flights = {
+    flight.name: flight for flight in (provider_search_flight, symptom_mapping_flight)
+}
+
+# Rule-based transcript extraction tried before the LLM
+transcript_fast_path = TranscriptFastPath()
+# Transcripts of calls finishing together are extracted in one LLM request
+transcript_batcher = MicroBatcher(
+    "transcript_extraction",
+    lambda transcripts: _extract_transcripts(transcripts),
+    max_batch_size=TRANSCRIPT_BATCH_MAX_SIZE,
+    max_wait_seconds=TRANSCRIPT_BATCH_WINDOW_SECONDS,
+)
+
+# Below this top classifier score the compact prompt could miss the answer
+MIN_CANDIDATE_SCORE = 0.1
 
 logger = logging.getLogger("provider_finder.service")
 
+T = TypeVar("T")
+
 
 async def get_location_from_zip(zip_code: str) -> Location:
     """
@@ -42,68 +252,241 @@ async def get_location_from_zip(zip_code: str) -> Location:
     Returns:
         Location with latitude and longitude
     """
-    try:
-        # Create a US geocoder (assuming US zip codes)
-        nomi = pgeocode.Nominatim("us")
+    coordinates = loaded_zip_index().lookup(zip_code)
+    if coordinates is None:
+        logger.error("Error converting zip code to coordinates: %s", zip_code)
+        raise ValueError(f"Could not determine location for zip code: {zip_code}")
+    latitude, longitude = coordinates
+    return Location(latitude=latitude, longitude=longitude)
 
-        # Query the geocoder with the zip code
-        result = nomi.query_postal_code(zip_code)
 
-        # Extract latitude and longitude
-        latitude = float(result.latitude)
-        longitude = float(result.longitude)
+async def get_locations_from_zips(zip_codes: List[str]) -> List[Optional[Location]]:
+    """
+    Convert many zip codes to coordinates in one vectorized lookup.
 
-        # Return a Location object with the coordinates
-        return Location(latitude=latitude, longitude=longitude)
-    except Exception as e:
-        # Handle errors (invalid zip code, service unavailable, etc.)
-        logger.error(f"Error converting zip code to coordinates: {e}")
-        # Return a default location (or raise an exception depending on requirements)
-        raise ValueError(f"Could not determine location for zip code: {zip_code}")
+    Args:
+        zip_codes: The zip codes to convert
+
+    Returns:
+        Locations aligned with the input, None for unknown zip codes
+    """
+    latitudes, longitudes, found = loaded_zip_index().lookup_many(zip_codes)
+    return [
+        Location(latitude=float(latitude), longitude=float(longitude)) if ok else None
+        for latitude, longitude, ok in zip(
+            latitudes.tolist(), longitudes.tolist(), found.tolist()
+        )
+    ]
 
 
 async def get_providers_by_location(
-    location: Location, radius: float = 25.0
+    location: Location,
+    radius: float = 25.0,
+    source: str = PROVIDER_SOURCE,
+    specialties: Optional[List[str]] = None,
+    per_specialty: int = PROVIDERS_PER_SPECIALTY,
 ) -> List[ProviderInfo]:
     """
     Find providers within a specific radius of a location.
 
     Args:
         location: The location (lat/long) to search around
-        radius: Search radius in kilometers
+        radius: Search radius in miles
+        source: "remote" to query Care Compare, "local" to use the snapshot
+        specialties: Specialties the caller will select from, if known. A
+            remote search stops reading once each has per_specialty providers.
+        per_specialty: Providers needed per specialty before stopping early
 
     Returns:
-        List of providers in the area
+        List of providers in the area, closest first
     """
-    logger.info(
-        f"Searching for providers at coordinates: {location.latitude}, {location.longitude}, radius: {radius} km"
+    return materialize(
+        await search_providers(location, radius, source, specialties, per_specialty)
+    )
+
+
+async def search_providers(
+    location: Location,
+    radius: float = 25.0,
+    source: str = PROVIDER_SOURCE,
+    specialties: Optional[List[str]] = None,
+    per_specialty: int = PROVIDERS_PER_SPECIALTY,
+) -> List[ProviderRow]:
+    """
+    Like get_providers_by_location(), but returns compact rows.
+
+    Callers filter and rank the rows and only build ProviderInfo models for
+    the providers they return.
+    """
+    logger.debug(
+        "Searching for providers at coordinates: %s, %s, radius: %s miles, source: %s",
+        location.latitude,
+        location.longitude,
+        radius,
+        source,
     )
 
-    res = requests.post(
-        "https://www.medicare.gov/api/care-compare/provider",
-        json={
-            "type": "Physician",
-            "filters": {
-                "radiusSearch": {
-                    "coordinates": {
-                        "lon": location.longitude,
-                        "lat": location.latitude,
-                    },
-                    "radius": radius,
+    if source == "local":
+        return [
+            ProviderRow.from_record(record, specialty_catalog, distance=distance)
+            for distance, record in provider_store.query(location, radius)
+        ]
+    if source != "remote":
+        raise ValueError(f"Unknown provider source: {source}")
+
+    cached = provider_search_cache.get(location, radius)
+    if cached is not None:
+        return cached
+
+    wanted = None
+    if specialties:
+        wanted = tuple(
+            sorted(
+                {
+                    key
+                    for key in (resolve_specialty_key(specialty_catalog, s) for s in specialties)
+                    if key is not None
                 }
-            },
-            "returnAllResults": True,
-            "sort": ["closest"],
-        },
+            )
+        )
+    key = (
+        round(location.latitude, provider_search_cache.precision),
+        round(location.longitude, provider_search_cache.precision),
+        float(radius),
+        wanted,
+        per_specialty if wanted else None,
+    )
+    return await provider_search_flight.do(
+        key, lambda: _fetch_remote_providers(location, radius, wanted, per_specialty)
     )
-    return convert_raw_response_to_provider_info(res.json())
 
 
-def convert_raw_response_to_provider_info(raw_response: dict) -> List[ProviderInfo]:
+def radius_steps(
+    radius: Optional[float],
+    mode: str = PROVIDER_RADIUS_MODE,
+    steps: List[float] = PROVIDER_RADIUS_STEPS,
+    max_radius: float = PROVIDER_RADIUS_MAX,
+    widen: bool = PROVIDER_RADIUS_WIDEN,
+) -> List[float]:
     """
-    Convert raw response to provider info.
+    Radii to try, smallest first, for a search around the requested radius.
+
+    Args:
+        radius: The requested radius, or None for the default of 25 miles
+        mode: "progressive" or "fixed"
+        steps: Configured radius steps
+        max_radius: Largest radius a widening search may reach
+        widen: Whether sparse areas may be searched past the requested radius
+
+    Returns:
+        Steps below the requested radius and the requested radius itself,
+        followed by larger steps up to the maximum if widening is enabled
     """
-    return [ProviderInfo(**provider) for provider in raw_response["results"]]
+    if radius is None:
+        # Requests may send "radius": null
+        radius = 25.0
+    if mode == "fixed":
+        return [radius]
+    if mode != "progressive":
+        raise ValueError(f"Unknown radius mode: {mode}")
+    smaller = [step for step in steps if step < radius]
+    if not widen:
+        return smaller + [radius]
+    return smaller + [radius] + [step for step in steps if radius < step <= max_radius]
+
+
+async def search_providers_progressive(
+    location: Location,
+    steps: List[float],
+    specialties: Optional[List[str]] = None,
+    start: int = 0,
+    per_specialty: int = PROVIDERS_PER_SPECIALTY,
+    source: str = PROVIDER_SOURCE,
+) -> Tuple[List[ProviderRow], int]:
+    """
+    Search at widening radii until each specialty has enough providers.
+
+    Args:
+        location: The location (lat/long) to search around
+        steps: Radii to try, smallest first
+        specialties: Specialties that need providers. Without them only
+            the radius at steps[start] is searched.
+        start: Index of the first radius to try
+        per_specialty: Providers needed per specialty
+        source: "remote" or "local"
+
+    Returns:
+        The rows found at the last radius searched, and that radius' index
+    """
+    wanted = {
+        resolve_specialty_key(specialty_catalog, specialty)
+        for specialty in specialties or ()
+    }
+    wanted.discard(None)
+    for index in range(start, len(steps)):
+        rows = await search_providers(
+            location, steps[index], source, specialties, per_specialty
+        )
+        counts = dict.fromkeys(wanted, 0)
+        for row in rows:
+            for key in row.specialty_keys:
+                if key in counts:
+                    counts[key] += 1
+        if all(count >= per_specialty for count in counts.values()):
+            break
+    logger.info(
+        "Searched up to %s of radius steps %s, %d providers", steps[index], steps, len(rows)
+    )
+    return rows, index
+
+
+def _enough_candidates(
+    wanted: Tuple[str, ...], per_specialty: int
+) -> Callable[[ProviderRow], bool]:
+    """
+    Build a predicate that is True once every wanted specialty has enough providers.
+
+    Rows arrive closest first, so the first matches are the ones selected.
+    """
+    remaining = {key: per_specialty for key in wanted}
+
+    def is_enough(row: ProviderRow) -> bool:
+        for key in row.specialty_keys:
+            if key in remaining:
+                remaining[key] -= 1
+                if remaining[key] <= 0:
+                    del remaining[key]
+        return not remaining
+
+    return is_enough
+
+
+async def _fetch_remote_providers(
+    location: Location,
+    radius: float,
+    wanted: Optional[Tuple[str, ...]] = None,
+    per_specialty: int = PROVIDERS_PER_SPECIALTY,
+) -> List[ProviderRow]:
+    """Query Care Compare, caching the result if the whole result set was read."""
+    result = await care_compare_client.search(
+        location,
+        radius,
+        convert=lambda record: ProviderRow.from_record(record, specialty_catalog),
+        is_enough=_enough_candidates(wanted, per_specialty) if wanted else None,
+    )
+    rows = result.records
+    logger.info(
+        "Read %d providers (%d bytes) from Care Compare%s",
+        len(rows),
+        result.nbytes,
+        "" if result.complete else ", stopped early",
+    )
+    if PROVIDER_SNAPSHOT_RECORD:
+        append_to_snapshot([row.record for row in rows], PROVIDER_SNAPSHOT_PATH)
+    # A truncated result would be wrong for other specialties
+    if result.complete:
+        provider_search_cache.put(location, radius, rows, nbytes=result.nbytes)
+    return rows
 
 
 async def map_symptoms_to_specialties(
@@ -118,32 +501,283 @@ async def map_symptoms_to_specialties(
     Returns:
         List of provider specialties that can address the symptoms
     """
-    prompt = prompt_generator.create_specialty_matching_prompt(symptom_description)
-    response = llm_client.make_chat_completions_request(
+    routing = await symptom_mapping_flight.do(
+        normalize_text(symptom_description),
+        lambda: specialty_router.route(symptom_description),
+    )
+    return routing.results
+
+
+async def stream_symptoms_to_specialties(
+    symptom_description: str,
+) -> AsyncIterator[Tuple[str, str, str]]:
+    """
+    Map patient symptoms to specialties, yielding each one as soon as it is known.
+
+    Args:
+        symptom_description: The description of the patient's symptoms
+
+    Yields:
+        (specialty, reasoning, confidence) tuples
+    """
+    async for routing in symptom_mapping_flight.stream(
+        normalize_text(symptom_description),
+        lambda: specialty_router.route_stream(symptom_description),
+    ):
+        for result in routing.results:
+            yield result
+
+
+def _build_specialty_messages(
+    symptom_description: str,
+) -> Tuple[List[dict], Optional[List[str]]]:
+    """
+    Build the chat messages for specialty matching.
+
+    Returns:
+        The messages, and the specialties offered by the compact id-based
+        prompt, or None if the full catalog was sent
+    """
+    candidates = None
+    if SPECIALTY_PROMPT_CANDIDATES > 0:
+        candidates = _select_candidate_specialties(
+            symptom_description, SPECIALTY_PROMPT_CANDIDATES
+        )
+    if candidates is not None:
+        prompt = prompt_generator.create_compact_specialty_matching_prompt(
+            symptom_description, candidates
+        )
+    else:
+        prompt = prompt_generator.create_specialty_matching_prompt(
+            symptom_description
+        )
+    messages = [
+        {
+            "role": "system",
+            "content": "You are a medical professional helping to match patients to the correct medical specialty based on their symptoms and conditions. Always respond with properly structured JSON as instructed.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+    return messages, candidates
+
+
+def _to_specialty_result(
+    item: dict, candidates: Optional[List[str]]
+) -> Optional[Tuple[str, str, str]]:
+    """
+    Convert one LLM answer item to a result tuple.
+
+    Returns:
+        (specialty, reasoning, confidence), or None if the answer names a
+        specialty that was not offered
+    """
+    specialty = item.get("RECOMMENDED_SPECIALTY", "")
+    if candidates is not None:
+        specialty = prompt_generator.specialty_name_for_id(specialty, candidates)
+        if specialty is None:
+            logger.warning(
+                "Dropping specialty %r that was not offered",
+                item.get("RECOMMENDED_SPECIALTY"),
+            )
+            return None
+    return (specialty, item.get("REASONING", ""), item.get("CONFIDENCE", "Low"))
+
+
+async def _map_symptoms_with_llm(
+    symptom_description: str,
+) -> List[Tuple[str, str, str]]:
+    """
+    Ask the LLM which specialties address the symptoms.
+
+    Args:
+        symptom_description: The description of the patient's symptoms
+
+    Returns:
+        List of (specialty, reasoning, confidence) tuples
+    """
+    messages, candidates = _build_specialty_messages(symptom_description)
+    response = await llm_client.make_chat_completions_request(
         model="27b-text-it",
-        messages=[
-            {
-                "role": "system",
-                "content": "You are a medical professional helping to match patients to the correct medical specialty based on their symptoms and conditions. Always respond with properly structured JSON as instructed.",
-            },
-            {"role": "user", "content": prompt},
-        ],
+        messages=messages,
         temperature=0.3,  # Lower temperature for more focused/predictable responses
         max_tokens=300,
     )
     processed_response = process_json_response(response)
-    return [
-        (
-            item.get("RECOMMENDED_SPECIALTY", ""),
-            item.get("REASONING", ""),
-            item.get("CONFIDENCE", "Low"),
+    results = [_to_specialty_result(item, candidates) for item in processed_response]
+    return [result for result in results if result is not None]
+
+
+async def _stream_symptoms_with_llm(
+    symptom_description: str,
+) -> AsyncIterator[Tuple[str, str, str]]:
+    """
+    Stream the LLM's specialty answer, yielding each array element as it closes.
+
+    Args:
+        symptom_description: The description of the patient's symptoms
+
+    Yields:
+        (specialty, reasoning, confidence) tuples
+    """
+    messages, candidates = _build_specialty_messages(symptom_description)
+    chunks = llm_client.stream_chat_completions(
+        model="27b-text-it",
+        messages=messages,
+        temperature=0.3,
+        max_tokens=300,
+    )
+    async for item in aiter_json_objects(chunks):
+        result = _to_specialty_result(item, candidates)
+        if result is not None:
+            yield result
+
+
+def _select_candidate_specialties(
+    symptom_description: str, limit: int
+) -> Optional[List[str]]:
+    """
+    Pick the specialties worth offering to the LLM for a symptom description.
+
+    Ranks the catalog with the local classifier and pads with general
+    practice specialties.
+
+    Returns:
+        Candidate specialty names, or None when the classifier has too little
+        signal and the full catalog should be sent instead
+    """
+    ranked = specialty_router.classifier.predict(symptom_description, top_k=limit)
+    if not ranked or ranked[0][1] < MIN_CANDIDATE_SCORE:
+        return None
+    return list(dict.fromkeys([name for name, _ in ranked] + GENERAL_SPECIALTIES))
+
+
+async def iter_provider_recommendations(
+    zip_code: str,
+    symptom_description: str,
+    radius: float = 25.0,
+    timings: Optional[dict] = None,
+) -> AsyncIterator[ProviderRecommendations]:
+    """
+    Yield provider recommendations one specialty at a time.
+
+    Symptom mapping does not depend on the location, so it runs concurrently
+    with geocoding and the provider search. Provider selection for a
+    specialty starts as soon as both the specialty and the providers are
+    known, while the LLM may still be generating the next specialty.
+
+    Args:
+        zip_code: Patient's zip code
+        symptom_description: Description of patient's symptoms
+        radius: Search radius in miles
+        timings: If given, filled with per-stage wall-clock timings
+
+    Yields:
+        Recommended providers for each specialty
+    """
+    logger.info("Finding providers for zip code: %s with radius: %s miles", zip_code, radius)
+
+    # When the cache or classifier already knows the specialties, the search
+    # can stop reading once each has enough closest-first providers
+    known = specialty_router.peek(symptom_description) if symptom_description else None
+    steps = radius_steps(radius)
+
+    pipeline = Pipeline(track=track_stage)
+    pipeline.stage("geocode", lambda: get_location_from_zip(zip_code))
+    pipeline.stage(
+        "provider_search",
+        lambda location: search_providers_progressive(
+            location,
+            steps,
+            specialties=[specialty for specialty, _, _ in known] if known else None,
+        ),
+        after=["geocode"],
+    )
+    specialties: asyncio.Queue = asyncio.Queue()
+    if symptom_description:
+
+        async def map_specialties():
+            try:
+                async for result in stream_symptoms_to_specialties(symptom_description):
+                    await specialties.put(result)
+            finally:
+                await specialties.put(None)
+
+        pipeline.stage("specialty_mapping", map_specialties)
+    pipeline.start()
+
+    try:
+        location = await pipeline.result("geocode")
+        logger.debug("Location coordinates: %s, %s", location.latitude, location.longitude)
+        rows, step = await pipeline.result("provider_search")
+        logger.info("Found %d providers in the area", len(rows))
+
+        # Index providers by canonical specialty in a single pass
+        table = ProviderTable(rows, specialty_catalog)
+
+        # If no symptoms provided, return all providers
+        # If symptoms provided, filter by appropriate specialties
+        if not symptom_description:
+            return
+
+        while True:
+            result = await specialties.get()
+            if result is None:
+                break
+            specialty, reasoning, confidence = result
+            with pipeline.timed("provider_selection"):
+                if (
+                    table.count(specialty) < PROVIDERS_PER_SPECIALTY
+                    and step + 1 < len(steps)
+                    and specialty_catalog.resolve(specialty) is not None
+                ):
+                    # Too few nearby; widen for this specialty. Earlier
+                    # specialties have already been yielded, so only this one
+                    # needs covering.
+                    with pipeline.timed("provider_search_widen"):
+                        rows, step = await search_providers_progressive(
+                            location, steps, specialties=[specialty], start=step + 1
+                        )
+                    table = ProviderTable(rows, specialty_catalog)
+                selected_rows = table.select(specialty)
+                if not selected_rows and specialty_catalog.resolve(specialty) is None:
+                    logger.warning("Unrecognized specialty from LLM: %s", specialty)
+                selected_rows = _make_selected_provider_first(
+                    "Matthew Sakumoto", selected_rows
+                )
+                # Only the providers actually recommended become full models
+                selected_providers = materialize(selected_rows[:PROVIDERS_PER_SPECIALTY])
+            logger.info(
+                "Recommended %d providers for specialty: %s, confidence: %s",
+                len(selected_providers),
+                specialty,
+                confidence,
+            )
+            logger.debug("Reasoning for specialty %s: %s", specialty, reasoning)
+            yield ProviderRecommendations(
+                provider_infos=selected_providers,
+                reasoning=reasoning,
+                confidence=confidence,
+                specialty=specialty,
+            )
+        # Surface symptom mapping errors once its queue is drained
+        await pipeline.result("specialty_mapping")
+    finally:
+        pipeline.cancel()
+        summary = pipeline.summary()
+        if timings is not None:
+            timings.update(summary)
+        logger.info(
+            "Recommendation stage timings: %s",
+            json.dumps(summary),
+            extra={"stage_timings": summary},
         )
-        for item in processed_response
-    ]
 
 
 async def recommend_providers(
-    zip_code: str, symptom_description: str, radius: float = 25.0
+    zip_code: str,
+    symptom_description: str,
+    radius: float = 25.0,
+    timings: Optional[dict] = None,
 ) -> List[ProviderRecommendations]:
     """
     Recommend providers based on location and optionally symptoms.
@@ -151,71 +785,128 @@ async def recommend_providers(
     Args:
         zip_code: Patient's zip code
         symptom_description: Description of patient's symptoms
-        radius: Search radius in kilometers
+        radius: Search radius in miles
+        timings: If given, filled with per-stage wall-clock timings
 
     Returns:
         List of recommended providers
     """
     try:
-        logger.info(
-            f"Finding providers for zip code: {zip_code} with radius: {radius} km"
-        )
+        provider_recommendations = [
+            recommendation
+            async for recommendation in iter_provider_recommendations(
+                zip_code, symptom_description, radius, timings=timings
+            )
+        ]
+    except DependencyUnavailableError as e:
+        # Failing fast; don't log a full error for every request while open
+        logger.warning("Returning default recommendations: %s", e)
+        return DEFAULT_PROVIDER_RECOMMENDATIONS
+    except Exception as e:
+        logger.error("Error occurred while mapping symptoms to specialties: %s", e)
+        return DEFAULT_PROVIDER_RECOMMENDATIONS
 
-        # Get location from zip code
-        location = await get_location_from_zip(zip_code)
-        logger.info(f"Location coordinates: {location.latitude}, {location.longitude}")
+    return provider_recommendations
 
-        # Get providers in the area
-        providers = await get_providers_by_location(location, radius)
-        logger.info(f"Found {len(providers)} providers in the area.")
 
-        # Construct a list of (set(specialty), provider) tuples
-        provider_specialty_list = [
-            (set(s.specialty_name for s in provider.physician.specialties), provider)
-            for provider in providers
-        ]
-        logger.info(
-            f"Constructed provider specialty list with {len(provider_specialty_list)} entries."
-        )
+async def iter_recommendation_events(
+    zip_code: str,
+    symptom_description: str,
+    radius: float,
+    patient_info: PatientInfo,
+) -> AsyncIterator[dict]:
+    """
+    Yield progress events for a recommend-and-connect request.
 
-        provider_recommendations = []
-        # If no symptoms provided, return all providers
-        # If symptoms provided, filter by appropriate specialties
-        if symptom_description:
-            logger.info(
-                f"Start time for symptom mapping: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    A "recommendation" event is emitted as soon as providers are selected
+    for a specialty, and calls to its providers start right away. Each
+    "confirmation" event follows when one of those calls resolves, in
+    completion order. The stream ends with a "done" event, or an "error"
+    event if no providers were found.
+
+    Args:
+        zip_code: Patient's zip code
+        symptom_description: Description of patient's symptoms
+        radius: Search radius in miles
+        patient_info: Patient details passed to the provider calls
+
+    Yields:
+        Event dictionaries ready to be JSON encoded
+    """
+    events: asyncio.Queue = asyncio.Queue()
+    workers = set()
+
+    async def confirm(idx: int, inner_idx: int, provider: ProviderInfo):
+        try:
+            _, confirmation = await connect_provider_worker(
+                idx, inner_idx, provider, patient_info
             )
-            result_list = await map_symptoms_to_specialties(symptom_description)
-            logger.info(
-                f"End time for symptom mapping: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+        except SchedulerBusyError as e:
+            logger.warning("Call to provider %s not placed: %s", provider.name, e)
+            confirmation = ProviderConfirmationInfo(
+                is_in_network=False,
+                available_timeslot=[],
+                error="Too many calls are waiting. Please try again later.",
             )
+        await events.put(
+            {
+                "event": "confirmation",
+                "index": idx,
+                "provider_index": inner_idx,
+                "data": jsonable_encoder(confirmation),
+            }
+        )
 
-            for specialty, reasoning, confidence in result_list:
-                selected_providers = _get_providers_by_specialty(
-                    specialty, provider_specialty_list
-                )
-                selected_providers = _make_selected_provider_first(
-                    "Matthew Sakumoto", selected_providers
-                )
-                selected_providers = selected_providers[:5]  # Limit to top 5 providers
-                recommendation = ProviderRecommendations(
-                    provider_infos=selected_providers,
-                    reasoning=reasoning,
-                    confidence=confidence,
-                    specialty=specialty,
-                )
-                provider_recommendations.append(recommendation)
-                logger.info(
-                    f"Recommended specialty: {specialty} with reasoning: {reasoning}, confidence: {confidence}"
-                )
-                logger.info(
-                    f"Found {len(selected_providers)} providers for specialty: {specialty}"
-                )
-    except Exception as e:
-        logger.error(f"Error occurred while mapping symptoms to specialties: {e}")
-        return DEFAULT_PROVIDER_RECOMMENDATIONS
+    async def publish(idx: int, recommendation: ProviderRecommendations):
+        await events.put(
+            {
+                "event": "recommendation",
+                "index": idx,
+                "data": jsonable_encoder(recommendation),
+            }
+        )
+        for inner_idx, provider in enumerate(recommendation.provider_infos or []):
+            workers.add(asyncio.create_task(confirm(idx, inner_idx, provider)))
 
-    return provider_recommendations
+    async def produce():
+        count = 0
+        try:
+            async for recommendation in iter_provider_recommendations(
+                zip_code, symptom_description, radius
+            ):
+                await publish(count, recommendation)
+                count += 1
+        except Exception as e:
+            logger.error("Error occurred while streaming recommendations: %s", e)
+            # Same fallback as recommend_providers when nothing was sent yet
+            if count == 0:
+                for recommendation in DEFAULT_PROVIDER_RECOMMENDATIONS:
+                    await publish(count, recommendation)
+                    count += 1
+        if count == 0:
+            await events.put(
+                {
+                    "event": "error",
+                    "detail": "No providers found matching your criteria. Try expanding your search radius.",
+                }
+            )
+        if workers:
+            await asyncio.gather(*workers, return_exceptions=True)
+        await events.put(None)
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            event = await events.get()
+            if event is None:
+                break
+            yield event
+        yield {"event": "done"}
+    finally:
+        # The client may disconnect mid-stream; stop any outstanding calls
+        producer.cancel()
+        for worker in workers:
+            worker.cancel()
 
 
 async def connect_providers(
@@ -233,7 +924,7 @@ async def connect_providers(
     # TODO: Implement provider connection logic
     # This might involve sending notifications to providers, creating records in a database, etc.
 
-    results = await asyncio.gather(
+    results = await gather_or_cancel(
         *[
             connect_provider_worker(idx, inner_idx, provider, patientInfo)
             for inner_idx, provider in enumerate(selected_providers)
@@ -242,17 +933,39 @@ async def connect_providers(
     return results
 
 
+async def gather_or_cancel(*aws: Awaitable[T]) -> List[T]:
+    """
+    Run awaitables concurrently like asyncio.gather(), but fail as a group.
+
+    asyncio.gather() leaves the other awaitables running when one raises,
+    so calls keep being placed for a request that already failed. Here
+    they are cancelled and awaited before the error is re-raised.
+
+    Returns:
+        The results, in argument order
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
 async def connect_provider_worker(
     idx: int, inner_idx: int, provider: ProviderInfo, patientInfo: PatientInfo
 ) -> Tuple[ProviderInfo, ProviderConfirmationInfo]:
     """
     Worker function to handle provider connection in a separate thread.
+
+    Raises:
+        SchedulerBusyError: If the call scheduler cannot take the call
     """
     # This function can be used to handle provider connections asynchronously
     # For example, using threading or asyncio to manage multiple connections
     try:
-        url = "https://api.bland.ai/v1/calls"
-        headers = {"authorization": bland_ai_api_key}
         data = {
             "phone_number": (
                 provider.physician.phone if provider.physician is not None else None
@@ -272,42 +985,14 @@ async def connect_provider_worker(
             data["phone_number"] = "+13105082802"
         
         if data["phone_number"] is not None and inner_idx == 0 and idx < 2:
-            response = requests.post(url, json=data, headers=headers)
-            logger.info(f"Make call response: {response.status_code}")
-            call_id = response.json()["call_id"]
-            logger.info(f"Call ID: {call_id}")
-            is_done = False
-            url = f"https://api.bland.ai/v1/calls/{call_id}"
-            cnt = 0
-            logger.info(f"Waiting for transcript for call ID: {call_id}")
-            await asyncio.sleep(3)
-            while(not is_done):
-                try:
-                    response = requests.get(url, headers=headers)
-                    logger.info(f"Cnt: {cnt}, Get transcript response: {response.status_code}")
-                    if response is None or "pathway_logs" not in response.json() or response.json()["pathway_logs"] == [] or response.json()["pathway_logs"] is None:
-                        cnt += 1
-                        await asyncio.sleep(3)
-                        if cnt >= 25:
-                            is_done = True
-                            return (provider, ProviderConfirmationInfo(
-                                is_in_network=False,
-                                available_timeslot=[],
-                            ))
-                    else:
-                        transcript = parse_transcript(response.json())
-                        is_done = True
-                        return (provider, await get_result_from_transcript(transcript))
-                except Exception as e:
-                    cnt += 1
-                    logger.error(f"Error occurred while fetching transcript: {e}")
-                    await asyncio.sleep(3)
-                    if cnt >= 25:
-                        is_done = True
-                        return (provider, ProviderConfirmationInfo(
-                            is_in_network=False,
-                            available_timeslot=[],
-                        ))
+            # Earlier specialties are the better matches, so call them first.
+            # Every request calls the same two demo numbers, so with
+            # per-number limits set these calls queue behind other requests'.
+            return await call_scheduler.submit(
+                data["phone_number"],
+                lambda: _call_provider(provider, data),
+                priority=idx,
+            )
         elif data["phone_number"] is not None:
             return (
                 provider,
@@ -327,10 +1012,10 @@ async def connect_provider_worker(
                     ]
                 ),
             )
+    except SchedulerBusyError:
+        raise
     except Exception as e:
-        logger.error(
-            f"Error occurred while connecting to provider {provider.name}: {e}"
-        )
+        logger.error("Error occurred while connecting to provider %s: %s", provider.name, e)
     return (
         provider,
         ProviderConfirmationInfo(
@@ -341,40 +1026,61 @@ async def connect_provider_worker(
     )
 
 
-def _get_providers_by_specialty(
-    specialty: str,
-    provider_specialty_list: List[Tuple[set[str], ProviderInfo]],
-) -> List[ProviderInfo]:
-    return [
-        provider
-        for specialty_set, provider in provider_specialty_list
-        if specialty in specialty_set
-    ]
+async def _call_provider(
+    provider: ProviderInfo, data: dict
+) -> Tuple[ProviderInfo, ProviderConfirmationInfo]:
+    """
+    Place a call to a provider and wait for its transcript.
+
+    Args:
+        provider: The provider being called
+        data: Call request body
+
+    Returns:
+        The provider and the confirmation extracted from the call
+    """
+    if CALL_WEBHOOK_URL:
+        data["webhook"] = CALL_WEBHOOK_URL
+    with track_stage("call_placement"):
+        call_id = await call_api_client.place_call(data)
+    # Register before anything can await so an early webhook is kept
+    call_registry.register(call_id)
+    logger.info("Waiting for transcript for call ID: %s", call_id)
+    with track_stage("transcript_wait"):
+        call = await call_registry.wait(call_id, CALL_TRANSCRIPT_TIMEOUT_SECONDS)
+    if call is None or not call.get("pathway_logs"):
+        return (provider, ProviderConfirmationInfo(
+            is_in_network=False,
+            available_timeslot=[],
+        ))
+    with track_stage("transcript_extraction"):
+        # Formulaic answers are read locally; the rest go to the LLM
+        confirmation = transcript_fast_path.extract(call)
+        if confirmation is None:
+            transcript = parse_transcript(call)
+            confirmation = await get_result_from_transcript(transcript)
+    return (provider, confirmation)
 
 
 def _make_selected_provider_first(
     name: str,
-    selected_providers: List[ProviderInfo],
-) -> List[ProviderInfo]:
+    selected_providers: List[ProviderRow],
+) -> List[ProviderRow]:
     """
     Make the selected provider the first in the list.
     """
     for i, provider in enumerate(selected_providers):
-        if name.lower() in provider.name.lower():
+        if provider.name and name.lower() in provider.name.lower():
             return [provider] + selected_providers[:i] + selected_providers[i + 1 :]
     return selected_providers
 
 
 def parse_transcript(res: dict) -> str:
-    transcript = ""
-    for conversation in res["pathway_logs"]:
-        if conversation["role"] in set(["user", "assistant"]):
-            transcript += f"{conversation['role']}: {conversation['text']}\n"
-    return transcript
+    return format_transcript(conversation_turns(res))
 
 
 def parse_json(raw_str: str) -> dict:
-    logger.info(f"Parsing JSON from raw string: {raw_str}")
+    logger.debug("Parsing JSON from %d characters of LLM output", len(raw_str))
     # Regex to match JSON object within triple backticks
     pattern = r"```(json)?[\n\s]*({.*?})[\n\s]*```"
 
@@ -395,7 +1101,137 @@ def parse_json(raw_str: str) -> dict:
 
 
 async def get_result_from_transcript(transcript: str) -> ProviderConfirmationInfo:
-    res = llm_client.make_chat_completions_request(
+    """
+    Extract the offered timeslots and network status from a call transcript.
+
+    Requests from calls that finish at about the same time are batched into
+    one LLM prompt.
+
+    Args:
+        transcript: Transcript produced by parse_transcript
+
+    Returns:
+        The confirmation extracted from the transcript
+    """
+    return await transcript_batcher.submit(transcript)
+
+
+async def _extract_transcripts(transcripts: List[str]) -> List[ProviderConfirmationInfo]:
+    """
+    Extract confirmations for a batch of transcripts, one per transcript.
+
+    Args:
+        transcripts: Transcripts to extract from
+
+    Returns:
+        The confirmations, in the same order as the transcripts
+    """
+    if len(transcripts) == 1:
+        return [await _extract_transcript(transcripts[0])]
+
+    res = await llm_client.make_chat_completions_request(
+        model="27b-text-it",
+        messages=[{"role": "user", "content": _build_batch_transcript_prompt(transcripts)}],
+        temperature=0.5,
+        max_tokens=100 * len(transcripts),
+    )
+    items = parse_json_array(res["choices"][0]["message"]["content"])
+    by_index = {}
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        index = item.get("index", position + 1)
+        if isinstance(index, int) and 1 <= index <= len(transcripts):
+            by_index[index - 1] = item
+
+    missing = [i for i in range(len(transcripts)) if i not in by_index]
+    if missing:
+        # Answers the model left out are extracted one by one
+        logger.warning(
+            "Batch transcript extraction missed %d of %d answers",
+            len(missing),
+            len(transcripts),
+        )
+        retried = await asyncio.gather(
+            *[_extract_transcript(transcripts[i]) for i in missing]
+        )
+        for i, confirmation in zip(missing, retried):
+            by_index[i] = confirmation
+
+    confirmations = {}
+    invalid = []
+    for i, item in by_index.items():
+        if isinstance(item, ProviderConfirmationInfo):
+            confirmations[i] = item
+            continue
+        try:
+            confirmations[i] = _to_confirmation(item)
+        # pydantic's ValidationError is a ValueError
+        except (TypeError, ValueError) as e:
+            logger.warning("Invalid batch transcript answer %d: %s", i + 1, e)
+            invalid.append(i)
+    if invalid:
+        # A malformed answer only costs its own transcript a retry
+        retried = await asyncio.gather(
+            *[_extract_transcript(transcripts[i]) for i in invalid]
+        )
+        confirmations.update(zip(invalid, retried))
+    return [confirmations[i] for i in range(len(transcripts))]
+
+
+def _build_batch_transcript_prompt(transcripts: List[str]) -> str:
+    sections = "\n".join(
+        f"""
+        transcription {index}
+        {transcript}"""
+        for index, transcript in enumerate(transcripts, start=1)
+    )
+    return (
+        f"""
+        Here are {len(transcripts)} transcriptions of assistant and user calls.
+        User is clinic side.
+        today is {datetime.now().strftime("%Y-%m-%d")}
+        {sections}
+        """
+        + """
+        ====
+        24hr timeslot format: YYYY-MM-DD HH:MM - HH:MM
+        For each transcription, please extract the below information and
+        answer with one JSON array containing one object per transcription
+        ```
+        [
+            {
+                'index': <transcription number>,
+                'available_timeslot': [...],
+                'is_in_network': true/false
+            }
+        ]
+        ```
+        """
+    )
+
+
+def _to_confirmation(obj: dict) -> ProviderConfirmationInfo:
+    return ProviderConfirmationInfo(
+        is_in_network=obj.get("is_in_network", False),
+        available_timeslot=obj.get("available_timeslot", []),
+    )
+
+
+def parse_json_array(raw_str: str) -> list:
+    """Return the JSON array in an LLM answer, or an empty list."""
+    match = re.search(r"\[.*\]", raw_str, re.DOTALL)
+    if not match:
+        return []
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return []
+    return data if isinstance(data, list) else []
+
+
+async def _extract_transcript(transcript: str) -> ProviderConfirmationInfo:
+    res = await llm_client.make_chat_completions_request(
         model="27b-text-it",
         messages=[
             {
@@ -424,8 +1260,5 @@ async def get_result_from_transcript(transcript: str) -> ProviderConfirmationInf
         max_tokens=100,
     )
     obj = parse_json(res["choices"][0]["message"]["content"])
-    return ProviderConfirmationInfo(
-        is_in_network=obj.get("is_in_network", False),
-        available_timeslot=obj.get("available_timeslot", []),
-        )
+    return _to_confirmation(obj)
     
@@ -0,0 +1,263 @@
+"""
+Local, spatially indexed provider snapshot.
+
+The snapshot is a JSON Lines file where each line is one provider record as
+returned in the "results" array of the Care Compare provider API. Records
+may carry "latitude"/"longitude" keys; otherwise the centroid of the
+physician's address zip code is used.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from app.models.schemas import Location
+from app.utils.geocoding import get_zip_index
+
+# Care Compare reports distances in miles, so the local store does too
+EARTH_RADIUS_MILES = 3958.8
+MILES_PER_DEGREE_LATITUDE = 69.0
+
+logger = logging.getLogger("provider_finder.provider_store")
+
+
+def haversine_miles(latitude, longitude, latitudes, longitudes):
+    """
+    Great-circle distance from one point to many points.
+
+    Args:
+        latitude: Latitude of the origin
+        longitude: Longitude of the origin
+        latitudes: Array of target latitudes
+        longitudes: Array of target longitudes
+
+    Returns:
+        Array of distances in miles
+    """
+    lat1 = math.radians(latitude)
+    lat2 = np.radians(latitudes)
+    dlat = lat2 - lat1
+    dlon = np.radians(longitudes) - math.radians(longitude)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class ProviderSpatialIndex:
+    """Immutable grid-bucketed index over provider coordinates."""
+
+    def __init__(self, records: List[dict], latitudes, longitudes, cell_size=0.1):
+        """
+        Args:
+            records: Raw provider records
+            latitudes: Latitude per record
+            longitudes: Longitude per record
+            cell_size: Grid cell size in degrees
+        """
+        self.cell_size = cell_size
+        latitudes = np.asarray(latitudes, dtype=np.float64)
+        longitudes = np.asarray(longitudes, dtype=np.float64)
+
+        # Sort records by grid cell so every cell is one contiguous slice
+        cell_rows = np.floor(latitudes / cell_size).astype(np.int64)
+        cell_cols = np.floor(longitudes / cell_size).astype(np.int64)
+        order = np.lexsort((cell_cols, cell_rows))
+        self.records = [records[i] for i in order]
+        self.latitudes = latitudes[order]
+        self.longitudes = longitudes[order]
+
+        self._cells = {}
+        rows, cols = cell_rows[order], cell_cols[order]
+        if len(order):
+            boundaries = np.flatnonzero((np.diff(rows) != 0) | (np.diff(cols) != 0)) + 1
+            starts = np.concatenate(([0], boundaries))
+            ends = np.concatenate((boundaries, [len(order)]))
+            for start, end in zip(starts.tolist(), ends.tolist()):
+                self._cells[(int(rows[start]), int(cols[start]))] = (start, end)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def query(
+        self, latitude: float, longitude: float, radius: float
+    ) -> List[Tuple[float, dict]]:
+        """
+        Find records within a radius, closest first.
+
+        Args:
+            latitude: Latitude of the search center
+            longitude: Longitude of the search center
+            radius: Search radius in miles
+
+        Returns:
+            List of (distance, record) tuples sorted by distance
+        """
+        dlat = radius / MILES_PER_DEGREE_LATITUDE
+        cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+        dlon = min(radius / (MILES_PER_DEGREE_LATITUDE * cos_lat), 180.0)
+
+        row_min = math.floor((latitude - dlat) / self.cell_size)
+        row_max = math.floor((latitude + dlat) / self.cell_size)
+        col_min = math.floor((longitude - dlon) / self.cell_size)
+        col_max = math.floor((longitude + dlon) / self.cell_size)
+
+        slices = []
+        if (row_max - row_min + 1) * (col_max - col_min + 1) > len(self._cells):
+            # Very large radius, cheaper to walk the occupied cells directly
+            for (row, col), bounds in self._cells.items():
+                if row_min <= row <= row_max and col_min <= col <= col_max:
+                    slices.append(bounds)
+        else:
+            for row in range(row_min, row_max + 1):
+                for col in range(col_min, col_max + 1):
+                    bounds = self._cells.get((row, col))
+                    if bounds is not None:
+                        slices.append(bounds)
+        if not slices:
+            return []
+
+        candidates = np.concatenate([np.arange(start, end) for start, end in slices])
+        distances = haversine_miles(
+            latitude,
+            longitude,
+            self.latitudes[candidates],
+            self.longitudes[candidates],
+        )
+        within = distances <= radius
+        candidates, distances = candidates[within], distances[within]
+        order = np.argsort(distances, kind="stable")
+        return [
+            (float(distances[i]), self.records[candidates[i]]) for i in order.tolist()
+        ]
+
+
+def _record_coordinates(record: dict) -> Optional[Tuple[float, float]]:
+    """Return the coordinates of a raw record, falling back to its zip code."""
+    if record.get("latitude") is not None and record.get("longitude") is not None:
+        return float(record["latitude"]), float(record["longitude"])
+    physician = record.get("physician") or {}
+    zip_code = physician.get("addressZipcode")
+    if not zip_code:
+        return None
+    return get_zip_index().lookup(zip_code)
+
+
+def read_snapshot(path: Union[str, Path]) -> List[dict]:
+    """
+    Read raw provider records from a snapshot file.
+
+    Accepts JSON Lines with one record per line, or a recorded API response
+    with a top-level "results" array.
+    """
+    path = Path(path)
+    with open(path, "r") as f:
+        if path.suffix == ".json":
+            return json.load(f)["results"]
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_to_snapshot(records: Iterable[dict], path: Union[str, Path]):
+    """
+    Append raw provider records, e.g. from a live API response, to a snapshot.
+
+    The query-specific "distance" field is dropped before writing.
+    """
+    with open(path, "a") as f:
+        for record in records:
+            record = {k: v for k, v in record.items() if k != "distance"}
+            f.write(json.dumps(record) + "\n")
+
+
+def build_spatial_index(records: List[dict]) -> ProviderSpatialIndex:
+    """
+    Build a spatial index over raw provider records.
+
+    Duplicate records (same "id") are collapsed and records without
+    resolvable coordinates are skipped.
+    """
+    kept, latitudes, longitudes = [], [], []
+    seen = set()
+    for record in records:
+        record_id = record.get("id")
+        if record_id is not None:
+            if record_id in seen:
+                continue
+            seen.add(record_id)
+        coordinates = _record_coordinates(record)
+        if coordinates is None:
+            continue
+        kept.append(record)
+        latitudes.append(coordinates[0])
+        longitudes.append(coordinates[1])
+    skipped = len(records) - len(kept)
+    if skipped:
+        logger.info("Skipped %d duplicate or unlocatable provider records", skipped)
+    return ProviderSpatialIndex(kept, latitudes, longitudes)
+
+
+class ProviderStore:
+    """Holds the current provider index and swaps in rebuilt ones."""
+
+    def __init__(self, snapshot_path: Union[str, Path]):
+        self.snapshot_path = Path(snapshot_path)
+        self._index: Optional[ProviderSpatialIndex] = None
+        self._loaded_mtime: Optional[float] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._index is not None
+
+    def load(self):
+        """Build the index from the snapshot and swap it in."""
+        mtime = os.path.getmtime(self.snapshot_path)
+        index = build_spatial_index(read_snapshot(self.snapshot_path))
+        # A single reference assignment, so readers see either index whole
+        self._index = index
+        self._loaded_mtime = mtime
+        logger.info(
+            "Loaded %d providers from snapshot %s", len(index), self.snapshot_path
+        )
+
+    async def refresh(self, force: bool = False) -> bool:
+        """
+        Rebuild the index in a worker thread if the snapshot changed.
+
+        Returns:
+            True if a new index was swapped in
+        """
+        if not self.snapshot_path.exists():
+            return False
+        if not force and os.path.getmtime(self.snapshot_path) == self._loaded_mtime:
+            return False
+        await asyncio.to_thread(self.load)
+        return True
+
+    async def run_refresh_loop(self, interval_seconds: float):
+        """Periodically refresh the index until cancelled."""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Failed to refresh provider snapshot: %s", e)
+
+    def query(self, location: Location, radius: float) -> List[Tuple[float, dict]]:
+        """
+        Find raw provider records within a radius of a location, closest first.
+
+        Args:
+            location: The location (lat/long) to search around
+            radius: Search radius in miles
+
+        Returns:
+            (distance, record) pairs
+        """
+        index = self._index
+        if index is None:
+            raise RuntimeError("Provider snapshot has not been loaded")
+        return index.query(location.latitude, location.longitude, radius)
@@ -0,0 +1,263 @@
+"""
+Tiered routing from symptom descriptions to specialties.
+
+Tiers are tried cheapest first: cached LLM answers, the local classifier,
+then the LLM itself.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from app.utils.semantic_cache import SymptomCache
+from app.utils.specialties import SpecialtyCatalog
+from app.utils.specialty_classifier import SpecialtyClassifier, append_decision
+
+logger = logging.getLogger("provider_finder.specialty_router")
+
+SpecialtyResult = Tuple[str, str, str]
+
+TIER_CACHE = "cache"
+TIER_CLASSIFIER = "classifier"
+TIER_LLM = "llm"
+
+
+class RoutingResult(NamedTuple):
+    results: List[SpecialtyResult]
+    tier: str
+
+
+def classifier_confidence(score: float) -> str:
+    """Map a classifier similarity score to the LLM's confidence labels."""
+    if score >= 0.7:
+        return "High"
+    if score >= 0.5:
+        return "Medium"
+    return "Low"
+
+
+class SpecialtyRouter:
+    """Answers from the classifier when it is confident, otherwise asks the LLM."""
+
+    def __init__(
+        self,
+        classifier: SpecialtyClassifier,
+        catalog: SpecialtyCatalog,
+        llm_mapper: Callable[[str], Awaitable[List[SpecialtyResult]]],
+        cache: Optional[SymptomCache] = None,
+        confidence_threshold: float = 0.5,
+        max_specialties: int = 2,
+        decision_log_path: Optional[str] = None,
+        llm_streamer: Optional[
+            Callable[[str], AsyncIterator[SpecialtyResult]]
+        ] = None,
+        decision_log_max_bytes: Optional[int] = None,
+    ):
+        """
+        Args:
+            classifier: Local specialty classifier
+            catalog: Specialty catalog used to canonicalize LLM answers
+            llm_mapper: Coroutine asking the LLM for specialties
+            cache: Cache of earlier LLM answers
+            confidence_threshold: Minimum classifier score to skip the LLM
+            max_specialties: Maximum number of specialties returned
+            decision_log_path: Where LLM decisions are logged for retraining.
+                Records hold raw symptom text.
+            llm_streamer: Async generator yielding the LLM's specialties one
+                at a time as they are generated, used by route_stream()
+            decision_log_max_bytes: Size at which the decision log is rotated
+        """
+        self.classifier = classifier
+        self.catalog = catalog
+        self.llm_mapper = llm_mapper
+        self.cache = cache
+        self.confidence_threshold = confidence_threshold
+        self.max_specialties = max_specialties
+        self.decision_log_path = decision_log_path
+        self.llm_streamer = llm_streamer
+        self.decision_log_max_bytes = decision_log_max_bytes
+        # Log writes run in threads; the lock keeps appends and rotation in order
+        self._log_lock = threading.Lock()
+        self._log_tasks: Set[asyncio.Task] = set()
+        self._descriptions = {
+            s["specialtyName"]: s.get("description") or "" for s in catalog.specialties
+        }
+        self.tier_counts: Dict[str, int] = {TIER_CACHE: 0, TIER_CLASSIFIER: 0, TIER_LLM: 0}
+
+    def classify(self, symptom_description: str) -> Optional[List[SpecialtyResult]]:
+        """
+        Answer from the classifier alone.
+
+        Returns:
+            Results if the top specialty clears the confidence threshold,
+            otherwise None
+        """
+        predictions = self.classifier.predict(
+            symptom_description, top_k=self.max_specialties
+        )
+        if not predictions or predictions[0][1] < self.confidence_threshold:
+            return None
+        return [
+            (
+                name,
+                f"I recommend {name} for these symptoms. {self._descriptions.get(name, '')}".strip(),
+                classifier_confidence(score),
+            )
+            for name, score in predictions
+            if score >= self.confidence_threshold / 2
+        ]
+
+    def peek(self, symptom_description: str) -> Optional[List[SpecialtyResult]]:
+        """
+        Answer from the cache or classifier tiers only, without counting.
+
+        Lets callers learn the likely specialties up front when no LLM call
+        is needed, e.g. to bound a provider search.
+
+        Returns:
+            Results if a cheap tier can answer, otherwise None
+        """
+        if self.cache is not None:
+            cached = self.cache.peek(symptom_description)
+            if cached is not None:
+                return cached
+        return self.classify(symptom_description)
+
+    async def route(self, symptom_description: str) -> RoutingResult:
+        """
+        Map a symptom description to specialties through the cheapest confident tier.
+
+        Returns:
+            The (specialty, reasoning, confidence) tuples and the tier that answered
+        """
+        if self.cache is not None:
+            cached = self.cache.get(symptom_description)
+            if cached is not None:
+                return self._answer(cached, TIER_CACHE)
+
+        results = self.classify(symptom_description)
+        if results:
+            return self._answer(results, TIER_CLASSIFIER)
+
+        start = time.perf_counter()
+        results = await self.llm_mapper(symptom_description)
+        self._record_llm_answer(
+            symptom_description, results, (time.perf_counter() - start) * 1000
+        )
+        return self._answer(results, TIER_LLM)
+
+    async def route_stream(
+        self, symptom_description: str
+    ) -> AsyncIterator[RoutingResult]:
+        """
+        Like route(), but yields each specialty as soon as it is known.
+
+        Cache and classifier answers arrive together. LLM answers are yielded
+        one by one while the model is still generating the rest.
+
+        Yields:
+            Single-specialty results tagged with the tier that answered
+        """
+        if self.llm_streamer is None:
+            routing = await self.route(symptom_description)
+            for result in routing.results:
+                yield RoutingResult([result], routing.tier)
+            return
+
+        if self.cache is not None:
+            cached = self.cache.get(symptom_description)
+            if cached is not None:
+                self._answer(cached, TIER_CACHE)
+                for result in cached:
+                    yield RoutingResult([result], TIER_CACHE)
+                return
+
+        results = self.classify(symptom_description)
+        if results:
+            self._answer(results, TIER_CLASSIFIER)
+            for result in results:
+                yield RoutingResult([result], TIER_CLASSIFIER)
+            return
+
+        start = time.perf_counter()
+        results = []
+        async for result in self.llm_streamer(symptom_description):
+            results.append(result)
+            yield RoutingResult([result], TIER_LLM)
+        self._record_llm_answer(
+            symptom_description, results, (time.perf_counter() - start) * 1000
+        )
+        self._answer(results, TIER_LLM)
+
+    def _record_llm_answer(
+        self, symptom_description: str, results: List[SpecialtyResult], latency_ms: float
+    ):
+        if not results:
+            return
+        if self.cache is not None:
+            self.cache.put(symptom_description, results)
+        self._log_decision(symptom_description, results, latency_ms)
+
+    def _answer(self, results: List[SpecialtyResult], tier: str) -> RoutingResult:
+        self.tier_counts[tier] += 1
+        logger.info("Specialty routing answered by tier: %s", tier)
+        return RoutingResult(results, tier)
+
+    def _log_decision(
+        self, symptom_description: str, results: List[SpecialtyResult], latency_ms: float
+    ):
+        if not self.decision_log_path:
+            return
+        names = []
+        for specialty, _, _ in results:
+            key = self.catalog.resolve(specialty)
+            if key is not None:
+                names.append(self.catalog.name_for(key))
+        # File I/O stays off the event loop
+        task = asyncio.create_task(
+            asyncio.to_thread(
+                self._write_decision, symptom_description, names, latency_ms
+            )
+        )
+        self._log_tasks.add(task)
+        task.add_done_callback(self._log_tasks.discard)
+
+    def _write_decision(
+        self, symptom_description: str, names: List[str], latency_ms: float
+    ):
+        with self._log_lock:
+            try:
+                append_decision(
+                    self.decision_log_path,
+                    symptom_description,
+                    names,
+                    latency_ms,
+                    max_bytes=self.decision_log_max_bytes,
+                )
+            except OSError as e:
+                logger.warning("Could not log specialty decision: %s", e)
+
+    async def flush_decision_log(self):
+        """Wait for pending decision log writes."""
+        if self._log_tasks:
+            await asyncio.gather(*self._log_tasks)
+
+    def stats(self) -> dict:
+        total = sum(self.tier_counts.values())
+        return {
+            "tiers": dict(self.tier_counts),
+            "llm_ratio": self.tier_counts[TIER_LLM] / total if total else 0.0,
+            "confidence_threshold": self.confidence_threshold,
+        }
@@ -0,0 +1,219 @@
+"""
+Startup warm-up and readiness.
+
+The app starts serving straight away, but only reports ready on /ready once
+the zip code index and the other startup indexes are loaded and the
+optional cache warm-up has finished. Load balancers should route traffic
+by /ready, so no request pays for a cold start.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.services.provider_service import (
+    get_location_from_zip,
+    provider_store,
+    radius_steps,
+    search_providers,
+    specialty_router,
+    symptom_cache,
+    train_specialty_classifier,
+)
+from app.utils.geocoding import get_zip_index
+
+logger = logging.getLogger("provider_finder.startup")
+
+STEP_PENDING = "pending"
+STEP_OK = "ok"
+STEP_FAILED = "failed"
+
+
+class StartupState:
+    """Outcome and duration of each startup step."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._started_at = clock()
+        self.steps: Dict[str, dict] = {}
+        self.finished = False
+        self.ready = False
+        self.seconds_to_ready: Optional[float] = None
+
+    def begin(self):
+        """Start timing a new startup phase."""
+        self._started_at = self._clock()
+        self.steps = {}
+        self.finished = False
+        self.ready = False
+        self.seconds_to_ready = None
+
+    async def run_step(
+        self, name: str, step: Callable[[], Awaitable[object]], required: bool = True
+    ) -> bool:
+        """
+        Run one step and record how it went.
+
+        Args:
+            name: Step name reported by /ready
+            step: Coroutine function doing the work
+            required: Whether the app cannot serve requests without it
+
+        Returns:
+            True if the step succeeded
+        """
+        entry = self.steps[name] = {"status": STEP_PENDING, "required": required}
+        start = self._clock()
+        try:
+            await step()
+        except Exception as e:
+            logger.error("Startup step %s failed: %s", name, e)
+            entry["status"] = STEP_FAILED
+            entry["error"] = str(e)
+            return False
+        else:
+            entry["status"] = STEP_OK
+            return True
+        finally:
+            entry["seconds"] = round(self._clock() - start, 4)
+
+    def finish(self):
+        """Mark startup finished; ready unless a required step failed."""
+        self.finished = True
+        self.ready = all(
+            step["status"] == STEP_OK for step in self.steps.values() if step["required"]
+        )
+        if self.ready:
+            self.seconds_to_ready = round(self._clock() - self._started_at, 4)
+
+    def stats(self) -> dict:
+        if self.ready:
+            status = "ready"
+        elif self.finished:
+            status = "failed"
+        else:
+            status = "starting"
+        return {
+            "status": status,
+            "seconds_to_ready": self.seconds_to_ready,
+            "steps": self.steps,
+        }
+
+
+async def warm_zip_codes(
+    zip_codes: List[str], radius: float, source: str, concurrency: int = 4
+) -> int:
+    """
+    Fill the provider search cache for zip codes expected to be busy.
+
+    Each zip code is searched once at the widest radius a request for
+    `radius` can widen to; smaller radii are then served from that entry.
+    Only remote searches are cached, so this does nothing for the local
+    snapshot.
+
+    Args:
+        zip_codes: Zip codes to warm
+        radius: Request radius to warm for
+        source: Provider source, "remote" or "local"
+        concurrency: Searches in flight at once
+
+    Returns:
+        Number of zip codes warmed
+    """
+    if source != "remote" or not zip_codes:
+        return 0
+    widest = radius_steps(radius)[-1]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def warm(zip_code: str) -> bool:
+        async with semaphore:
+            try:
+                location = await get_location_from_zip(zip_code)
+                await search_providers(location, widest, source)
+            except Exception as e:
+                logger.warning("Could not warm zip code %s: %s", zip_code, e)
+                return False
+            return True
+
+    warmed = sum(await asyncio.gather(*[warm(zip_code) for zip_code in zip_codes]))
+    logger.info("Warmed provider search cache for %d of %d zip codes", warmed, len(zip_codes))
+    return warmed
+
+
+async def load_symptom_cache():
+    """Read the saved symptom cache off the loop, then merge it on the loop."""
+    data = await asyncio.to_thread(symptom_cache.read)
+    if data is not None:
+        # Requests use the cache concurrently, so only the loop may modify it
+        symptom_cache.merge(data)
+
+
+async def load_specialty_classifier():
+    """Retrain the specialty classifier on the decision log off the loop."""
+    specialty_router.classifier = await asyncio.to_thread(
+        train_specialty_classifier, specialty_router.decision_log_path
+    )
+
+
+async def load_provider_snapshot():
+    """
+    Build the provider index from the snapshot.
+
+    Raises:
+        FileNotFoundError: If there is no snapshot to load
+    """
+    refreshed = await provider_store.refresh(force=True)
+    # refresh() quietly skips a missing file, so check what was loaded
+    if not refreshed or not provider_store.is_loaded:
+        raise FileNotFoundError(
+            f"Provider snapshot {provider_store.snapshot_path} not found"
+        )
+
+
+async def warm_up(
+    state: StartupState,
+    zip_codes: List[str],
+    radius: float,
+    source: str,
+    concurrency: int = 4,
+):
+    """
+    Load startup indexes and warm caches, then mark the app ready.
+
+    Args:
+        state: Records progress for /ready
+        zip_codes: Zip codes whose provider searches are pre-fetched
+        radius: Request radius to warm for
+        source: Provider source, "remote" or "local"
+        concurrency: Warm-up searches in flight at once
+    """
+    state.begin()
+    try:
+        # Requests cannot be geocoded without the index
+        zip_index_loaded = await state.run_step(
+            "zip_index", lambda: asyncio.to_thread(get_zip_index)
+        )
+        # Without the snapshot a local provider source cannot search at all
+        await state.run_step(
+            "provider_snapshot",
+            load_provider_snapshot,
+            required=source == "local",
+        )
+        await state.run_step("symptom_cache", load_symptom_cache, required=False)
+        # The import-time classifier still answers without the logged decisions
+        await state.run_step(
+            "specialty_classifier", load_specialty_classifier, required=False
+        )
+        if zip_index_loaded and zip_codes:
+            await state.run_step(
+                "warm_zip_codes",
+                lambda: warm_zip_codes(zip_codes, radius, source, concurrency),
+                required=False,
+            )
+    finally:
+        state.finish()
+    logger.info("Startup finished: %s", state.stats()["status"], extra={"startup": state.stats()})
+
+
+startup_state = StartupState()
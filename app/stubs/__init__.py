@@ -0,0 +1,3 @@
+"""
+Local stand-ins for third-party APIs, used for tests and offline runs.
+"""
@@ -0,0 +1,78 @@
+"""
+Latency and error model shared by the upstream stand-ins.
+"""
+
+import asyncio
+import math
+import random
+from typing import Optional
+
+from fastapi import HTTPException
+
+
+class UpstreamBehavior:
+    """
+    How a stand-in responds: log-normally distributed latency and a fixed
+    share of error responses.
+    """
+
+    def __init__(
+        self,
+        median_latency_seconds: float = 0.0,
+        p99_latency_seconds: Optional[float] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+    ):
+        """
+        Args:
+            median_latency_seconds: Median added latency per request
+            p99_latency_seconds: 99th percentile latency; defaults to the
+                median, i.e. constant latency
+            error_rate: Fraction of requests answered with error_status
+            error_status: HTTP status of injected errors
+            seed: Seed for the latency and error draws
+        """
+        self.median_latency_seconds = median_latency_seconds
+        p99 = median_latency_seconds if p99_latency_seconds is None else p99_latency_seconds
+        # ln(p99 / median) = z(0.99) * sigma
+        self._sigma = (
+            math.log(p99 / median_latency_seconds) / 2.326
+            if median_latency_seconds > 0 and p99 > median_latency_seconds
+            else 0.0
+        )
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self._rng = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+
+    @classmethod
+    def from_spec(cls, spec: str, seed: Optional[int] = None) -> "UpstreamBehavior":
+        """
+        Parse "median_ms[:p99_ms[:error_rate]]", e.g. "800:3000:0.01".
+        """
+        parts = spec.split(":")
+        median = float(parts[0]) / 1000 if parts and parts[0] else 0.0
+        p99 = float(parts[1]) / 1000 if len(parts) > 1 and parts[1] else None
+        error_rate = float(parts[2]) if len(parts) > 2 and parts[2] else 0.0
+        return cls(median, p99, error_rate, seed=seed)
+
+    def latency(self) -> float:
+        """Draw one request's latency in seconds."""
+        if self.median_latency_seconds <= 0:
+            return 0.0
+        return self.median_latency_seconds * math.exp(self._rng.gauss(0.0, self._sigma))
+
+    async def respond(self):
+        """Wait out a request's latency, then raise if it should fail."""
+        self.requests += 1
+        delay = self.latency()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.error_rate > 0 and self._rng.random() < self.error_rate:
+            self.errors += 1
+            raise HTTPException(status_code=self.error_status, detail="Injected error")
+
+    def stats(self) -> dict:
+        return {"requests": self.requests, "errors": self.errors}
@@ -0,0 +1,113 @@
+"""
+In-process stand-in for the outbound call API.
+
+Serves POST /v1/calls and GET /v1/calls/{call_id}. Each placed call
+completes after a delay with a recorded transcript, and its record is then
+POSTed to the call's webhook URL, unless the webhook is deliberately dropped
+to exercise the fallback poller.
+
+Run standalone with:
+    uvicorn app.stubs.call_api:app --port 8001
+"""
+
+import asyncio
+import json
+import random
+import uuid
+from pathlib import Path
+from typing import Optional
+
+import httpx
+from fastapi import Body, FastAPI, HTTPException
+
+from app.stubs.behavior import UpstreamBehavior
+
+TRANSCRIPT_FIXTURE_PATH = (
+    Path(__file__).resolve().parent.parent / "utils" / "transcript.json"
+)
+
+
+def create_app(
+    completion_delay_seconds: float = 1.0,
+    webhook_drop_rate: float = 0.0,
+    webhook_transport: Optional[httpx.AsyncBaseTransport] = None,
+    fixture_path: Path = TRANSCRIPT_FIXTURE_PATH,
+    seed: Optional[int] = None,
+    behavior: Optional[UpstreamBehavior] = None,
+) -> FastAPI:
+    """
+    Build a call API stand-in.
+
+    Args:
+        completion_delay_seconds: Time from placing a call to its completion
+        webhook_drop_rate: Fraction of completed calls whose webhook is not sent
+        webhook_transport: Transport used to deliver webhooks, e.g. an
+            httpx.ASGITransport wrapping the app under test
+        fixture_path: Recorded call record used as the template for every call
+        seed: Seed for the webhook drop decisions
+        behavior: Latency and errors of the API requests themselves
+
+    Returns:
+        The stand-in FastAPI app; its ``state.calls`` holds every call record
+    """
+    with open(fixture_path) as f:
+        template = json.load(f)
+    rng = random.Random(seed)
+    behavior = behavior or UpstreamBehavior()
+    stub = FastAPI(title="Call API stand-in")
+    stub.state.behavior = behavior
+    stub.state.calls = {}
+    stub.state.webhooks_sent = 0
+    stub.state.webhooks_dropped = 0
+    tasks = set()
+
+    async def complete(call_id: str, webhook: Optional[str]):
+        await asyncio.sleep(completion_delay_seconds)
+        call = stub.state.calls[call_id]
+        call.update(
+            completed=True,
+            queue_status="complete",
+            status="completed",
+            pathway_logs=template.get("pathway_logs") or [],
+        )
+        if not webhook:
+            return
+        if rng.random() < webhook_drop_rate:
+            stub.state.webhooks_dropped += 1
+            return
+        async with httpx.AsyncClient(transport=webhook_transport) as client:
+            await client.post(webhook, json=call)
+        stub.state.webhooks_sent += 1
+
+    @stub.post("/v1/calls")
+    async def place_call(data: dict = Body(...)):
+        await behavior.respond()
+        call_id = str(uuid.uuid4())
+        stub.state.calls[call_id] = {
+            "call_id": call_id,
+            "c_id": call_id,
+            "to": data.get("phone_number"),
+            "pathway_id": data.get("pathway_id"),
+            "request_data": data.get("request_data"),
+            "completed": False,
+            "queue_status": "started",
+            "status": "in-progress",
+            "pathway_logs": None,
+        }
+        task = asyncio.create_task(complete(call_id, data.get("webhook")))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+        return {"status": "success", "call_id": call_id}
+
+    @stub.get("/v1/calls/{call_id}")
+    async def get_call(call_id: str):
+        await behavior.respond()
+        call = stub.state.calls.get(call_id)
+        if call is None:
+            raise HTTPException(status_code=404, detail="Call not found")
+        return call
+
+    return stub
+
+
+app = create_app()
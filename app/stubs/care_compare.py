@@ -0,0 +1,152 @@
+"""
+In-process stand-in for the Care Compare provider search API.
+
+Answers radius searches with physicians spread around the search center,
+closest first. Each location gets the same providers on every run. The
+body is streamed in chunks like the real API's large responses.
+
+Run standalone with:
+    uvicorn app.stubs.care_compare:app --port 8003
+"""
+
+import json
+import math
+import random
+import zlib
+from typing import List, Optional
+
+from fastapi import Body, FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.stubs.behavior import UpstreamBehavior
+from app.utils.specialties import SPECIALTIES_PATH
+
+PROVIDER_SEARCH_PATH = "/api/care-compare/provider"
+MILES_PER_DEGREE_LATITUDE = 69.0
+
+
+def _load_specialties() -> List[dict]:
+    with open(SPECIALTIES_PATH) as f:
+        return [
+            {"specialtyId": s.get("specialtyId"), "specialtyName": s["specialtyName"]}
+            for s in json.load(f)
+            if not s.get("exclude")
+        ]
+
+
+def provider_records(
+    latitude: float,
+    longitude: float,
+    radius: float,
+    providers_per_square_mile: float,
+    max_results: int,
+    specialties: List[dict],
+) -> List[dict]:
+    """
+    Physicians within a radius of a point, closest first.
+
+    Args:
+        latitude: Search center latitude
+        longitude: Search center longitude
+        radius: Search radius in miles
+        providers_per_square_mile: Provider density around every location
+        max_results: Cap on the number of records
+        specialties: Specialties to draw from
+
+    Returns:
+        Provider records shaped like Care Compare results
+    """
+    count = min(max_results, int(providers_per_square_mile * math.pi * radius**2))
+    seed = f"{latitude:.2f},{longitude:.2f}"
+    rng = random.Random(seed)
+    prefix = zlib.crc32(seed.encode()) % 10**6
+    records = []
+    for i in range(count):
+        # Uniform over the disc
+        distance = radius * math.sqrt(rng.random())
+        bearing = rng.random() * 2 * math.pi
+        provider_id = f"{prefix}-{i}"
+        name = f"Dr. Standin {provider_id}"
+        lat = latitude + distance * math.cos(bearing) / MILES_PER_DEGREE_LATITUDE
+        lon = longitude + distance * math.sin(bearing) / (
+            MILES_PER_DEGREE_LATITUDE * max(math.cos(math.radians(latitude)), 0.01)
+        )
+        records.append(
+            {
+                "distance": round(distance, 3),
+                "name": name,
+                "id": provider_id,
+                "type": "Physician",
+                "providerId": provider_id,
+                "sortName": name,
+                "addressState": "CA",
+                "latitude": lat,
+                "longitude": lon,
+                "physician": {
+                    "name": name,
+                    "id": provider_id,
+                    "addressLine1": f"{i} Stand-in St",
+                    "addressCity": "Stand-in City",
+                    "addressState": "CA",
+                    "addressZipcode": "94105",
+                    "phone": f"415{rng.randrange(10**7):07d}",
+                    "specialties": rng.sample(specialties, 2),
+                    "groupAffiliations": [{"name": f"Group {i % 50}"}],
+                    "boardCertifications": {
+                        "boardCertifications": [{"name": "Board", "source": "ABMS"}]
+                    },
+                },
+            }
+        )
+    records.sort(key=lambda record: record["distance"])
+    return records
+
+
+def create_app(
+    behavior: Optional[UpstreamBehavior] = None,
+    providers_per_square_mile: float = 2.0,
+    max_results: int = 5000,
+    chunk_bytes: int = 16384,
+) -> FastAPI:
+    """
+    Build a Care Compare stand-in.
+
+    Args:
+        behavior: Latency and errors before the response starts
+        providers_per_square_mile: Provider density around every location
+        max_results: Cap on the number of records per search
+        chunk_bytes: Size of each streamed body chunk
+
+    Returns:
+        The stand-in FastAPI app; its ``state.behavior`` counts requests
+    """
+    behavior = behavior or UpstreamBehavior()
+    specialties = _load_specialties()
+    stub = FastAPI(title="Care Compare stand-in")
+    stub.state.behavior = behavior
+
+    @stub.post(PROVIDER_SEARCH_PATH)
+    async def search(body: dict = Body(...)):
+        await behavior.respond()
+        radius_search = body["filters"]["radiusSearch"]
+        coordinates = radius_search["coordinates"]
+        records = provider_records(
+            coordinates["lat"],
+            coordinates["lon"],
+            radius_search["radius"],
+            providers_per_square_mile,
+            max_results,
+            specialties,
+        )
+        payload = json.dumps({"results": records}).encode()
+
+        async def chunks():
+            for start in range(0, len(payload), chunk_bytes):
+                yield payload[start : start + chunk_bytes]
+
+        return StreamingResponse(chunks(), media_type="application/json")
+
+    return stub
+
+
+app = create_app()
@@ -0,0 +1,133 @@
+"""
+In-process stand-in for the LLM chat completions endpoint.
+
+Recognizes the service's prompts and answers them in the expected format:
+- specialty matching (compact and full catalog), streamed as server-sent
+  events when requested
+- single and batched call transcript extraction
+
+Run standalone with:
+    uvicorn app.stubs.llm:app --port 8002
+"""
+
+import asyncio
+import json
+import re
+import zlib
+from typing import List, Optional
+
+from fastapi import Body, FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.stubs.behavior import UpstreamBehavior
+
+CHAT_COMPLETIONS_PATH = "/v1/chat/completions"
+
+_COMPACT_CANDIDATE = re.compile(r"^(\d+): ", re.MULTILINE)
+_CATALOG_ENTRY = re.compile(r"^\s*- ([^:\n]+):", re.MULTILINE)
+_SYMPTOMS = re.compile(r"(?:Symptoms:|SYMPTOM DESCRIPTION:)\s*(.*?)\s*(?:\n\n|TASK:|$)", re.DOTALL)
+_BATCH_SIZE = re.compile(r"Here are (\d+) transcriptions")
+
+
+def _pick(options: List[str], symptoms: str, count: int = 2) -> List[str]:
+    # Deterministic per symptom description, so repeated runs match
+    start = zlib.crc32(symptoms.encode()) % len(options)
+    return [options[(start + i) % len(options)] for i in range(min(count, len(options)))]
+
+
+def _specialty_answer(prompt: str) -> str:
+    symptoms_match = _SYMPTOMS.search(prompt)
+    symptoms = symptoms_match.group(1) if symptoms_match else prompt
+    candidates = _COMPACT_CANDIDATE.findall(prompt)
+    if candidates:
+        # Candidates are ranked most likely first
+        chosen = [int(candidate) for candidate in candidates[:2]]
+    else:
+        chosen = _pick(_CATALOG_ENTRY.findall(prompt) or ["Internal medicine"], symptoms)
+    return json.dumps(
+        [
+            {
+                "RECOMMENDED_SPECIALTY": specialty,
+                "REASONING": "I recommend this specialist because they treat symptoms like yours.",
+                "CONFIDENCE": "High" if rank == 0 else "Medium",
+            }
+            for rank, specialty in enumerate(chosen)
+        ]
+    )
+
+
+def _transcript_answer(prompt: str) -> str:
+    confirmation = {
+        "available_timeslot": ["2025-05-20 10:00 - 11:00"],
+        "is_in_network": True,
+    }
+    batch = _BATCH_SIZE.search(prompt)
+    if batch:
+        answer = [
+            {"index": index, **confirmation}
+            for index in range(1, int(batch.group(1)) + 1)
+        ]
+    else:
+        answer = confirmation
+    return f"```json\n{json.dumps(answer)}\n```"
+
+
+def answer_for(messages: List[dict]) -> str:
+    """Produce the answer the service expects for a prompt."""
+    prompt = messages[-1].get("content", "") if messages else ""
+    if "transcription" in prompt:
+        return _transcript_answer(prompt)
+    return _specialty_answer(prompt)
+
+
+def create_app(
+    behavior: Optional[UpstreamBehavior] = None,
+    chunk_chars: int = 16,
+    token_interval_seconds: float = 0.0,
+) -> FastAPI:
+    """
+    Build an LLM stand-in.
+
+    Args:
+        behavior: Latency and errors before the first token
+        chunk_chars: Characters per streamed delta
+        token_interval_seconds: Delay between streamed deltas
+
+    Returns:
+        The stand-in FastAPI app; its ``state.behavior`` counts requests
+    """
+    behavior = behavior or UpstreamBehavior()
+    stub = FastAPI(title="LLM stand-in")
+    stub.state.behavior = behavior
+
+    @stub.post(CHAT_COMPLETIONS_PATH)
+    async def chat_completions(payload: dict = Body(...)):
+        await behavior.respond()
+        content = answer_for(payload.get("messages") or [])
+        if not payload.get("stream"):
+            return {
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+            }
+
+        async def events():
+            for start in range(0, len(content), chunk_chars):
+                if start and token_interval_seconds > 0:
+                    await asyncio.sleep(token_interval_seconds)
+                delta = {"choices": [{"delta": {"content": content[start : start + chunk_chars]}}]}
+                yield f"data: {json.dumps(delta)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return stub
+
+
+app = create_app()
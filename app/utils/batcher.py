@@ -0,0 +1,109 @@
+"""
+Micro-batching of independent requests to the same endpoint.
+
+Items submitted within a short window, or until the batch is full, are
+handed to one batch function together. Each submitter gets back its own
+item's result.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """Collects submitted items into batches and fans the results back out."""
+
+    def __init__(
+        self,
+        name: str,
+        run_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 8,
+        max_wait_seconds: float = 0.05,
+    ):
+        """
+        Args:
+            name: Operation name, used in stats
+            run_batch: Called with the batched items; returns one result per
+                item, in the same order
+            max_batch_size: A full batch is sent without waiting further
+            max_wait_seconds: How long the first item of a batch waits for
+                others to join it
+        """
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max_wait_seconds
+        self._run_batch = run_batch
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        # Strong references so in-flight batches are not garbage collected
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight = 0
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Add an item to the next batch and wait for its result.
+
+        Args:
+            item: Input for run_batch
+
+        Returns:
+            The result run_batch produced for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size or self.max_wait_seconds <= 0:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        task = asyncio.ensure_future(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: List[Tuple[Any, asyncio.Future]]):
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        self._in_flight += 1
+        try:
+            results = await self._run_batch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"{self.name} batch returned {len(results)} results for {len(batch)} items"
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._in_flight -= 1
+            # Cancelled or otherwise interrupted: don't leave submitters waiting
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "in_flight_batches": self._in_flight,
+            "batches": self.batches,
+            "items": self.items,
+            "largest_batch": self.largest_batch,
+            "mean_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+        }
@@ -0,0 +1,183 @@
+"""
+In-process cache for provider radius searches.
+
+Entries hold the providers found, closest first, as any objects with a
+"distance" attribute (ProviderRow or ProviderInfo).
+"""
+
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.models.schemas import Location, ProviderInfo
+
+# Rough in-memory footprint of one parsed provider, used when the caller
+# cannot supply the size of the upstream payload
+APPROX_PROVIDER_BYTES = 4096
+
+
+class _CacheEntry:
+    __slots__ = ("providers", "nbytes", "expires_at")
+
+    def __init__(self, providers: List[ProviderInfo], nbytes: int, expires_at: float):
+        self.providers = providers
+        self.nbytes = nbytes
+        self.expires_at = expires_at
+
+
+class ProviderSearchCache:
+    """
+    TTL + LRU cache of provider search results keyed on location and radius.
+
+    Coordinates are quantized so nearby lookups for the same zip code share
+    entries. A query whose radius is smaller than a cached radius around the
+    same center is answered by filtering the cached result on distance.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 600.0,
+        max_entries: int = 256,
+        max_bytes: int = 64 * 1024 * 1024,
+        precision: int = 3,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            ttl_seconds: How long an entry stays valid
+            max_entries: Maximum number of cached searches
+            max_bytes: Maximum approximate size of all cached searches
+            precision: Decimal places kept when quantizing coordinates
+            clock: Monotonic time source, injectable for tests
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.precision = precision
+        self._clock = clock
+        self._entries: "OrderedDict[Tuple, _CacheEntry]" = OrderedDict()
+        # center -> set of cached radii, for superset lookups
+        self._radii_by_center: Dict[Tuple[float, float], set] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.superset_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _center(self, location: Location) -> Tuple[float, float]:
+        return (
+            round(location.latitude, self.precision),
+            round(location.longitude, self.precision),
+        )
+
+    def _remove(self, key: Tuple):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
+        center, radius = key
+        radii = self._radii_by_center[center]
+        radii.discard(radius)
+        if not radii:
+            del self._radii_by_center[center]
+
+    def _live_entry(self, key: Tuple, now: float) -> Optional[_CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._remove(key)
+            self.expirations += 1
+            return None
+        return entry
+
+    def get(self, location: Location, radius: float) -> Optional[List[ProviderInfo]]:
+        """
+        Look up a cached search.
+
+        Args:
+            location: The search center
+            radius: The search radius
+
+        Returns:
+            The cached providers, or None on a miss
+        """
+        now = self._clock()
+        center = self._center(location)
+
+        entry = self._live_entry((center, radius), now)
+        if entry is not None:
+            self._entries.move_to_end((center, radius))
+            self.hits += 1
+            return list(entry.providers)
+
+        # Reuse the smallest cached search that covers the requested radius
+        larger = sorted(r for r in self._radii_by_center.get(center, ()) if r > radius)
+        for cached_radius in larger:
+            entry = self._live_entry((center, cached_radius), now)
+            if entry is None:
+                continue
+            self._entries.move_to_end((center, cached_radius))
+            self.superset_hits += 1
+            return [
+                provider
+                for provider in entry.providers
+                if provider.distance is not None and provider.distance <= radius
+            ]
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        location: Location,
+        radius: float,
+        providers: List[ProviderInfo],
+        nbytes: Optional[int] = None,
+    ):
+        """
+        Store a search result, evicting least recently used entries as needed.
+
+        Args:
+            location: The search center
+            radius: The search radius
+            providers: The providers found
+            nbytes: Approximate size of the result, e.g. the upstream body length
+        """
+        if nbytes is None:
+            nbytes = len(providers) * APPROX_PROVIDER_BYTES
+        if nbytes > self.max_bytes:
+            return
+
+        key = (self._center(location), radius)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _CacheEntry(
+            list(providers), nbytes, self._clock() + self.ttl_seconds
+        )
+        self._radii_by_center.setdefault(key[0], set()).add(radius)
+        self._bytes += nbytes
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self._radii_by_center.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        """Return counters and current size, for sizing the cache."""
+        lookups = self.hits + self.superset_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "superset_hits": self.superset_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": (self.hits + self.superset_hits) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,80 @@
+"""
+Async client for the outbound call API.
+"""
+
+from contextlib import nullcontext
+from typing import Optional
+
+import httpx
+
+from app.utils.constants import CALL_API_BASE_URL
+from app.utils.metrics import response_hooks
+from app.utils.resilience import DependencyGuard
+
+
+class CallAPIClient:
+    """Places outbound calls and fetches call records over a pooled connection."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = CALL_API_BASE_URL,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        guard: Optional[DependencyGuard] = None,
+    ):
+        """
+        Args:
+            api_key: Value of the authorization header
+            base_url: API root, e.g. https://api.bland.ai/v1
+            timeout: Request timeout in seconds
+            transport: Custom transport, e.g. to talk to an in-process stand-in
+            guard: Circuit breaker and concurrency limiter for every request
+        """
+        self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._timeout = timeout
+        self._transport = transport
+        self._guard = guard
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self._base_url,
+                headers={"authorization": self._api_key},
+                timeout=self._timeout,
+                transport=self._transport,
+                event_hooks=response_hooks("call_api"),
+            )
+        return self._client
+
+    def _protect(self):
+        return self._guard.protect() if self._guard is not None else nullcontext()
+
+    async def place_call(self, data: dict) -> str:
+        """
+        Start an outbound call.
+
+        Args:
+            data: Call request body
+
+        Returns:
+            The call ID
+        """
+        async with self._protect():
+            response = await self._get_client().post("/calls", json=data)
+            response.raise_for_status()
+            return response.json()["call_id"]
+
+    async def get_call(self, call_id: str) -> dict:
+        """Fetch the current record of a call, including its pathway logs."""
+        async with self._protect():
+            response = await self._get_client().get(f"/calls/{call_id}")
+            response.raise_for_status()
+            return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
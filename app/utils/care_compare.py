@@ -0,0 +1,177 @@
+"""
+Streaming client for the Care Compare provider search API.
+
+A radius search with returnAllResults can return thousands of physicians,
+each with nested specialties, affiliations and certifications. The body is
+parsed incrementally, one provider at a time. Each record is projected to
+the fields the service uses before the next one is read. The download can
+stop as soon as the caller has enough closest-first candidates.
+"""
+
+from contextlib import nullcontext
+from typing import Any, Callable, List, NamedTuple, Optional
+
+import httpx
+
+from app.models.schemas import Location
+from app.utils.constants import CARE_COMPARE_PROVIDER_URL, CARE_COMPARE_TIMEOUT_SECONDS
+from app.utils.json_stream import JSONObjectStream
+from app.utils.metrics import response_hooks
+from app.utils.resilience import DependencyGuard
+
+# Fields of a result record kept by project_provider()
+PROVIDER_FIELDS = (
+    "distance",
+    "name",
+    "id",
+    "type",
+    "providerId",
+    "sortName",
+    "firstName",
+    "lastName",
+    "addressState",
+    "isDuplicateAddress",
+    "isCanonicalAddress",
+    "latitude",
+    "longitude",
+)
+PHYSICIAN_FIELDS = (
+    "name",
+    "id",
+    "providerId",
+    "firstName",
+    "lastName",
+    "addressLine1",
+    "addressLine2",
+    "addressCity",
+    "addressState",
+    "addressZipcode",
+    "phone",
+    "organizationName",
+    "telehealth",
+)
+SPECIALTY_FIELDS = ("specialtyId", "specialtyName")
+
+
+def project_provider(record: dict) -> dict:
+    """Keep only the fields of a provider record that the service uses."""
+    projected = {field: record[field] for field in PROVIDER_FIELDS if field in record}
+    physician = record.get("physician")
+    if physician:
+        projected_physician = {
+            field: physician[field] for field in PHYSICIAN_FIELDS if field in physician
+        }
+        if physician.get("specialties"):
+            projected_physician["specialties"] = [
+                {field: specialty.get(field) for field in SPECIALTY_FIELDS}
+                for specialty in physician["specialties"]
+            ]
+        projected["physician"] = projected_physician
+    return projected
+
+
+def build_search_body(location: Location, radius: float) -> dict:
+    """Request body for a closest-first radius search."""
+    return {
+        "type": "Physician",
+        "filters": {
+            "radiusSearch": {
+                "coordinates": {
+                    "lon": location.longitude,
+                    "lat": location.latitude,
+                },
+                "radius": radius,
+            }
+        },
+        "returnAllResults": True,
+        "sort": ["closest"],
+    }
+
+
+class CareCompareResult(NamedTuple):
+    records: List[Any]
+    nbytes: int
+    # False if the download stopped before the end of the result set
+    complete: bool
+
+
+class CareCompareClient:
+    """Radius searches against Care Compare over a pooled connection."""
+
+    def __init__(
+        self,
+        url: str = CARE_COMPARE_PROVIDER_URL,
+        timeout: float = CARE_COMPARE_TIMEOUT_SECONDS,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        guard: Optional[DependencyGuard] = None,
+    ):
+        """
+        Args:
+            url: Provider search URL
+            timeout: Request timeout in seconds
+            transport: Custom transport, e.g. to talk to an in-process stand-in
+            guard: Circuit breaker and concurrency limiter for every request
+        """
+        self._url = url
+        self._timeout = timeout
+        self._transport = transport
+        self._guard = guard
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                transport=self._transport,
+                event_hooks=response_hooks("care_compare"),
+            )
+        return self._client
+
+    def _protect(self):
+        return self._guard.protect() if self._guard is not None else nullcontext()
+
+    async def search(
+        self,
+        location: Location,
+        radius: float,
+        convert: Optional[Callable[[dict], Any]] = None,
+        is_enough: Optional[Callable[[Any], bool]] = None,
+    ) -> CareCompareResult:
+        """
+        Search providers around a location, closest first.
+
+        Args:
+            location: Center of the search
+            radius: Search radius in miles
+            convert: Applied to each projected record as it is parsed
+            is_enough: Called with each converted record; returning True
+                stops the download
+
+        Returns:
+            The converted records read, the bytes read and whether the whole
+            result set was read
+        """
+        records = []
+        nbytes = 0
+        async with self._protect(), self._get_client().stream(
+            "POST", self._url, json=build_search_body(location, radius)
+        ) as response:
+            response.raise_for_status()
+            stream = JSONObjectStream(depth=2, key="results")
+            async for chunk in response.aiter_text():
+                nbytes += len(chunk)
+                for record in stream.feed(chunk):
+                    record = project_provider(record)
+                    if convert is not None:
+                        record = convert(record)
+                    records.append(record)
+                    if is_enough is not None and is_enough(record):
+                        return CareCompareResult(records, nbytes, complete=False)
+                if stream.done:
+                    break
+        return CareCompareResult(records, nbytes, complete=True)
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
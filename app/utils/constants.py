@@ -1,8 +1,191 @@
+import os
+from pathlib import Path
+
 from app.models.schemas import (
     ProviderInfo,
     ProviderRecommendations,
 )
 
+# LLM endpoint and connection pool settings
+LLM_API_URL = os.getenv(
+    "LLM_API_URL",
+    "https://np6jbwtoaiv4y8cw.us-east4.gcp.endpoints.huggingface.cloud/v1/chat/completions",
+)
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "200"))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", "50"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+# Stream specialty answers so each one can be acted on as soon as it closes
+LLM_STREAMING = os.getenv("LLM_STREAMING", "1") == "1"
+
+# Provider search: "remote" queries Care Compare, "local" uses the snapshot
+CARE_COMPARE_PROVIDER_URL = os.getenv(
+    "CARE_COMPARE_PROVIDER_URL", "https://www.medicare.gov/api/care-compare/provider"
+)
+PROVIDER_SOURCE = os.getenv("PROVIDER_SOURCE", "remote")
+CARE_COMPARE_TIMEOUT_SECONDS = float(os.getenv("CARE_COMPARE_TIMEOUT_SECONDS", "30"))
+# Providers recommended per specialty
+PROVIDERS_PER_SPECIALTY = int(os.getenv("PROVIDERS_PER_SPECIALTY", "5"))
+# "progressive" starts with a small radius and widens only until every
+# recommended specialty has PROVIDERS_PER_SPECIALTY providers; "fixed"
+# searches the requested radius once
+PROVIDER_RADIUS_MODE = os.getenv("PROVIDER_RADIUS_MODE", "progressive")
+PROVIDER_RADIUS_STEPS = [
+    float(step) for step in os.getenv("PROVIDER_RADIUS_STEPS", "5,10,25,50").split(",")
+]
+# Searches stop at the requested radius. With PROVIDER_RADIUS_WIDEN=1,
+# sparse areas may widen past it up to PROVIDER_RADIUS_MAX
+PROVIDER_RADIUS_WIDEN = os.getenv("PROVIDER_RADIUS_WIDEN", "0") == "1"
+PROVIDER_RADIUS_MAX = float(os.getenv("PROVIDER_RADIUS_MAX", "50"))
+PROVIDER_SNAPSHOT_PATH = os.getenv(
+    "PROVIDER_SNAPSHOT_PATH",
+    str(Path(__file__).resolve().parent.parent / "data" / "providers.jsonl"),
+)
+PROVIDER_SNAPSHOT_REFRESH_SECONDS = float(
+    os.getenv("PROVIDER_SNAPSHOT_REFRESH_SECONDS", "3600")
+)
+# Append live Care Compare results to the snapshot to grow it over time
+PROVIDER_SNAPSHOT_RECORD = os.getenv("PROVIDER_SNAPSHOT_RECORD", "0") == "1"
+
+# Prebuilt zip code index, see scripts/build_zip_index.py. The app reports
+# not ready without it.
+ZIP_INDEX_PATH = os.getenv(
+    "ZIP_INDEX_PATH",
+    str(Path(__file__).resolve().parent.parent / "data" / "us_zipcodes.npz"),
+)
+# Comma-separated zip codes whose provider searches are cached before the
+# app reports ready, for requests of WARMUP_RADIUS
+WARMUP_ZIP_CODES = [
+    zip_code.strip()
+    for zip_code in os.getenv("WARMUP_ZIP_CODES", "").split(",")
+    if zip_code.strip()
+]
+WARMUP_RADIUS = float(os.getenv("WARMUP_RADIUS", "25"))
+WARMUP_CONCURRENCY = int(os.getenv("WARMUP_CONCURRENCY", "4"))
+
+# Cache of remote provider searches
+PROVIDER_CACHE_TTL_SECONDS = float(os.getenv("PROVIDER_CACHE_TTL_SECONDS", "600"))
+PROVIDER_CACHE_MAX_ENTRIES = int(os.getenv("PROVIDER_CACHE_MAX_ENTRIES", "256"))
+PROVIDER_CACHE_MAX_BYTES = int(
+    os.getenv("PROVIDER_CACHE_MAX_BYTES", str(256 * 1024 * 1024))
+)
+
+# Cache of symptom -> specialty mappings, persisted across restarts
+SYMPTOM_CACHE_MAX_ENTRIES = int(os.getenv("SYMPTOM_CACHE_MAX_ENTRIES", "2048"))
+SYMPTOM_CACHE_SIMILARITY_THRESHOLD = float(
+    os.getenv("SYMPTOM_CACHE_SIMILARITY_THRESHOLD", "0.9")
+)
+SYMPTOM_CACHE_PATH = os.getenv(
+    "SYMPTOM_CACHE_PATH",
+    str(Path(__file__).resolve().parent.parent / "data" / "symptom_cache.json"),
+)
+
+# Local classifier tier in front of the LLM for specialty routing
+SPECIALTY_CLASSIFIER_THRESHOLD = float(
+    os.getenv("SPECIALTY_CLASSIFIER_THRESHOLD", "0.5")
+)
+# Number of candidate specialties sent in the compact LLM prompt, 0 sends
+# the full catalog
+SPECIALTY_PROMPT_CANDIDATES = int(os.getenv("SPECIALTY_PROMPT_CANDIDATES", "8"))
+# Always offered to the LLM in compact mode so vague complaints have a home
+GENERAL_SPECIALTIES = [
+    "Internal medicine",
+    "Family practice",
+    "General practice",
+    "Emergency medicine",
+]
+# LLM routing decisions, replayed into the classifier at startup. Each line
+# holds the patient's raw symptom text, so the log is PHI-like data: keep it
+# on private storage and out of backups and bug reports. It is rotated to
+# "<path>.1" at SPECIALTY_DECISION_LOG_MAX_BYTES; set the path empty to
+# disable logging.
+SPECIALTY_DECISION_LOG_PATH = os.getenv(
+    "SPECIALTY_DECISION_LOG_PATH",
+    str(Path(__file__).resolve().parent.parent / "data" / "specialty_decisions.jsonl"),
+)
+SPECIALTY_DECISION_LOG_MAX_BYTES = int(
+    os.getenv("SPECIALTY_DECISION_LOG_MAX_BYTES", str(16 * 1024 * 1024))
+)
+
+# Outbound call API. Completion arrives via webhook at CALL_WEBHOOK_URL,
+# which must point at this app's /calls/webhook route
+CALL_API_BASE_URL = os.getenv("CALL_API_BASE_URL", "https://api.bland.ai/v1")
+CALL_WEBHOOK_URL = os.getenv("CALL_WEBHOOK_URL", "")
+# Shared secret expected in the X-Webhook-Secret header. Required when
+# CALL_WEBHOOK_URL is set; the app refuses to start without it.
+CALL_WEBHOOK_SECRET = os.getenv("CALL_WEBHOOK_SECRET", "")
+CALL_TRANSCRIPT_TIMEOUT_SECONDS = float(
+    os.getenv("CALL_TRANSCRIPT_TIMEOUT_SECONDS", "78")
+)
+# How long a call may go without its webhook before the fallback poller
+# checks on it. Without a webhook URL every call is polled straight away.
+CALL_WEBHOOK_GRACE_SECONDS = (
+    float(os.getenv("CALL_WEBHOOK_GRACE_SECONDS", "15")) if CALL_WEBHOOK_URL else 0.0
+)
+CALL_POLL_INTERVAL_SECONDS = float(os.getenv("CALL_POLL_INTERVAL_SECONDS", "3"))
+# Transcript extraction requests that arrive within the window share one LLM
+# prompt, up to the batch size
+TRANSCRIPT_BATCH_MAX_SIZE = int(os.getenv("TRANSCRIPT_BATCH_MAX_SIZE", "8"))
+TRANSCRIPT_BATCH_WINDOW_SECONDS = float(
+    os.getenv("TRANSCRIPT_BATCH_WINDOW_SECONDS", "0.05")
+)
+
+# Central call scheduler limits
+CALL_MAX_CONCURRENT = int(os.getenv("CALL_MAX_CONCURRENT", "20"))
+# Limits per phone number. A real clinic line takes one call at a time, so
+# deployments calling clinics should set 1 call with e.g. 30s between
+# calls. They are off by default because every live call still goes to the
+# two demo numbers in connect_provider_worker: per-number limits would
+# queue each request behind all the others and reject calls within minutes.
+CALL_PER_NUMBER_MAX_CONCURRENT = int(
+    os.getenv("CALL_PER_NUMBER_MAX_CONCURRENT", str(CALL_MAX_CONCURRENT))
+)
+CALL_PER_NUMBER_INTERVAL_SECONDS = float(
+    os.getenv("CALL_PER_NUMBER_INTERVAL_SECONDS", "0")
+)
+# Calls allowed to wait for a line, and how long one may wait before it is
+# dropped; requests then get a 503 instead of queueing indefinitely
+CALL_MAX_QUEUED = int(os.getenv("CALL_MAX_QUEUED", "100"))
+CALL_MAX_QUEUE_WAIT_SECONDS = float(os.getenv("CALL_MAX_QUEUE_WAIT_SECONDS", "90"))
+# Retry-After sent with those 503s
+CALL_BUSY_RETRY_AFTER_SECONDS = int(os.getenv("CALL_BUSY_RETRY_AFTER_SECONDS", "30"))
+
+# Response bodies at least this large are compressed when the client accepts
+# gzip or brotli
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_COMPRESSION_LEVEL = int(os.getenv("RESPONSE_COMPRESSION_LEVEL", "5"))
+
+# Logging. LOG_FORMAT is "json" or "text"; the per-logger settings are
+# "logger=value" lists, see app/utils/logging_config.py
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# Share of a logger's records below WARNING to keep, e.g. "provider_finder.service=0.1"
+LOG_SAMPLING = os.getenv("LOG_SAMPLING", "")
+# Records per second a logger may emit below WARNING
+LOG_RATE_LIMITS = os.getenv("LOG_RATE_LIMITS", "")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# Background recommendation jobs. New jobs are rejected while
+# RECOMMENDATION_JOB_MAX_JOBS are still running.
+RECOMMENDATION_JOB_MAX_JOBS = int(os.getenv("RECOMMENDATION_JOB_MAX_JOBS", "1000"))
+RECOMMENDATION_JOB_TTL_SECONDS = float(
+    os.getenv("RECOMMENDATION_JOB_TTL_SECONDS", "3600")
+)
+
+# Circuit breakers: consecutive failures that open a dependency's circuit and
+# how long it stays open before a probe call is let through
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("BREAKER_RESET_SECONDS", "30"))
+# Starting AIMD concurrency limits per dependency; successes slower than the
+# latency threshold back the limit off like failures do
+LLM_CONCURRENCY_LIMIT = int(os.getenv("LLM_CONCURRENCY_LIMIT", "50"))
+LLM_LATENCY_THRESHOLD_SECONDS = float(os.getenv("LLM_LATENCY_THRESHOLD_SECONDS", "20"))
+CARE_COMPARE_CONCURRENCY_LIMIT = int(os.getenv("CARE_COMPARE_CONCURRENCY_LIMIT", "20"))
+CARE_COMPARE_LATENCY_THRESHOLD_SECONDS = float(
+    os.getenv("CARE_COMPARE_LATENCY_THRESHOLD_SECONDS", "10")
+)
+CALL_API_CONCURRENCY_LIMIT = int(os.getenv("CALL_API_CONCURRENCY_LIMIT", "50"))
+
 DEFAULT_PROVIDER_RECOMMENDATIONS = [
     ProviderRecommendations(
         provider_infos=[
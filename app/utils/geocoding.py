@@ -0,0 +1,202 @@
+"""
+Array-backed US zip code geocoding index.
+"""
+
+import threading
+from pathlib import Path
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from app.utils.constants import ZIP_INDEX_PATH
+
+# US zip codes are five digits, so every code maps to a slot in a dense table
+_NUM_ZIP_SLOTS = 100_000
+
+
+def normalize_zip_code(zip_code: Union[str, int]) -> int:
+    """
+    Convert a zip code to its integer form.
+
+    Args:
+        zip_code: Zip code as an int, a 5 digit string or a ZIP+4 string
+
+    Returns:
+        Integer zip code, or -1 if the value is not a valid zip code
+    """
+    if isinstance(zip_code, (int, np.integer)):
+        value = int(zip_code)
+    else:
+        digits = str(zip_code).strip().split("-", 1)[0]
+        if not digits.isdigit():
+            return -1
+        value = int(digits)
+    return value if 0 <= value < _NUM_ZIP_SLOTS else -1
+
+
+class ZipCodeIndex:
+    """Zip code to coordinate lookup backed by flat numpy arrays."""
+
+    def __init__(self, zips, latitudes, longitudes):
+        """
+        Args:
+            zips: Integer zip codes
+            latitudes: Latitude per zip code
+            longitudes: Longitude per zip code
+        """
+        zips = np.asarray(zips, dtype=np.int32)
+        order = np.argsort(zips, kind="stable")
+        self.zips = zips[order]
+        self.latitudes = np.asarray(latitudes, dtype=np.float32)[order]
+        self.longitudes = np.asarray(longitudes, dtype=np.float32)[order]
+
+        # Dense zip -> row table gives O(1) lookups for single and batch queries
+        self._slots = np.full(_NUM_ZIP_SLOTS, -1, dtype=np.int32)
+        self._slots[self.zips] = np.arange(len(self.zips), dtype=np.int32)
+
+    def __len__(self) -> int:
+        return len(self.zips)
+
+    def lookup(self, zip_code: Union[str, int]) -> Optional[Tuple[float, float]]:
+        """
+        Look up a single zip code.
+
+        Args:
+            zip_code: The zip code to look up
+
+        Returns:
+            (latitude, longitude) tuple, or None if the zip code is unknown
+        """
+        value = normalize_zip_code(zip_code)
+        if value < 0:
+            return None
+        row = self._slots[value]
+        if row < 0:
+            return None
+        return float(self.latitudes[row]), float(self.longitudes[row])
+
+    def lookup_many(
+        self, zip_codes: Iterable[Union[str, int]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Look up many zip codes in one vectorized pass.
+
+        Args:
+            zip_codes: The zip codes to look up
+
+        Returns:
+            (latitudes, longitudes, found) arrays aligned with the input.
+            Coordinates are NaN where found is False.
+        """
+        values = np.fromiter(
+            (normalize_zip_code(z) for z in zip_codes), dtype=np.int64
+        )
+        rows = np.full(len(values), -1, dtype=np.int32)
+        valid = values >= 0
+        rows[valid] = self._slots[values[valid]]
+        found = rows >= 0
+
+        latitudes = np.full(len(values), np.nan, dtype=np.float32)
+        longitudes = np.full(len(values), np.nan, dtype=np.float32)
+        latitudes[found] = self.latitudes[rows[found]]
+        longitudes[found] = self.longitudes[rows[found]]
+        return latitudes, longitudes, found
+
+    def save(self, path: Union[str, Path]):
+        """Serialize the index to a compressed .npz file."""
+        np.savez_compressed(
+            path,
+            zips=self.zips,
+            latitudes=self.latitudes,
+            longitudes=self.longitudes,
+        )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ZipCodeIndex":
+        """Load an index written by save()."""
+        with np.load(path) as data:
+            return cls(data["zips"], data["latitudes"], data["longitudes"])
+
+    @classmethod
+    def from_geonames(cls, lines: Iterable[str]) -> "ZipCodeIndex":
+        """
+        Build the index from the GeoNames US postal code dump (US.txt).
+
+        Args:
+            lines: Tab-separated lines of the dump
+        """
+        zips, latitudes, longitudes = [], [], []
+        for line in lines:
+            fields = line.rstrip("\n").split("\t")
+            # country, postal code, place, 3 admin levels with codes, lat, lon
+            if len(fields) < 11 or not fields[1].isdigit() or len(fields[1]) != 5:
+                continue
+            try:
+                latitude, longitude = float(fields[9]), float(fields[10])
+            except ValueError:
+                continue
+            zips.append(int(fields[1]))
+            latitudes.append(latitude)
+            longitudes.append(longitude)
+        return cls(zips, latitudes, longitudes)
+
+
+_zip_index: Optional[ZipCodeIndex] = None
+_zip_index_lock = threading.Lock()
+
+
+def load_zip_index(path: Union[str, Path] = ZIP_INDEX_PATH) -> ZipCodeIndex:
+    """
+    Load the prebuilt zip code index from disk.
+
+    The index is built ahead of time by scripts/build_zip_index.py; the app
+    never downloads geocoding data itself.
+
+    Args:
+        path: Location of the serialized index
+
+    Returns:
+        The loaded index
+
+    Raises:
+        FileNotFoundError: If the index has not been built
+    """
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(
+            f"Zip code index {path} not found; build it with "
+            "python -m scripts.build_zip_index"
+        )
+    return ZipCodeIndex.load(path)
+
+
+def get_zip_index() -> ZipCodeIndex:
+    """Return the process-wide zip code index, loading it on first use."""
+    global _zip_index
+    if _zip_index is None:
+        with _zip_index_lock:
+            if _zip_index is None:
+                _zip_index = load_zip_index()
+    return _zip_index
+
+
+def loaded_zip_index() -> ZipCodeIndex:
+    """
+    Return the process-wide zip code index without loading it.
+
+    Request handlers use this so they never block the event loop on a
+    load in progress; the index is loaded during startup warm-up.
+
+    Raises:
+        ValueError: If the index has not been loaded yet
+    """
+    index = _zip_index
+    if index is None:
+        raise ValueError("Zip code index is not loaded yet")
+    return index
+
+
+def set_zip_index(index: Optional[ZipCodeIndex]):
+    """Replace the process-wide zip code index."""
+    global _zip_index
+    _zip_index = index
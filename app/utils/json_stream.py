@@ -0,0 +1,143 @@
+"""
+Incremental extraction of JSON objects from a text stream.
+"""
+
+import json
+import re
+from typing import AsyncIterator, List, Optional
+
+# Characters that can change the parser state outside of a string
+_STRUCTURAL = re.compile(r'[\[\]{}":]')
+# Characters that can end or escape inside a string
+_STRING_SPECIAL = re.compile(r'["\\]')
+
+
+class JSONObjectStream:
+    """
+    Pulls complete JSON objects out of a document as it arrives in chunks.
+
+    Objects are emitted as soon as their closing brace is seen, for every
+    object that opens at the given nesting depth, optionally only inside the
+    array or object stored under a given key. Text outside the JSON document,
+    such as markdown fences around an LLM answer, is ignored.
+
+    Examples:
+        JSONObjectStream(depth=1) emits each element of a top-level array.
+        JSONObjectStream(depth=2, key="results") emits each element of the
+        "results" array of a top-level object.
+    """
+
+    def __init__(self, depth: int = 1, key: Optional[str] = None):
+        self.depth = depth
+        self.key = key
+        self._buffer = ""
+        self._pos = 0
+        # Key under which each currently open container was found
+        self._stack: List[Optional[str]] = []
+        self._in_string = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._capture_start: Optional[int] = None
+        self._capture_depth = 0
+        self.done = False
+
+    def feed(self, text: str) -> List[dict]:
+        """
+        Consume the next chunk of text.
+
+        Returns:
+            Objects completed by this chunk, in document order
+        """
+        buffer = self._buffer + text
+        pos = self._pos
+        objects = []
+        while True:
+            if self._in_string:
+                match = _STRING_SPECIAL.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == "\\":
+                    if match.end() >= len(buffer):
+                        # Wait for the escaped character
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                if self._capture_start is None:
+                    self._last_string = buffer[self._string_start : match.start()]
+                pos = match.end()
+                continue
+
+            match = _STRUCTURAL.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                self._in_string = True
+                self._string_start = pos
+            elif char == ":":
+                self._pending_key = self._last_string
+            elif char in "[{":
+                if (
+                    char == "{"
+                    and self._capture_start is None
+                    and len(self._stack) == self.depth
+                    and (self.key is None or self._stack[-1] == self.key)
+                ):
+                    self._capture_start = match.start()
+                    self._capture_depth = len(self._stack)
+                self._stack.append(self._pending_key)
+                self._pending_key = None
+            else:
+                if self._stack:
+                    self._stack.pop()
+                self._pending_key = None
+                if (
+                    char == "}"
+                    and self._capture_start is not None
+                    and len(self._stack) == self._capture_depth
+                ):
+                    try:
+                        objects.append(json.loads(buffer[self._capture_start : pos]))
+                    except json.JSONDecodeError:
+                        pass
+                    self._capture_start = None
+                if not self._stack:
+                    self.done = True
+
+        # Drop text that can no longer be part of an object or key
+        if self._capture_start is not None:
+            keep = self._capture_start
+        elif self._in_string:
+            keep = self._string_start
+        else:
+            keep = pos
+        self._buffer = buffer[keep:]
+        self._pos = pos - keep
+        if self._capture_start is not None:
+            self._capture_start -= keep
+        if self._in_string:
+            self._string_start -= keep
+        return objects
+
+
+async def aiter_json_objects(
+    chunks: AsyncIterator[str], depth: int = 1, key: Optional[str] = None
+) -> AsyncIterator[dict]:
+    """
+    Yield JSON objects from an async stream of text chunks as they complete.
+
+    Args:
+        chunks: Async iterator of text chunks
+        depth: Nesting depth at which objects are emitted
+        key: Only emit objects inside the container stored under this key
+    """
+    stream = JSONObjectStream(depth=depth, key=key)
+    async for chunk in chunks:
+        for obj in stream.feed(chunk):
+            yield obj
@@ -1,17 +1,102 @@
-import requests
+import httpx
 import json
+import logging
+from contextlib import nullcontext
+
+from app.utils.constants import (
+    LLM_API_URL,
+    LLM_MAX_CONNECTIONS,
+    LLM_MAX_KEEPALIVE_CONNECTIONS,
+    LLM_TIMEOUT_SECONDS,
+)
+from app.utils.metrics import response_hooks
+
+logger = logging.getLogger("provider_finder.llm")
+
+
+def _http2_available() -> bool:
+    """Return True if the optional h2 package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
 
 
 class LLMClient:
-    def __init__(self, api_key):
-        self._url = "https://np6jbwtoaiv4y8cw.us-east4.gcp.endpoints.huggingface.cloud/v1/chat/completions"
+    """
+    Awaitable client for the chat completions endpoint.
+
+    A single instance owns one keep-alive connection pool and is meant to be
+    shared across the service, so concurrent requests reuse connections
+    instead of opening a new one per completion.
+    """
+
+    def __init__(
+        self,
+        api_key,
+        url=LLM_API_URL,
+        max_connections=LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=LLM_MAX_KEEPALIVE_CONNECTIONS,
+        timeout=LLM_TIMEOUT_SECONDS,
+        http2=None,
+        guard=None,
+        transport=None,
+    ):
+        """
+        Args:
+            api_key (str): Bearer token for the endpoint.
+            url (str): Chat completions URL.
+            max_connections (int): Upper bound on open connections in the pool.
+            max_keepalive_connections (int): Idle connections kept alive for reuse.
+            timeout (float): Default timeout in seconds, overridable per call.
+            http2 (bool, optional): Force HTTP/2 on or off. Defaults to on
+                when the h2 package is installed.
+            guard (DependencyGuard, optional): Circuit breaker and concurrency
+                limiter applied to every request.
+            transport (httpx.AsyncBaseTransport, optional): Custom transport,
+                e.g. to talk to an in-process stand-in.
+        """
+        self._url = url
         self._api_key = api_key
+        self._limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._timeout = timeout
+        self._http2 = _http2_available() if http2 is None else http2
+        self._guard = guard
+        self._transport = transport
+        self._client = None
 
-    def make_chat_completions_request(self, model, messages, temperature, max_tokens):
-        headers = {
-            "Authorization": f"Bearer {self._api_key}",
-            "Content-Type": "application/json",
-        }
+    def _protect(self):
+        return self._guard.protect() if self._guard is not None else nullcontext()
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self._http2,
+                limits=self._limits,
+                timeout=self._timeout,
+                transport=self._transport,
+                event_hooks=response_hooks("llm"),
+                headers={
+                    "Authorization": f"Bearer {self._api_key}",
+                    "Content-Type": "application/json",
+                },
+            )
+        return self._client
+
+    async def make_chat_completions_request(
+        self, model, messages, temperature, max_tokens, timeout=None
+    ):
+        """
+        Send a chat completions request and return the decoded JSON body.
+
+        Args:
+            timeout (float, optional): Per-call timeout in seconds. Defaults
+                to the client-wide timeout.
+        """
         payload = {
             "model": model,
             "messages": messages,
@@ -19,9 +104,58 @@ class LLMClient:
             "max_tokens": max_tokens,
             "stream": False,
         }
-        response = requests.post(self._url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        return response.json()
+        async with self._protect():
+            response = await self._get_client().post(
+                self._url,
+                json=payload,
+                timeout=self._timeout if timeout is None else timeout,
+            )
+            response.raise_for_status()
+            return response.json()
+
+    async def stream_chat_completions(
+        self, model, messages, temperature, max_tokens, timeout=None
+    ):
+        """
+        Send a streaming chat completions request.
+
+        Yields:
+            str: Content deltas as the server-sent events arrive
+        """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "stream": True,
+        }
+        async with self._protect() as call, self._get_client().stream(
+            "POST",
+            self._url,
+            json=payload,
+            timeout=self._timeout if timeout is None else timeout,
+        ) as response:
+            response.raise_for_status()
+            if call is not None:
+                # Time spent by our consumer between chunks is not upstream latency
+                call.responded()
+            async for line in response.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                data = line[len("data:") :].strip()
+                if data == "[DONE]":
+                    break
+                choices = json.loads(data).get("choices") or []
+                if choices:
+                    content = (choices[0].get("delta") or {}).get("content")
+                    if content:
+                        yield content
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 def process_json_response(response):
@@ -42,7 +176,7 @@ def process_json_response(response):
             parsed_response = json.loads(content)
             return parsed_response
         except json.JSONDecodeError as e:
-            print(f"\nCouldn't parse JSON: {e}")
-            print("Raw content:", content)
+            # The content can echo the patient's symptoms, so it is not logged
+            logger.debug("Couldn't parse LLM response as JSON (%d chars): %s", len(content), e)
     else:
-        print("Unexpected response format:", response)
+        logger.debug("Unexpected LLM response format, keys: %s", sorted(response))
@@ -0,0 +1,347 @@
+"""
+Non-blocking, structured logging.
+
+Log calls only build a record and put it on an in-memory queue; a
+QueueListener thread formats and writes it, so the event loop never waits
+on log I/O. Records keep their %-style arguments until the listener formats
+them, so log with logger.info("... %s", value) rather than f-strings.
+
+Records carry the ID of the request they were logged under and are written
+as one JSON object per line (LOG_FORMAT=text for the old human-readable
+lines). Chatty loggers can be sampled or rate limited without code changes:
+
+    LOG_LEVELS="provider_finder.call_registry=WARNING"
+    LOG_SAMPLING="provider_finder.service=0.1"
+    LOG_RATE_LIMITS="provider_finder=200"
+
+Rules apply to a logger and its children, the most specific rule wins.
+Sampling and rate limits only ever drop records below WARNING.
+"""
+
+import json
+import logging
+import queue
+import random
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Callable, Dict, Optional, Tuple
+
+from app.utils.constants import (
+    LOG_FORMAT,
+    LOG_LEVEL,
+    LOG_LEVELS,
+    LOG_QUEUE_SIZE,
+    LOG_RATE_LIMITS,
+    LOG_SAMPLING,
+)
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+REQUEST_ID_HEADER = "x-request-id"
+# Longer client-supplied IDs are replaced rather than logged
+MAX_REQUEST_ID_LENGTH = 128
+
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra=
+_RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", None, None))
+) | {"message", "asctime", "request_id"}
+
+
+def parse_rules(spec: str, convert: Callable[[str], object] = float) -> Dict[str, object]:
+    """
+    Parse "logger=value,logger=value" settings.
+
+    Args:
+        spec: Comma-separated rules, e.g. "provider_finder.service=0.1"
+        convert: Applied to each value
+
+    Returns:
+        Values by logger name; malformed entries are skipped
+    """
+    rules = {}
+    for entry in spec.split(","):
+        name, sep, value = entry.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            rules[name.strip()] = convert(value.strip())
+        except ValueError:
+            continue
+    return rules
+
+
+def _rule_for(rules: Dict[str, object], name: str) -> Optional[object]:
+    """The rule for a logger or its nearest configured ancestor."""
+    while True:
+        if name in rules:
+            return rules[name]
+        if "." not in name:
+            return rules.get("")
+        name = name.rsplit(".", 1)[0]
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current request ID, "-" outside requests."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get() or "-"
+        return True
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, clock: Callable[[], float]):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = clock()
+
+    def take(self, now: float) -> bool:
+        self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop a share of a logger's records and cap how many it emits per second.
+
+    WARNING and above always pass. Rules are resolved once per logger name.
+    """
+
+    def __init__(
+        self,
+        sampling: Optional[Dict[str, float]] = None,
+        rate_limits: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        rand: Callable[[], float] = random.random,
+    ):
+        super().__init__()
+        self.sampling = sampling or {}
+        self.rate_limits = rate_limits or {}
+        self._clock = clock
+        self._random = rand
+        # Logger name -> (sample rate, token bucket)
+        self._resolved: Dict[str, Tuple[Optional[float], Optional[_TokenBucket]]] = {}
+        # (logger name, reason) -> records dropped
+        self.dropped: Dict[Tuple[str, str], int] = {}
+
+    def _resolve(self, name: str) -> Tuple[Optional[float], Optional[_TokenBucket]]:
+        resolved = self._resolved.get(name)
+        if resolved is None:
+            rate = _rule_for(self.rate_limits, name)
+            resolved = self._resolved[name] = (
+                _rule_for(self.sampling, name),
+                _TokenBucket(rate, self._clock) if rate is not None else None,
+            )
+        return resolved
+
+    def _drop(self, name: str, reason: str) -> bool:
+        key = (name, reason)
+        self.dropped[key] = self.dropped.get(key, 0) + 1
+        return False
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not (self.sampling or self.rate_limits):
+            return True
+        sample_rate, bucket = self._resolve(record.name)
+        if sample_rate is not None and sample_rate < 1 and self._random() >= sample_rate:
+            return self._drop(record.name, "sampled")
+        if bucket is not None and not bucket.take(self._clock()):
+            return self._drop(record.name, "rate_limited")
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, including any extra= fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", "-") != "-":
+            entry["request_id"] = record.request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str)
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Enqueue records without formatting them and never block when full.
+
+    The stock QueueHandler formats every message in the logging thread so
+    records can be pickled; ours stay in-process, so formatting is left to
+    the listener thread. When the queue is full, records below WARNING are
+    dropped and the rest are written synchronously through the overflow
+    handler.
+    """
+
+    def __init__(self, log_queue: queue.Queue, overflow: Optional[logging.Handler] = None):
+        super().__init__(log_queue)
+        self.overflow = overflow
+        self.queue_full = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            if self.overflow is not None and record.levelno >= logging.WARNING:
+                self.overflow.handle(record)
+            else:
+                self.queue_full += 1
+
+
+_listener: Optional[QueueListener] = None
+_handler: Optional[LazyQueueHandler] = None
+_sampler: Optional[SamplingFilter] = None
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    fmt: str = LOG_FORMAT,
+    levels: str = LOG_LEVELS,
+    sampling: str = LOG_SAMPLING,
+    rate_limits: str = LOG_RATE_LIMITS,
+    queue_size: int = LOG_QUEUE_SIZE,
+    stream=None,
+) -> QueueListener:
+    """
+    Route all logging through a queue to a background writer thread.
+
+    Replaces the root logger's handlers; calling it again reconfigures.
+
+    Args:
+        level: Root log level name
+        fmt: "json" or "text"
+        levels: Per-logger levels, e.g. "provider_finder.service=WARNING"
+        sampling: Per-logger share of records below WARNING to keep
+        rate_limits: Per-logger records per second below WARNING
+        queue_size: Records buffered before new ones below WARNING are
+            dropped
+        stream: Where records are written, standard error by default
+
+    Returns:
+        The running listener
+    """
+    global _listener, _handler, _sampler
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    _sampler = SamplingFilter(parse_rules(sampling), parse_rules(rate_limits))
+    _handler = LazyQueueHandler(queue.Queue(maxsize=queue_size), overflow=output)
+    # Filters run in the logging thread: the request ID is only visible
+    # there, and dropped records never reach the queue
+    _handler.addFilter(_sampler)
+    _handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(_handler)
+    root.setLevel(level.upper())
+    for name, logger_level in parse_rules(levels, str.upper).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener = QueueListener(_handler.queue, output, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """
+    Flush queued records and stop the writer thread.
+
+    Anything logged afterwards is written synchronously.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    root = logging.getLogger()
+    if _handler in root.handlers:
+        root.removeHandler(_handler)
+        for handler in _listener.handlers:
+            handler.addFilter(RequestIdFilter())
+            root.addHandler(handler)
+    _listener = None
+
+
+def log_stats() -> dict:
+    """Records dropped by sampling, rate limiting or a full queue."""
+    dropped = {}
+    if _sampler is not None:
+        for (name, reason), count in _sampler.dropped.items():
+            dropped.setdefault(reason, {})[name] = count
+    return {
+        "dropped": dropped,
+        "queue_full": _handler.queue_full if _handler is not None else 0,
+        "queued": _handler.queue.qsize() if _handler is not None else 0,
+    }
+
+
+class RequestIdMiddleware:
+    """
+    ASGI middleware giving every HTTP request an ID for its log records.
+
+    A client-supplied X-Request-ID is reused, otherwise one is generated;
+    either way it is echoed in the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        value = None
+        for name, header in scope["headers"]:
+            if name == REQUEST_ID_HEADER.encode():
+                value = header.decode("latin-1")
+                break
+        if not value or len(value) > MAX_REQUEST_ID_LENGTH or not value.isprintable():
+            value = uuid.uuid4().hex
+        encoded = value.encode("latin-1")
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                message = {
+                    **message,
+                    "headers": [
+                        *message.get("headers", []),
+                        (REQUEST_ID_HEADER.encode(), encoded),
+                    ],
+                }
+            await send(message)
+
+        # Tasks started while handling the request inherit the ID
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,274 @@
+"""
+Prometheus-format metrics.
+
+Hot-path instruments (stage latency histograms, in-flight gauges, upstream
+status counters) are plain in-process counters updated in O(1). Component
+counters that already exist as stats() dictionaries (caches, coalescing,
+circuit breakers, call scheduling) are read only when /metrics is scraped,
+so they cost nothing per request.
+"""
+
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; covers in-memory lookups up to minute-long calls
+DEFAULT_BUCKETS = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120,
+)
+
+# stats() keys that only ever grow; exported as counters
+COUNTER_KEYS = frozenset(
+    (
+        "hits", "near_hits", "superset_hits", "misses", "evictions", "expirations",
+        "calls", "failures", "rejected", "times_opened", "started", "completed",
+        "failed", "resolved_by_webhook", "resolved_by_poll", "timeouts", "polls",
+        "leaders", "deduplicated", "batches", "items",
+    )
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> Labels:
+        return tuple((name, str(labels[name])) for name in self.labelnames)
+
+    def samples(self) -> Iterable[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count per label set."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> Iterable[Sample]:
+        for key, value in self._values.items():
+            yield self.name, dict(key), value
+
+
+class Gauge(_Metric):
+    """Current value per label set."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def set(self, value: float, **labels: str):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> Iterable[Sample]:
+        for key, value in self._values.items():
+            yield self.name, dict(key), value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count per label set."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., overflow count], sum
+        self._counts: Dict[Labels, List[int]] = {}
+        self._sums: Dict[Labels, float] = {}
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def samples(self) -> Iterable[Sample]:
+        for key, counts in self._counts.items():
+            labels = dict(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                yield self.name + "_bucket", {**labels, "le": _format_value(bound)}, cumulative
+            yield self.name + "_sum", labels, self._sums[key]
+            yield self.name + "_count", labels, cumulative
+
+
+Collector = Callable[[], Iterable[Tuple[str, str, str, Iterable[Tuple[Dict[str, str], float]]]]]
+
+
+class MetricsRegistry:
+    """Metrics and scrape-time collectors rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Collector] = []
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Collector):
+        """
+        Add a function called on every scrape.
+
+        It returns (name, type, help, [(labels, value), ...]) families.
+        """
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        families: Dict[str, Tuple[str, str, List[str]]] = {}
+        for collector in self._collectors:
+            for name, type, help, samples in collector():
+                family = families.setdefault(name, (type, help, []))
+                for labels, value in samples:
+                    family[2].append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        for name, (type, help, samples) in families.items():
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {type}")
+            lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+def stats_families(
+    prefix: str, stats: dict, labels: Optional[Dict[str, str]] = None
+) -> Iterator[Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]]:
+    """
+    Turn a component's stats() dictionary into metric families.
+
+    Numeric leaves become gauges, or counters for keys in COUNTER_KEYS.
+    Nested dictionaries extend the metric name.
+
+    Args:
+        prefix: Metric name prefix, e.g. "provider_finder_cache"
+        stats: The stats dictionary
+        labels: Labels added to every sample, e.g. {"cache": "symptom"}
+    """
+    labels = labels or {}
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            yield from stats_families(f"{prefix}_{key}", value, labels)
+        elif isinstance(value, bool) or isinstance(value, (int, float)):
+            if key in COUNTER_KEYS:
+                name, type = f"{prefix}_{key}_total", "counter"
+            else:
+                name, type = f"{prefix}_{key}", "gauge"
+            yield name, type, f"{prefix} {key}", [(labels, float(value))]
+
+
+registry = MetricsRegistry()
+
+STAGE_SECONDS = registry.histogram(
+    "provider_finder_stage_seconds",
+    "Wall-clock latency of recommend and connect pipeline stages",
+    ["stage"],
+)
+STAGE_IN_FLIGHT = registry.gauge(
+    "provider_finder_stage_in_flight",
+    "Pipeline stages currently running",
+    ["stage"],
+)
+UPSTREAM_RESPONSES = registry.counter(
+    "provider_finder_upstream_responses_total",
+    "Upstream HTTP responses by dependency and status code",
+    ["dependency", "status"],
+)
+
+
+@contextmanager
+def track_stage(stage: str, clock: Callable[[], float] = time.perf_counter) -> Iterator[None]:
+    """Count a stage as in flight while the block runs and record its latency."""
+    STAGE_IN_FLIGHT.inc(stage=stage)
+    start = clock()
+    try:
+        yield
+    finally:
+        STAGE_SECONDS.observe(clock() - start, stage=stage)
+        STAGE_IN_FLIGHT.dec(stage=stage)
+
+
+def response_hooks(dependency: str) -> dict:
+    """httpx event hooks counting a client's responses by status code."""
+
+    async def record(response):
+        UPSTREAM_RESPONSES.inc(dependency=dependency, status=str(response.status_code))
+
+    return {"response": [record]}
@@ -0,0 +1,137 @@
+"""
+Stage pipeline with explicit dependencies and per-stage timings.
+
+Stages whose dependencies are met run concurrently, so independent
+branches overlap. Their latencies combine as the maximum over branches,
+not the sum.
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterator,
+    Optional,
+    Sequence,
+)
+
+
+def _retrieve_exception(task: asyncio.Task):
+    # A failed stage also fails its dependents, which nobody may await once
+    # the request gives up; mark their errors as retrieved
+    if not task.cancelled():
+        task.exception()
+
+
+class Pipeline:
+    """Runs named async stages once their dependencies finish and times each one."""
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        track: Optional[Callable[[str], ContextManager]] = None,
+    ):
+        """
+        Args:
+            clock: Time source for timings
+            track: Called with a stage name; the returned context manager
+                wraps every run of the stage, e.g. to export metrics
+        """
+        self._clock = clock
+        self._track = track
+        self._origin = clock()
+        self._stages: Dict[str, tuple] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.timings: Dict[str, Dict[str, float]] = {}
+
+    def stage(
+        self,
+        name: str,
+        fn: Callable[..., Awaitable[Any]],
+        after: Sequence[str] = (),
+    ):
+        """
+        Declare a stage.
+
+        Args:
+            name: Stage name, used for results and timings
+            fn: Coroutine function called with the results of its
+                dependencies, in the order they are listed
+            after: Names of stages that must finish first
+        """
+        for dependency in after:
+            if dependency not in self._stages:
+                raise ValueError(f"Stage {name} depends on unknown stage {dependency}")
+        self._stages[name] = (fn, tuple(after))
+
+    def start(self):
+        """Start every declared stage; each waits for its own dependencies."""
+        for name in self._stages:
+            if name not in self._tasks:
+                task = asyncio.ensure_future(self._run(name))
+                task.add_done_callback(_retrieve_exception)
+                self._tasks[name] = task
+
+    async def _run(self, name: str) -> Any:
+        fn, after = self._stages[name]
+        inputs = [await self._tasks[dependency] for dependency in after]
+        with self.timed(name):
+            return await fn(*inputs)
+
+    async def result(self, name: str) -> Any:
+        """Wait for a stage and return its result, starting the pipeline if needed."""
+        self.start()
+        return await self._tasks[name]
+
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """
+        Time a block as a stage. Repeated blocks with the same name add up.
+        """
+        start = self._clock()
+        try:
+            if self._track is None:
+                yield
+            else:
+                with self._track(name):
+                    yield
+        finally:
+            end = self._clock()
+            timing = self.timings.get(name)
+            if timing is None:
+                self.timings[name] = {
+                    "start_ms": (start - self._origin) * 1000,
+                    "duration_ms": (end - start) * 1000,
+                }
+            else:
+                timing["duration_ms"] += (end - start) * 1000
+
+    def cancel(self):
+        """Cancel stages that have not finished."""
+        for task in self._tasks.values():
+            if not task.done():
+                task.cancel()
+
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self._origin) * 1000
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Rounded timings plus the total elapsed time, for logs and responses."""
+        summary = {
+            name: {key: round(value, 1) for key, value in timing.items()}
+            for name, timing in self.timings.items()
+        }
+        summary["total"] = {"start_ms": 0.0, "duration_ms": round(self.elapsed_ms(), 1)}
+        return summary
+
+
+def server_timing_header(timings: Optional[Dict[str, Dict[str, float]]]) -> str:
+    """Format stage timings as a Server-Timing header value."""
+    return ", ".join(
+        f"{name};dur={timing['duration_ms']:.1f}" for name, timing in (timings or {}).items()
+    )
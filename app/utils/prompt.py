@@ -1,66 +1,45 @@
 import json
 
+from app.utils.specialties import SPECIALTIES_PATH
 
-class PromptGenerator:
-    """Class for generating prompts for medical specialty matching"""
-
-    def __init__(self, specialties_file_path=None):
-        """
-        Initialize the PromptGenerator with the path to the specialties.json file.
-
-        Args:
-            specialties_file_path (str, optional): Path to the specialties.json file.
-                If None, defaults to '../services/specialties.json'
-        """
-        self.specialties = self._get_specialty_list(specialties_file_path)
-
-    def create_specialty_matching_prompt(self, symptom_description):
-        """
-        Create a prompt for the LLM to match a patient description to a specialty
-
-        Args:
-            symptom_description (str): Description of the patient's symptoms
-
-        Returns:
-            str: A formatted prompt for the LLM
-        """
-        # Construct the prompt with context and schema requirements
-        return f"""
+_PROMPT_HEAD = """
         You are a medical professional tasked with determining the most appropriate medical specialty for a patient based on their description of symptoms or conditions.
 
         Below are the available medical specialties with their descriptions:
 
-        {self._format_specialties(self.specialties)}
+        {specialties}
 
         SYMPTOM DESCRIPTION:
-        {symptom_description}
+        """
+
+_PROMPT_TAIL = """
 
         TASK: Based on the patient's description, determine the most appropriate medical specialty from the list above. 
         Consider the symptoms, conditions, and affected body systems described by the patient.
 
         Your response "MUST" strictly adhere to the following JSON format:
 
-        Example (not to include ```json ```): {{
+        Example (not to include ```json ```): {
         "RECOMMENDED_SPECIALTY": ["specialty1", "specialty2", "specialty3"],
         "REASONING": "Explain why these specialties are recommended based on the patient's symptoms and conditions.",
         "CONFIDENCE": "One of 'High', 'Medium', or 'Low'"
-        }}
+        }
 
         - RECOMMENDED_SPECIALTY: array of strings (up to 2 specialties from the provided list, in order of relevance)
         - REASONING: string (detailed but concise explanation of your recommendation, Pretend you are a medical advisor and provide a easy to understand explanation for this patient why these specialties are recommended in first person (maximum 20 words))
         - CONFIDENCE: string (must be one of: "High", "Medium", or "Low")
 
         Example: [
-        {{
+        {
             "RECOMMENDED_SPECIALTY": "specialty1",
             "REASONING": "Explain why these specialties are recommended based on the patient's symptoms and conditions.",
             "CONFIDENCE": "One of 'High', 'Medium', or 'Low'"
-        }},
-        {{
+        },
+        {
             "RECOMMENDED_SPECIALTY": "specialty2",
             "REASONING": "Explain why these specialties are recommended based on the patient's symptoms and conditions.",
             "CONFIDENCE": "One of 'High', 'Medium', or 'Low'"
-        }}
+        }
         ]
 
         - RECOMMENDED_SPECIALTY: string (up to 2 specialties from the provided list, in order of relevance)
@@ -71,6 +50,100 @@ class PromptGenerator:
         The length of the array should be up to 2.
         """
 
+_COMPACT_PROMPT = """Pick up to 2 medical specialties for this patient, most relevant first.
+
+Specialties (id: name - description):
+{specialties}
+Symptoms: {symptom_description}
+
+Respond with only a JSON array, no markdown:
+[{{"RECOMMENDED_SPECIALTY": <id>, "REASONING": "<first person explanation for the patient, max 20 words>", "CONFIDENCE": "High" | "Medium" | "Low"}}]
+"""
+
+
+class PromptGenerator:
+    """Class for generating prompts for medical specialty matching"""
+
+    def __init__(self, specialties_file_path=None):
+        """
+        Initialize the PromptGenerator with the path to the specialties.json file.
+
+        Args:
+            specialties_file_path (str, optional): Path to the specialties.json file.
+                If None, defaults to the packaged app/data/specialties.json
+        """
+        self.specialties = self._get_specialty_list(
+            specialties_file_path or SPECIALTIES_PATH
+        )
+        self._prompt_head = _PROMPT_HEAD.format(
+            specialties=self._format_specialties(self.specialties)
+        )
+        self._compact_lines = {
+            specialty["specialtyName"]: f"{idx}: {specialty['specialtyName']} - {specialty['description']}\n"
+            for idx, specialty in enumerate(self.specialties)
+        }
+
+    def create_specialty_matching_prompt(self, symptom_description):
+        """
+        Create a prompt for the LLM to match a patient description to a specialty
+
+        Args:
+            symptom_description (str): Description of the patient's symptoms
+
+        Returns:
+            str: A formatted prompt for the LLM
+        """
+        # The catalog part of the prompt is rendered once in __init__
+        return self._prompt_head + symptom_description + _PROMPT_TAIL
+
+    def create_compact_specialty_matching_prompt(
+        self, symptom_description, candidate_names
+    ):
+        """
+        Create a short prompt that only lists candidate specialties by numeric id
+
+        Args:
+            symptom_description (str): Description of the patient's symptoms
+            candidate_names (list): Specialty names pre-selected as plausible
+
+        Returns:
+            str: A formatted prompt for the LLM
+        """
+        lines = [
+            self._compact_lines[name]
+            for name in dict.fromkeys(candidate_names)
+            if name in self._compact_lines
+        ]
+        return _COMPACT_PROMPT.format(
+            specialties="".join(lines), symptom_description=symptom_description
+        )
+
+    def specialty_name_for_id(self, specialty_id, candidate_names=None):
+        """
+        Map a numeric id used in the compact prompt back to a specialty name
+
+        Args:
+            specialty_id (int or str): Id returned by the LLM
+            candidate_names (list, optional): Specialty names offered in the
+                prompt; ids or names of any other specialty are rejected
+
+        Returns:
+            str: The specialty name, the input unchanged if it is not an id,
+                or None if it names a specialty that was not offered
+        """
+        try:
+            idx = int(specialty_id)
+        except (ValueError, TypeError):
+            if candidate_names is not None and specialty_id not in candidate_names:
+                return None
+            return specialty_id
+        if not 0 <= idx < len(self.specialties):
+            return None
+        name = self.specialties[idx]["specialtyName"]
+        if candidate_names is not None and name not in candidate_names:
+            return None
+        return name
+
     def _format_specialties(self, specialties):
         """
         Format the specialties list for the prompt
@@ -81,10 +154,10 @@ class PromptGenerator:
         Returns:
             str: Formatted specialties text
         """
-        formatted = ""
-        for specialty in specialties:
-            formatted += f"- {specialty['specialtyName']}: {specialty['description']}\n"
-        return formatted
+        return "".join(
+            f"- {specialty['specialtyName']}: {specialty['description']}\n"
+            for specialty in specialties
+        )
 
     def _get_specialty_list(self, specialties_file_path):
         """
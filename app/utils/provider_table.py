@@ -0,0 +1,132 @@
+"""
+Compact provider rows for filtering and ranking search results.
+
+A radius search can return thousands of providers, of which only a handful
+per specialty are recommended. Rows keep the few fields needed to select
+providers plus the projected source record. A full ProviderInfo model is
+only built for the providers that are actually returned.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.models.schemas import ProviderInfo
+from app.utils.specialties import (
+    SpecialtyCatalog,
+    record_specialty_keys,
+    resolve_specialty_key,
+)
+
+
+class ProviderRow:
+    """One provider from a search result."""
+
+    __slots__ = (
+        "id",
+        "name",
+        "distance",
+        "phone",
+        "latitude",
+        "longitude",
+        "specialty_keys",
+        "record",
+    )
+
+    def __init__(
+        self,
+        id: Optional[str],
+        name: Optional[str],
+        distance: Optional[float],
+        phone: Optional[str],
+        latitude: Optional[float],
+        longitude: Optional[float],
+        specialty_keys: Tuple[str, ...],
+        record: dict,
+    ):
+        self.id = id
+        self.name = name
+        self.distance = distance
+        self.phone = phone
+        self.latitude = latitude
+        self.longitude = longitude
+        self.specialty_keys = specialty_keys
+        self.record = record
+
+    @classmethod
+    def from_record(
+        cls,
+        record: dict,
+        catalog: SpecialtyCatalog,
+        distance: Optional[float] = None,
+    ) -> "ProviderRow":
+        """
+        Build a row from a Care Compare provider record.
+
+        Args:
+            record: Projected provider record
+            catalog: Specialty catalog used to resolve specialty keys
+            distance: Distance to the search center, if not in the record
+        """
+        physician = record.get("physician") or {}
+        return cls(
+            id=record.get("id"),
+            name=record.get("name"),
+            distance=record.get("distance") if distance is None else distance,
+            phone=physician.get("phone"),
+            latitude=record.get("latitude"),
+            longitude=record.get("longitude"),
+            specialty_keys=tuple(record_specialty_keys(catalog, record)),
+            record=record,
+        )
+
+    def to_provider_info(self) -> ProviderInfo:
+        """Build the full API model for this provider."""
+        provider = ProviderInfo(**self.record)
+        provider.distance = self.distance
+        return provider
+
+
+def materialize(rows: Sequence[ProviderRow]) -> List[ProviderInfo]:
+    """Build API models for the given rows."""
+    return [row.to_provider_info() for row in rows]
+
+
+class ProviderTable:
+    """
+    Search result rows with an inverted index from specialty key to rows.
+
+    Rows are expected in distance order, so rows within each posting list
+    stay closest first and top-k selection is a slice.
+    """
+
+    def __init__(self, rows: List[ProviderRow], catalog: SpecialtyCatalog):
+        self.rows = rows
+        self.catalog = catalog
+        self._postings: Dict[str, List[int]] = {}
+        for position, row in enumerate(rows):
+            for key in row.specialty_keys:
+                self._postings.setdefault(key, []).append(position)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def select(self, specialty: str, k: Optional[int] = None) -> List[ProviderRow]:
+        """
+        Return the rows offering a specialty, closest first.
+
+        Args:
+            specialty: Specialty name, alias or id
+            k: Maximum number of rows to return
+
+        Returns:
+            Matching rows
+        """
+        positions = self._postings.get(resolve_specialty_key(self.catalog, specialty), [])
+        if k is not None:
+            positions = positions[:k]
+        return [self.rows[position] for position in positions]
+
+    def count(self, specialty: str) -> int:
+        """Return the number of rows offering a specialty."""
+        return len(
+            self._postings.get(resolve_specialty_key(self.catalog, specialty), ())
+        )
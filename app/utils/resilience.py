@@ -0,0 +1,299 @@
+"""
+Circuit breakers and adaptive concurrency limits for upstream dependencies.
+
+Each upstream (LLM, Care Compare, call API) gets a DependencyGuard. The
+breaker fails calls fast while a dependency is unhealthy instead of letting
+every request wait out its timeout. The limiter sheds calls beyond an
+AIMD-adjusted concurrency limit before queues build up.
+
+Only errors that say the dependency itself is unhealthy count against it:
+transport errors, timeouts and 5xx responses. A 4xx answer or a failure to
+use a response (a missing key, bad JSON) means the dependency did respond.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, Optional
+
+import httpx
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class DependencyUnavailableError(Exception):
+    """Raised instead of calling a dependency that is failing or overloaded."""
+
+    def __init__(self, dependency: str, reason: str):
+        super().__init__(f"{dependency} unavailable: {reason}")
+        self.dependency = dependency
+        self.reason = reason
+
+
+class CircuitOpenError(DependencyUnavailableError):
+    def __init__(self, dependency: str):
+        super().__init__(dependency, "circuit open")
+
+
+class ConcurrencyLimitExceededError(DependencyUnavailableError):
+    def __init__(self, dependency: str):
+        super().__init__(dependency, "concurrency limit reached")
+
+
+def is_dependency_failure(error: BaseException) -> bool:
+    """Return True if an error says the dependency is unhealthy."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, (httpx.TransportError, asyncio.TimeoutError))
+
+
+class GuardedCall:
+    """Handle for one call inside DependencyGuard.protect()."""
+
+    def __init__(self, clock: Callable[[], float]):
+        self._clock = clock
+        self.started_at = clock()
+        self.responded_at: Optional[float] = None
+
+    def responded(self):
+        """
+        Mark the moment the call got its response.
+
+        Streaming callers mark the first byte, so the latency fed to the
+        limiter does not include the time their consumer spends on the
+        stream.
+        """
+        if self.responded_at is None:
+            self.responded_at = self._clock()
+
+    def latency(self) -> float:
+        end = self.responded_at if self.responded_at is not None else self._clock()
+        return end - self.started_at
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and probes again after a cool-down."""
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout_seconds: Time an open circuit waits before letting
+                a single probe call through
+            clock: Monotonic time source, injectable for tests
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self._clock = clock
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == CIRCUIT_OPEN
+            and self._clock() - self._opened_at >= self.reset_timeout_seconds
+        ):
+            self._state = CIRCUIT_HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+    def allow(self) -> bool:
+        """Return True if a call may go through now."""
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        self.rejected += 1
+        return False
+
+    def record_success(self):
+        self._state = CIRCUIT_CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def release_probe(self):
+        """Let another probe through after one that ended without an outcome."""
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self._failures += 1
+        if self._state == CIRCUIT_HALF_OPEN or self._failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        if self._state != CIRCUIT_OPEN:
+            self.times_opened += 1
+        self._state = CIRCUIT_OPEN
+        self._opened_at = self._clock()
+        self._probe_in_flight = False
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted by additive increase, multiplicative decrease.
+
+    Every success grows the limit by 1/limit, about one slot per window of
+    calls. A failure, or a success slower than the latency threshold, shrinks
+    it by the backoff ratio. Calls beyond the limit are rejected rather than
+    queued.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_threshold_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            initial_limit: Starting concurrency limit
+            min_limit: Floor of the limit
+            max_limit: Ceiling of the limit
+            backoff_ratio: Factor applied to the limit on overload signals
+            latency_threshold_seconds: Successes slower than this count as
+                overload signals; None only reacts to failures
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_threshold_seconds = latency_threshold_seconds
+        self._limit = float(initial_limit)
+        self.in_flight = 0
+        self.rejected = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free."""
+        if self.in_flight >= self.limit:
+            self.rejected += 1
+            return False
+        self.in_flight += 1
+        return True
+
+    def release(self, latency_seconds: float, succeeded: Optional[bool]):
+        """
+        Return a slot and adjust the limit from the call's outcome.
+
+        Args:
+            latency_seconds: How long the call took
+            succeeded: Outcome of the call, or None to leave the limit alone
+                (e.g. the caller cancelled)
+        """
+        self.in_flight -= 1
+        if succeeded is None:
+            return
+        slow = (
+            self.latency_threshold_seconds is not None
+            and latency_seconds > self.latency_threshold_seconds
+        )
+        if succeeded and not slow:
+            self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+        else:
+            self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+        }
+
+
+class DependencyGuard:
+    """Circuit breaker plus adaptive limiter for one upstream dependency."""
+
+    def __init__(
+        self,
+        name: str,
+        breaker: Optional[CircuitBreaker] = None,
+        limiter: Optional[AdaptiveLimiter] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.breaker = breaker or CircuitBreaker()
+        self.limiter = limiter or AdaptiveLimiter()
+        self._clock = clock
+        self.calls = 0
+        self.failures = 0
+
+    @asynccontextmanager
+    async def protect(self) -> AsyncIterator[GuardedCall]:
+        """
+        Run the enclosed upstream call under the breaker and limiter.
+
+        Yields:
+            The call's handle
+
+        Raises:
+            CircuitOpenError: The dependency is failing
+            ConcurrencyLimitExceededError: The dependency is at its limit
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.name)
+        if not self.limiter.try_acquire():
+            # Shed load without counting it against the dependency's health
+            self.breaker.release_probe()
+            raise ConcurrencyLimitExceededError(self.name)
+        self.calls += 1
+        call = GuardedCall(self._clock)
+        try:
+            yield call
+        except Exception as e:
+            if not is_dependency_failure(e):
+                self._record_success(call)
+                raise
+            self.failures += 1
+            self.breaker.record_failure()
+            self.limiter.release(call.latency(), succeeded=False)
+            raise
+        except BaseException:
+            # Cancelled or abandoned by the caller, which says nothing about
+            # the dependency
+            self.breaker.release_probe()
+            self.limiter.release(call.latency(), succeeded=None)
+            raise
+        self._record_success(call)
+
+    def _record_success(self, call: GuardedCall):
+        self.breaker.record_success()
+        self.limiter.release(call.latency(), succeeded=True)
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "circuit": self.breaker.stats(),
+            "concurrency": self.limiter.stats(),
+        }
+
+
+def guard_stats(guards: Dict[str, DependencyGuard]) -> Dict[str, dict]:
+    """Collect the stats of several guards keyed by dependency name."""
+    return {name: guard.stats() for name, guard in guards.items()}
@@ -0,0 +1,205 @@
+"""
+Exact and near-duplicate cache for symptom to specialty mappings.
+"""
+
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from app.utils.text import cosine, normalize_text, term_counts, tfidf_vector, tokenize
+
+logger = logging.getLogger("provider_finder.semantic_cache")
+
+SpecialtyResult = Tuple[str, str, str]
+
+
+class _SymptomEntry:
+    __slots__ = ("terms", "results")
+
+    def __init__(self, terms: Dict[str, int], results: List[SpecialtyResult]):
+        self.terms = terms
+        self.results = results
+
+
+class SymptomCache:
+    """
+    Cache of (specialty, reasoning, confidence) results per symptom description.
+
+    Exact hits match on normalized text. Otherwise the closest cached
+    description by TF-IDF cosine similarity is returned if it clears the
+    threshold. Entries are evicted least recently used first.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        similarity_threshold: float = 0.9,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        """
+        Args:
+            max_entries: Maximum number of cached descriptions
+            similarity_threshold: Minimum cosine similarity for a near hit,
+                or None to only serve exact hits
+            path: File used by save() and load()
+        """
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.path = Path(path) if path else None
+        self._entries: "OrderedDict[str, _SymptomEntry]" = OrderedDict()
+        self._document_frequency: Dict[str, int] = {}
+        self._postings: Dict[str, set] = {}
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, symptom_description: str) -> Optional[List[SpecialtyResult]]:
+        """
+        Look up cached results for a symptom description.
+
+        Returns:
+            The cached results, or None on a miss
+        """
+        key = normalize_text(symptom_description)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry.results)
+
+        match = self._nearest(symptom_description)
+        if match is not None:
+            self._entries.move_to_end(match)
+            self.near_hits += 1
+            return list(self._entries[match].results)
+
+        self.misses += 1
+        return None
+
+    def _nearest(self, symptom_description: str) -> Optional[str]:
+        if self.similarity_threshold is None or not self._entries:
+            return None
+        terms = term_counts(tokenize(symptom_description))
+        candidates = set()
+        for term in terms:
+            candidates.update(self._postings.get(term, ()))
+        if not candidates:
+            return None
+
+        num_documents = len(self._entries)
+        query = tfidf_vector(terms, self._document_frequency, num_documents)
+        best_key, best_score = None, self.similarity_threshold
+        for key in candidates:
+            vector = tfidf_vector(
+                self._entries[key].terms, self._document_frequency, num_documents
+            )
+            score = cosine(query, vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+        return best_key
+
+    def peek(self, symptom_description: str) -> Optional[List[SpecialtyResult]]:
+        """Like get(), but without touching recency or the hit counters."""
+        key = normalize_text(symptom_description)
+        if key not in self._entries:
+            key = self._nearest(symptom_description)
+        if key is None:
+            return None
+        return list(self._entries[key].results)
+
+    def put(self, symptom_description: str, results: List[SpecialtyResult]):
+        """Store results for a symptom description."""
+        key = normalize_text(symptom_description)
+        if key in self._entries:
+            self._remove(key)
+        terms = term_counts(tokenize(symptom_description))
+        self._entries[key] = _SymptomEntry(terms, [tuple(r) for r in results])
+        for term in terms:
+            self._document_frequency[term] = self._document_frequency.get(term, 0) + 1
+            self._postings.setdefault(term, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        for term in entry.terms:
+            self._document_frequency[term] -= 1
+            if not self._document_frequency[term]:
+                del self._document_frequency[term]
+            postings = self._postings[term]
+            postings.discard(key)
+            if not postings:
+                del self._postings[term]
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        """Write the cache to disk, oldest entries first."""
+        path = Path(path or self.path)
+        data = [
+            {"symptom_description": key, "results": entry.results}
+            for key, entry in self._entries.items()
+        ]
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: Optional[Union[str, Path]] = None) -> bool:
+        """
+        Load entries written by save(), if the file exists.
+
+        Returns:
+            True if a cache file was loaded
+        """
+        data = self.read(path)
+        if data is None:
+            return False
+        self.merge(data)
+        return True
+
+    def read(self, path: Optional[Union[str, Path]] = None) -> Optional[List[dict]]:
+        """
+        Read a file written by save() without touching the cache.
+
+        Safe to call from a worker thread while the cache is in use.
+
+        Returns:
+            The saved entries, or None if the file does not exist
+        """
+        path = Path(path or self.path)
+        if not path.exists():
+            return None
+        with open(path, "r") as f:
+            data = json.load(f)
+        logger.info("Read %d cached symptom mappings from %s", len(data), path)
+        return data
+
+    def merge(self, data: List[dict]):
+        """
+        Add entries returned by read(), oldest first.
+
+        Entries already cached are kept, since they are at least as recent.
+        """
+        for item in data:
+            if normalize_text(item["symptom_description"]) not in self._entries:
+                self.put(item["symptom_description"], item["results"])
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": (self.hits + self.near_hits) / lookups if lookups else 0.0,
+        }
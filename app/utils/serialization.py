@@ -0,0 +1,165 @@
+"""
+Fast encoding of recommendation responses.
+
+Recommendations carry full provider records, most of which clients never
+render. Responses are serialized in one pass by a prebuilt pydantic
+serializer rather than FastAPI's per-request response_model validation.
+They can be cut down to the provider fields a client asks for, encoded as
+msgpack, and compressed when large.
+
+orjson, msgpack and brotli are optional; without them responses fall back
+to the standard json module, JSON output and gzip respectively.
+"""
+
+import gzip
+import json
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+from app.models.schemas import ProviderRecommendations
+from app.utils.constants import (
+    RESPONSE_COMPRESSION_LEVEL,
+    RESPONSE_COMPRESSION_MIN_BYTES,
+)
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPES = ("application/msgpack", "application/x-msgpack")
+
+# Built once; serializing model instances through it skips FastAPI's
+# per-request response_model validation
+recommendations_adapter = TypeAdapter(List[ProviderRecommendations])
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode JSON-compatible data as compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Split a comma-separated fields= value; None or empty selects everything."""
+    if not fields:
+        return None
+    selected = [field.strip() for field in fields.split(",") if field.strip()]
+    return selected or None
+
+
+def project(record: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """
+    Keep only the selected fields of a record.
+
+    Args:
+        record: Serialized provider, keyed by alias
+        fields: Field names; "physician.phone" selects a nested field
+
+    Returns:
+        The projected record; fields missing from the record are skipped
+    """
+    projected: Dict[str, Any] = {}
+    for field in fields:
+        name, _, rest = field.partition(".")
+        if name not in record:
+            continue
+        value = record[name]
+        if rest and isinstance(value, dict):
+            nested = project(value, [rest])
+            if nested:
+                projected.setdefault(name, {}).update(nested)
+        elif not rest:
+            projected[name] = value
+    return projected
+
+
+def dump_recommendations(
+    recommendations: Iterable[ProviderRecommendations],
+    fields: Optional[Sequence[str]] = None,
+) -> Any:
+    """
+    Serialize recommendations, optionally projecting each provider.
+
+    Args:
+        recommendations: Recommendations to serialize
+        fields: Provider fields to keep; None keeps every field
+
+    Returns:
+        JSON-compatible data, keyed by alias like response_model output
+    """
+    data = recommendations_adapter.dump_python(
+        list(recommendations), mode="json", by_alias=True
+    )
+    if fields:
+        for recommendation in data:
+            recommendation["provider_infos"] = [
+                project(provider, fields)
+                for provider in recommendation.get("provider_infos") or []
+            ]
+    return data
+
+
+def _accepts(header: Optional[str], token: str) -> bool:
+    for part in (header or "").lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if name.strip() == token:
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def encode_response(
+    data: Any,
+    accept: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Build a response for JSON-compatible data, negotiating format and encoding.
+
+    Args:
+        data: JSON-compatible data
+        accept: Request Accept header; msgpack is used if requested and
+            available
+        accept_encoding: Request Accept-Encoding header; bodies of at least
+            RESPONSE_COMPRESSION_MIN_BYTES are compressed with brotli or gzip
+        status_code: Response status code
+        headers: Extra response headers
+
+    Returns:
+        The encoded response
+    """
+    headers = dict(headers or {})
+    if msgpack is not None and any(_accepts(accept, media) for media in MSGPACK_MEDIA_TYPES):
+        body = msgpack.packb(data)
+        media_type = MSGPACK_MEDIA_TYPES[0]
+    else:
+        body = dumps(data)
+        media_type = JSON_MEDIA_TYPE
+
+    if len(body) >= RESPONSE_COMPRESSION_MIN_BYTES:
+        if brotli is not None and _accepts(accept_encoding, "br"):
+            body = brotli.compress(body, quality=min(RESPONSE_COMPRESSION_LEVEL, 11))
+            headers["Content-Encoding"] = "br"
+        elif _accepts(accept_encoding, "gzip"):
+            body = gzip.compress(body, compresslevel=min(RESPONSE_COMPRESSION_LEVEL, 9))
+            headers["Content-Encoding"] = "gzip"
+    headers["Vary"] = "Accept, Accept-Encoding"
+    return Response(
+        content=body, status_code=status_code, media_type=media_type, headers=headers
+    )
@@ -0,0 +1,159 @@
+"""
+Coalescing of identical concurrent calls.
+
+While a call for a key is in flight, further callers with the same key wait
+for its result instead of issuing their own upstream request.
+"""
+
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+)
+
+
+def key_digest(key: Hashable) -> str:
+    """Short stable digest of a key, safe to expose in stats."""
+    return hashlib.sha256(str(key).encode()).hexdigest()[:12]
+
+
+class _SharedStream:
+    """Items of one in-flight stream, replayable to every follower."""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.task: Optional[asyncio.Future] = None
+        self.changed = asyncio.Event()
+
+    def publish(self):
+        self.changed.set()
+        self.changed = asyncio.Event()
+
+
+class SingleFlight:
+    """Shares one in-flight call per key among concurrent callers."""
+
+    def __init__(self, name: str, max_tracked_keys: int = 1000):
+        """
+        Args:
+            name: Operation name, used in stats
+            max_tracked_keys: Number of keys whose dedupe counts are kept
+        """
+        self.name = name
+        self.max_tracked_keys = max_tracked_keys
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self._streams: Dict[Hashable, _SharedStream] = {}
+        self._key_counts: "OrderedDict[Hashable, int]" = OrderedDict()
+        self.leaders = 0
+        self.deduplicated = 0
+
+    def _count(self, key: Hashable, shared: bool):
+        if not shared:
+            self.leaders += 1
+            return
+        self.deduplicated += 1
+        self._key_counts[key] = self._key_counts.get(key, 0) + 1
+        self._key_counts.move_to_end(key)
+        if len(self._key_counts) > self.max_tracked_keys:
+            self._key_counts.popitem(last=False)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn, or join the identical call already in flight.
+
+        The shared call runs in its own task, so one caller cancelling does
+        not cancel it for the others.
+
+        Args:
+            key: Normalized arguments identifying the call
+            fn: Returns the coroutine to run if no call is in flight
+
+        Returns:
+            The shared call's result
+        """
+        task = self._calls.get(key)
+        self._count(key, shared=task is not None)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        self._calls.pop(key, None)
+        # Mark the error as retrieved even if every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def stream(
+        self, key: Hashable, fn: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        """
+        Iterate fn(), or join the identical stream already in flight.
+
+        Followers first receive the items produced so far, then each new
+        item as the leader's stream produces it.
+
+        Args:
+            key: Normalized arguments identifying the stream
+            fn: Returns the async iterator to consume if none is in flight
+
+        Yields:
+            The shared stream's items
+        """
+        shared = self._streams.get(key)
+        self._count(key, shared=shared is not None)
+        if shared is None:
+            shared = _SharedStream()
+            self._streams[key] = shared
+            shared.task = asyncio.ensure_future(self._drive(key, shared, fn()))
+
+        position = 0
+        while True:
+            changed = shared.changed
+            while position < len(shared.items):
+                yield shared.items[position]
+                position += 1
+            if shared.done:
+                if shared.error is not None:
+                    raise shared.error
+                return
+            await changed.wait()
+
+    async def _drive(
+        self, key: Hashable, shared: _SharedStream, iterator: AsyncIterator[Any]
+    ):
+        try:
+            async for item in iterator:
+                shared.items.append(item)
+                shared.publish()
+        except Exception as e:
+            shared.error = e
+        finally:
+            shared.done = True
+            self._streams.pop(key, None)
+            shared.publish()
+
+    def stats(self, top: int = 10) -> dict:
+        # Keys hold request data such as symptom text, so only a digest is
+        # reported; it still tells repeat hot keys apart
+        top_keys = sorted(self._key_counts.items(), key=lambda item: -item[1])[:top]
+        return {
+            "in_flight": len(self._calls) + len(self._streams),
+            "leaders": self.leaders,
+            "deduplicated": self.deduplicated,
+            "top_keys": [
+                {"key": key_digest(key), "deduplicated": count}
+                for key, count in top_keys
+            ],
+        }
@@ -0,0 +1,190 @@
+"""
+Specialty catalog, name normalization and specialty key resolution.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+
+SPECIALTIES_PATH = Path(__file__).resolve().parent.parent / "data" / "specialties.json"
+
+# Wordings the LLM commonly uses that differ from the Care Compare names.
+# Keys are normalized, values are catalog specialty names.
+SPECIALTY_ALIASES = {
+    "cardiology": "Cardiovascular disease (cardiology)",
+    "cardiologist": "Cardiovascular disease (cardiology)",
+    "cardiovascular disease": "Cardiovascular disease (cardiology)",
+    "family medicine": "Family practice",
+    "family physician": "Family practice",
+    "primary care": "Family practice",
+    "primary care physician": "Family practice",
+    "general medicine": "General practice",
+    "internist": "Internal medicine",
+    "obstetrics and gynecology": "Obstetrics/gynecology",
+    "ob gyn": "Obstetrics/gynecology",
+    "obgyn": "Obstetrics/gynecology",
+    "gynecology": "Obstetrics/gynecology",
+    "obstetrics": "Obstetrics/gynecology",
+    "ent": "Otolaryngology",
+    "ear nose and throat": "Otolaryngology",
+    "pulmonology": "Pulmonary disease",
+    "pulmonologist": "Pulmonary disease",
+    "oncology": "Medical oncology",
+    "oncologist": "Medical oncology",
+    "pediatrics": "Pediatric medicine",
+    "pediatrician": "Pediatric medicine",
+    "orthopedics": "Orthopedic surgery",
+    "orthopaedics": "Orthopedic surgery",
+    "orthopedic surgeon": "Orthopedic surgery",
+    "physical therapy": "Physical therapist in private practice",
+    "physical therapist": "Physical therapist in private practice",
+    "occupational therapy": "Occupational therapist in private practice",
+    "psychology": "Clinical psychologist",
+    "psychologist": "Clinical psychologist",
+    "psychiatrist": "Psychiatry",
+    "proctology": "Colorectal surgery (proctology)",
+    "colorectal surgery": "Colorectal surgery (proctology)",
+    "critical care": "Critical care (intensivists)",
+    "audiology": "Qualified audiologist",
+    "audiologist": "Qualified audiologist",
+    "neurologist": "Neurology",
+    "dermatologist": "Dermatology",
+    "gastroenterologist": "Gastroenterology",
+    "rheumatologist": "Rheumatology",
+    "nephrologist": "Nephrology",
+    "endocrinologist": "Endocrinology",
+    "urologist": "Urology",
+    "podiatrist": "Podiatry",
+    "ophthalmologist": "Ophthalmology",
+    "optometrist": "Optometry",
+    "hematologist": "Hematology",
+    "chiropractor": "Chiropractic",
+    "plastic surgery": "Plastic and reconstructive surgery",
+    "epilepsy": "Epileptologists",
+    "epileptologist": "Epileptologists",
+    "geriatrics": "Geriatric medicine",
+    "palliative care": "Hospice/palliative care",
+    "hospice": "Hospice/palliative care",
+    "emergency room": "Emergency medicine",
+}
+
+_NON_ALPHANUMERIC = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_specialty_name(name: str) -> str:
+    """
+    Normalize a specialty name for matching.
+
+    Lowercases, spells out "&" and collapses punctuation and whitespace, so
+    "Internal Medicine" and "internal  medicine" compare equal.
+    """
+    name = name.lower().replace("&", " and ")
+    return _NON_ALPHANUMERIC.sub(" ", name).strip()
+
+
+class SpecialtyCatalog:
+    """Canonical specialty keys for names, ids and aliases."""
+
+    def __init__(self, specialties: List[dict], aliases: Dict[str, str] = None):
+        """
+        Args:
+            specialties: Specialty dictionaries as stored in specialties.json
+            aliases: Extra normalized wording -> catalog name mappings
+        """
+        self.specialties = specialties
+        self._names: Dict[str, str] = {}
+        self._keys: Dict[str, str] = {}
+
+        for specialty in specialties:
+            name = specialty["specialtyName"]
+            key = self.key_for(specialty)
+            self._names[key] = name
+            self._keys[normalize_specialty_name(name)] = key
+            if specialty.get("specialtyId"):
+                self._keys[specialty["specialtyId"].lower()] = key
+            # "Cardiovascular disease (cardiology)" also answers to both parts
+            for part in re.findall(r"\(([^)]*)\)", name):
+                self._keys.setdefault(normalize_specialty_name(part), key)
+            base = re.sub(r"\([^)]*\)", "", name)
+            self._keys.setdefault(normalize_specialty_name(base), key)
+
+        for alias, name in {**SPECIALTY_ALIASES, **(aliases or {})}.items():
+            key = self._keys.get(normalize_specialty_name(name))
+            if key is not None:
+                self._keys.setdefault(normalize_specialty_name(alias), key)
+
+    @staticmethod
+    def key_for(specialty: dict) -> str:
+        """Return the canonical key of a catalog entry: its id, else its name."""
+        if specialty.get("specialtyId"):
+            return specialty["specialtyId"]
+        return "name:" + normalize_specialty_name(specialty["specialtyName"])
+
+    def resolve(self, specialty: Optional[str]) -> Optional[str]:
+        """
+        Resolve a specialty name, alias or id to its canonical key.
+
+        Returns:
+            The canonical key, or None if the specialty is unknown
+        """
+        if not specialty:
+            return None
+        return self._keys.get(specialty.lower()) or self._keys.get(
+            normalize_specialty_name(specialty)
+        )
+
+    def name_for(self, key: str) -> Optional[str]:
+        """Return the catalog name for a canonical key."""
+        return self._names.get(key)
+
+    @classmethod
+    def load(cls, path: Union[str, Path] = SPECIALTIES_PATH) -> "SpecialtyCatalog":
+        with open(path, "r") as f:
+            return cls(json.load(f))
+
+
+def resolve_specialty_key(catalog: SpecialtyCatalog, specialty: str) -> Optional[str]:
+    """Resolve a specialty to a key, including names missing from the catalog."""
+    key = catalog.resolve(specialty)
+    if key is None and specialty:
+        key = "name:" + normalize_specialty_name(specialty)
+    return key
+
+
+def specialty_keys(
+    catalog: SpecialtyCatalog,
+    specialties: Iterable[Tuple[Optional[str], Optional[str]]],
+) -> Set[str]:
+    """
+    Resolve a provider's specialties to canonical keys.
+
+    Args:
+        catalog: Specialty catalog
+        specialties: (specialty id, specialty name) pairs
+
+    Returns:
+        Canonical keys, with "name:" keys for names missing from the catalog
+    """
+    keys = set()
+    for specialty_id, specialty_name in specialties:
+        key = catalog.resolve(specialty_id) or catalog.resolve(specialty_name)
+        if key is None and specialty_name:
+            key = "name:" + normalize_specialty_name(specialty_name)
+        if key is not None:
+            keys.add(key)
+    return keys
+
+
+def record_specialty_keys(catalog: SpecialtyCatalog, record: dict) -> Set[str]:
+    """Resolve the specialties of a raw Care Compare provider record to keys."""
+    physician = record.get("physician") or {}
+    return specialty_keys(
+        catalog,
+        (
+            (specialty.get("specialtyId"), specialty.get("specialtyName"))
+            for specialty in physician.get("specialties") or ()
+        ),
+    )
+
@@ -0,0 +1,154 @@
+"""
+Lightweight CPU classifier from symptom descriptions to specialties.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from app.utils.text import cosine, term_counts, tfidf_vector, tokenize
+
+SPECIALTY_KEYWORDS_PATH = (
+    Path(__file__).resolve().parent.parent / "data" / "specialty_keywords.json"
+)
+
+
+def load_specialty_keywords(
+    path: Union[str, Path] = SPECIALTY_KEYWORDS_PATH,
+) -> Dict[str, List[str]]:
+    """Load the specialty name -> lay symptom keywords table."""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def read_decision_log(path: Union[str, Path]) -> List[dict]:
+    """
+    Read logged LLM decisions.
+
+    Each line is a JSON object with "symptom_description", "specialties"
+    (names in order of relevance) and optionally "latency_ms". Symptom
+    descriptions are raw patient text, so treat the log as PHI.
+    """
+    path = Path(path)
+    if not path.exists():
+        return []
+    with open(path, "r") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_decision(
+    path: Union[str, Path],
+    symptom_description: str,
+    specialties: List[str],
+    latency_ms: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+):
+    """
+    Append one LLM decision to the decision log.
+
+    The record holds the raw symptom description. Once the log reaches
+    `max_bytes` it is moved to "<path>.1", replacing the previous rotation,
+    so at most two files are kept.
+
+    Args:
+        path: Decision log path
+        symptom_description: Patient's symptom text
+        specialties: Specialty names in order of relevance
+        latency_ms: How long the LLM took to answer
+        max_bytes: Size at which the log is rotated; None never rotates
+    """
+    record = {"symptom_description": symptom_description, "specialties": specialties}
+    if latency_ms is not None:
+        record["latency_ms"] = round(latency_ms, 1)
+    if max_bytes is not None:
+        try:
+            if os.path.getsize(path) >= max_bytes:
+                os.replace(path, f"{path}.1")
+        except FileNotFoundError:
+            pass
+    with open(path, "a") as f:
+        f.write(json.dumps(record) + "\n")
+
+
+class SpecialtyClassifier:
+    """
+    Nearest-centroid TF-IDF classifier over specialties.
+
+    Each specialty is represented by one document made of its name, its
+    catalog description, lay symptom keywords and every symptom description
+    the LLM routed to it.
+    """
+
+    def __init__(self, documents: Dict[str, List[str]]):
+        """
+        Args:
+            documents: Specialty name -> training texts
+        """
+        class_terms = {
+            name: term_counts(token for text in texts for token in tokenize(text))
+            for name, texts in documents.items()
+        }
+        self._document_frequency: Dict[str, int] = {}
+        for terms in class_terms.values():
+            for term in terms:
+                self._document_frequency[term] = (
+                    self._document_frequency.get(term, 0) + 1
+                )
+        self._num_documents = len(class_terms)
+        self._vectors = {
+            name: tfidf_vector(terms, self._document_frequency, self._num_documents)
+            for name, terms in class_terms.items()
+        }
+
+    @property
+    def specialties(self) -> List[str]:
+        return list(self._vectors)
+
+    def predict(self, text: str, top_k: int = 2) -> List[Tuple[str, float]]:
+        """
+        Score specialties for a symptom description.
+
+        Args:
+            text: Symptom description
+            top_k: Number of specialties to return
+
+        Returns:
+            (specialty name, cosine similarity) pairs, best first
+        """
+        query = tfidf_vector(
+            term_counts(tokenize(text)), self._document_frequency, self._num_documents
+        )
+        if not query:
+            return []
+        scores = [(name, cosine(query, vector)) for name, vector in self._vectors.items()]
+        scores.sort(key=lambda item: item[1], reverse=True)
+        return [item for item in scores[:top_k] if item[1] > 0]
+
+    @classmethod
+    def train(
+        cls,
+        specialties: List[dict],
+        decisions: Iterable[dict] = (),
+        keywords: Optional[Dict[str, List[str]]] = None,
+    ) -> "SpecialtyClassifier":
+        """
+        Train from catalog entries and logged LLM decisions.
+
+        Args:
+            specialties: Specialty dictionaries as stored in specialties.json
+            decisions: Logged LLM decisions, see read_decision_log()
+            keywords: Specialty name -> lay symptom keywords
+        """
+        documents = {
+            s["specialtyName"]: [s["specialtyName"], s.get("description") or ""]
+            for s in specialties
+        }
+        for name, terms in (keywords or {}).items():
+            if name in documents:
+                documents[name].extend(terms)
+        for decision in decisions:
+            for name in decision.get("specialties", [])[:1]:
+                if name in documents:
+                    documents[name].append(decision["symptom_description"])
+        return cls(documents)
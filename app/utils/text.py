@@ -0,0 +1,82 @@
+"""
+Text normalization and TF-IDF helpers for symptom descriptions.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Negations ("no", "not") are kept: "no chest pain" must not match "chest pain"
+STOPWORDS = frozenset(
+    """
+    a about after all also am an and any are as at be been before being but by
+    can could did do does doing for from had has have having he her him his how
+    i if in into is it its just me more most my now of on or our out over
+    so some such than that the their them then there these they this those to
+    too up very was we were what when where which while who why will with would
+    you your feel feeling like really get got since days day weeks week
+    """.split()
+)
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse punctuation and whitespace."""
+    return " ".join(_TOKEN.findall(text.lower()))
+
+
+def _stem(token: str) -> str:
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase, lightly stemmed tokens without stopwords."""
+    return [
+        _stem(token) for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS
+    ]
+
+
+def idf(document_frequency: int, num_documents: int) -> float:
+    """Smoothed inverse document frequency."""
+    return math.log((1 + num_documents) / (1 + document_frequency)) + 1.0
+
+
+def tfidf_vector(
+    terms: Dict[str, int], document_frequency: Dict[str, int], num_documents: int
+) -> Dict[str, float]:
+    """
+    Build an L2-normalized TF-IDF vector.
+
+    Args:
+        terms: Term counts of the document
+        document_frequency: Number of documents containing each term
+        num_documents: Total number of documents
+
+    Returns:
+        Sparse vector as a term -> weight dictionary
+    """
+    vector = {
+        term: count * idf(document_frequency.get(term, 0), num_documents)
+        for term, count in terms.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if norm == 0:
+        return {}
+    return {term: weight / norm for term, weight in vector.items()}
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Dot product of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(term, 0.0) for term, weight in a.items())
+
+
+def term_counts(tokens: Iterable[str]) -> Dict[str, int]:
+    return dict(Counter(tokens))
@@ -0,0 +1,257 @@
+"""
+Rule-based extraction of call outcomes from pathway logs.
+
+Clinic replies are often formulaic ("yes, we take Blue Cross", "we have
+Tuesday at 3pm"). The rules below read the conversation turns and extract
+the offered timeslots and network status when every answer is clear. They
+return None for anything ambiguous, so the caller can fall back to LLM
+extraction.
+"""
+
+import re
+from datetime import date, timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from app.models.schemas import ProviderConfirmationInfo
+
+CONVERSATION_ROLES = frozenset(("user", "assistant"))
+# Length of a slot when the clinic only gives a start time
+DEFAULT_SLOT_MINUTES = 60
+
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+_NETWORK_QUESTION = re.compile(r"\b(insurance|network|coverage|covered|accept|plan)\b")
+_AVAILABILITY_QUESTION = re.compile(
+    r"\b(appointments?|availab\w*|slots?|openings?|open|times?|schedule)\b"
+)
+_NETWORK_NO = re.compile(
+    r"\b(out[- ]of[- ]network|not in[- ]network|(don't|do not|doesn't|does not|"
+    r"can't|cannot|no longer|aren't|are not|isn't|is not|not)\s+(\w+\s+)?"
+    r"(accept|take|in[- ]network|covered|contracted|participate)\w*)"
+)
+_NETWORK_YES = re.compile(
+    r"\b(yes|yeah|yep|correct|we (do )?(accept|take)|in[- ]network|"
+    r"(that's|that is|it's|it is) (in )?(the |our )?network|covered|we're contracted)\b"
+)
+_NO_AVAILABILITY = re.compile(
+    r"\b(no|don't have any|do not have any|nothing)\s+(\w+\s+)?"
+    r"(appointments?|availability|openings?|slots?|times?|available)\b"
+    r"|\bfully booked\b|\bbooked (up|solid)\b"
+)
+# The rules don't know which insurer the patient has, so a reply naming
+# payers or qualifying its answer is left to the LLM
+_PAYER = re.compile(
+    r"\b(aetna|anthem|blue ?cross|blue ?shield|bcbs|cigna|humana|kaiser|"
+    r"united ?health\w*|uhc|medicare|medicaid|tricare|molina|ambetter|oscar|"
+    r"centene|wellcare|health ?net)\b"
+)
+_NETWORK_QUALIFIER = re.compile(r"\b(but|except|not|unless|however|only)\b")
+# A slot mentioned alongside any of these may be the one being refused
+_SLOT_NEGATION = re.compile(
+    r"\b(no|not|taken|booked|unavailable|can't|cannot|doesn't work|don't work|"
+    r"won't work|isn't|aren't|full|gone)\b"
+)
+_SENTENCE = re.compile(r"[^.!?;]+")
+_DAY = re.compile(r"\b(today|tomorrow|" + "|".join(WEEKDAYS) + r")\b")
+_TIME = r"(\d{1,2})(?::(\d{2}))?\s*(a\.?m\b\.?|p\.?m\b\.?|o'clock)?"
+_TIME_RANGE = re.compile(
+    r"(?<![\w:])" + _TIME + r"(?:\s*(?:to|-|until|till)\s*" + _TIME + r")?(?![\d:])"
+)
+_MORNING = re.compile(r"\bmorning\b")
+_AFTERNOON = re.compile(r"\b(afternoon|evening)\b")
+
+
+def conversation_turns(call: dict) -> List[Tuple[str, str]]:
+    """Return the (role, text) turns spoken by the agent and the clinic."""
+    return [
+        (log["role"], log["text"])
+        for log in call.get("pathway_logs") or ()
+        if log.get("role") in CONVERSATION_ROLES and log.get("text")
+    ]
+
+
+def format_transcript(turns: Iterable[Tuple[str, str]]) -> str:
+    """Format turns as "role: text" lines for the extraction prompt."""
+    return "".join(f"{role}: {text}\n" for role, text in turns)
+
+
+def _network_verdict(text: str) -> Optional[bool]:
+    if _NETWORK_NO.search(text):
+        return False
+    if _NETWORK_YES.search(text):
+        return True
+    return None
+
+
+def _refuses_slot(text: str) -> bool:
+    """Whether a sentence mentioning a day or time also contains a negation."""
+    for sentence in _SENTENCE.findall(text):
+        if (_DAY.search(sentence) or re.search(r"\d", sentence)) and _SLOT_NEGATION.search(
+            sentence
+        ):
+            return True
+    return False
+
+
+def _resolve_day(text: str, today: date) -> Optional[date]:
+    match = _DAY.search(text)
+    if not match:
+        return None
+    word = match.group(1)
+    if word == "today":
+        return today
+    if word == "tomorrow":
+        return today + timedelta(days=1)
+    ahead = (WEEKDAYS.index(word) - today.weekday()) % 7 or 7
+    return today + timedelta(days=ahead)
+
+
+def _day_segments(text: str) -> List[str]:
+    """Split a reply so each part mentions at most one day."""
+    starts = [match.start() for match in _DAY.finditer(text)][1:]
+    bounds = [0] + starts + [len(text)]
+    return [text[start:end] for start, end in zip(bounds, bounds[1:])]
+
+
+def _to_24h(hour: int, meridiem: Optional[str], default_pm: bool) -> Optional[int]:
+    if hour > 23:
+        return None
+    if meridiem and meridiem.startswith("p"):
+        return hour if hour == 12 else hour + 12
+    if meridiem and meridiem.startswith("a"):
+        return 0 if hour == 12 else hour
+    if hour > 12:
+        return hour
+    # No am/pm: use the part of day, else assume clinic hours (7am - 6pm)
+    if default_pm or hour < 7:
+        return hour if hour == 12 else hour + 12
+    return hour
+
+
+def _extract_slots(text: str, day: date) -> Optional[List[str]]:
+    """Slots offered in a reply, or None if a time could not be read."""
+    default_pm = bool(_AFTERNOON.search(text)) and not _MORNING.search(text)
+    slots = []
+    for match in _TIME_RANGE.finditer(text):
+        start_hour, start_minute, start_meridiem = match.group(1, 2, 3)
+        end_hour, end_minute, end_meridiem = match.group(4, 5, 6)
+        if not (start_meridiem or start_minute or end_hour) and not text[
+            : match.start()
+        ].endswith("at "):
+            # A bare number is more likely a count than a time
+            continue
+        if start_meridiem == "o'clock":
+            start_meridiem = None
+        if end_meridiem == "o'clock":
+            end_meridiem = None
+        start = _to_24h(int(start_hour), start_meridiem or end_meridiem, default_pm)
+        if start is None:
+            return None
+        start_minutes = start * 60 + int(start_minute or 0)
+        if end_hour is not None:
+            end = _to_24h(int(end_hour), end_meridiem or start_meridiem, default_pm)
+            if end is None:
+                return None
+            end_minutes = end * 60 + int(end_minute or 0)
+            if end_minutes <= start_minutes and end_minutes + 12 * 60 < 24 * 60:
+                end_minutes += 12 * 60
+            if end_minutes <= start_minutes:
+                return None
+        else:
+            end_minutes = start_minutes + DEFAULT_SLOT_MINUTES
+        slots.append(
+            f"{day.isoformat()} {start_minutes // 60:02d}:{start_minutes % 60:02d}"
+            f" - {end_minutes // 60:02d}:{end_minutes % 60:02d}"
+        )
+    return slots
+
+
+def extract_confirmation(
+    call: dict, today: Optional[date] = None
+) -> Optional[ProviderConfirmationInfo]:
+    """
+    Extract the confirmation from a call when the clinic's answers are clear.
+
+    Args:
+        call: Call record with pathway_logs
+        today: Date relative days ("tomorrow", "Tuesday") are resolved
+            against. Defaults to the current date.
+
+    Returns:
+        The confirmation, or None if the transcript needs LLM extraction
+    """
+    today = today or date.today()
+    network_verdicts = set()
+    slots: List[str] = []
+    availability_answered = False
+    question = ""
+    for role, text in conversation_turns(call):
+        text = text.lower()
+        if role == "assistant":
+            question = text
+            continue
+
+        if _NETWORK_QUESTION.search(question) or _NETWORK_QUESTION.search(text):
+            if _PAYER.search(text) or _NETWORK_QUALIFIER.search(text):
+                # The clinic named plans or qualified its answer
+                return None
+            verdict = _network_verdict(text)
+            if verdict is not None:
+                network_verdicts.add(verdict)
+
+        if _AVAILABILITY_QUESTION.search(question) or _DAY.search(text):
+            if _refuses_slot(text):
+                return None
+            if _NO_AVAILABILITY.search(text):
+                availability_answered = True
+                continue
+            for segment in _day_segments(text):
+                day = _resolve_day(segment, today) or _resolve_day(question, today)
+                if day is None:
+                    if _TIME_RANGE.search(segment) and re.search(
+                        r"\b(am|pm|o'clock)\b|\d:\d", segment
+                    ):
+                        # A time without a day we can place
+                        return None
+                    continue
+                offered = _extract_slots(segment, day)
+                if offered is None or (not offered and _DAY.search(segment)):
+                    # A time we could not read, or a day without its time
+                    return None
+                if offered:
+                    availability_answered = True
+                    slots.extend(offered)
+
+    if len(network_verdicts) != 1 or not availability_answered:
+        return None
+    return ProviderConfirmationInfo(
+        is_in_network=network_verdicts.pop(),
+        available_timeslot=slots,
+    )
+
+
+class TranscriptFastPath:
+    """Rule-based extraction with hit-rate counters."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    def extract(
+        self, call: dict, today: Optional[date] = None
+    ) -> Optional[ProviderConfirmationInfo]:
+        """Same as extract_confirmation, counting hits and misses."""
+        confirmation = extract_confirmation(call, today)
+        if confirmation is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return confirmation
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
@@ -0,0 +1,3 @@
+"""
+Offline benchmarks and evaluation scripts.
+"""
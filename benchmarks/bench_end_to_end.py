@@ -0,0 +1,267 @@
+"""
+Offline end-to-end benchmark of /providers/recommend.
+
+Every upstream is replaced by an in-process stand-in (app/stubs) with
+configurable latency and error rates: the LLM chat completions endpoint,
+the Care Compare provider API and the call API, whose calls complete with
+the recorded transcript and report back through the app's webhook. The
+zip code index is built from the request fixture, so nothing touches the
+network.
+
+Recorded requests are replayed against the app at a fixed concurrency.
+The report is JSON: latency percentiles, throughput, errors, peak memory,
+median per-stage Server-Timing figures and upstream request counts. Write
+it to a file with --output to track it across releases.
+
+Latency specs are "median_ms[:p99_ms[:error_rate]]".
+
+Usage:
+    python -m benchmarks.bench_end_to_end --requests 200 --concurrency 20 \\
+        --llm 800:3000 --care-compare 300:1500:0.01 --call-delay 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import statistics
+import tempfile
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+
+from app.main import app
+from app.services import provider_service
+from app.services.call_scheduler import CallScheduler
+from app.stubs import call_api, care_compare, llm
+from app.stubs.behavior import UpstreamBehavior
+from app.utils.call_api import CallAPIClient
+from app.utils.care_compare import CareCompareClient
+from app.utils.geocoding import ZipCodeIndex, set_zip_index
+from app.utils.llm_client import LLMClient
+
+REQUESTS_FIXTURE_PATH = Path(__file__).resolve().parent / "fixtures" / "recommend_requests.jsonl"
+APP_BASE_URL = "http://app"
+PATIENT_INFO = {
+    "name": "Jane Doe",
+    "policyNum": "BCD12345",
+    "insuranceCompany": "Blue Cross",
+    "dateTimeRange": "05-20 09:00 - 17:00",
+}
+
+
+def load_requests(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] if values else None
+
+
+def parse_server_timing(header):
+    timings = {}
+    for part in (header or "").split(","):
+        name, _, duration = part.strip().partition(";dur=")
+        if name and duration:
+            timings[name] = float(duration)
+    return timings
+
+
+def install_stand_ins(args, fixtures, data_dir):
+    """
+    Point the service at in-process stand-ins; returns their behaviors.
+
+    Files the service writes go to data_dir, so stand-in answers never end
+    up in the app's decision log or symptom cache.
+    """
+    data_dir = Path(data_dir)
+    provider_service.specialty_router.decision_log_path = str(
+        data_dir / "specialty_decisions.jsonl"
+    )
+    provider_service.symptom_cache.path = data_dir / "symptom_cache.json"
+    set_zip_index(
+        ZipCodeIndex(
+            [int(f["zipCode"]) for f in fixtures],
+            [f["latitude"] for f in fixtures],
+            [f["longitude"] for f in fixtures],
+        )
+    )
+    behaviors = {
+        "llm": UpstreamBehavior.from_spec(args.llm, seed=args.seed),
+        "care_compare": UpstreamBehavior.from_spec(args.care_compare, seed=args.seed),
+        "call_api": UpstreamBehavior.from_spec(args.call_api, seed=args.seed),
+    }
+    llm_stub = llm.create_app(
+        behaviors["llm"], token_interval_seconds=args.token_interval_ms / 1000
+    )
+    care_compare_stub = care_compare.create_app(
+        behaviors["care_compare"], providers_per_square_mile=args.provider_density
+    )
+    call_api_stub = call_api.create_app(
+        completion_delay_seconds=args.call_delay,
+        webhook_drop_rate=args.webhook_drop_rate,
+        webhook_transport=httpx.ASGITransport(app=app),
+        seed=args.seed,
+        behavior=behaviors["call_api"],
+    )
+
+    provider_service.llm_client = LLMClient(
+        api_key="bench",
+        url="http://llm" + llm.CHAT_COMPLETIONS_PATH,
+        guard=provider_service.llm_guard,
+        transport=httpx.ASGITransport(app=llm_stub),
+    )
+    provider_service.care_compare_client = CareCompareClient(
+        url="http://care-compare" + care_compare.PROVIDER_SEARCH_PATH,
+        guard=provider_service.care_compare_guard,
+        transport=httpx.ASGITransport(app=care_compare_stub),
+    )
+    provider_service.call_api_client = CallAPIClient(
+        api_key="bench",
+        base_url="http://call-api/v1",
+        guard=provider_service.call_api_guard,
+        transport=httpx.ASGITransport(app=call_api_stub),
+    )
+    provider_service.CALL_WEBHOOK_URL = APP_BASE_URL + "/calls/webhook"
+    provider_service.call_registry.webhook_grace_seconds = args.call_delay + 1
+    # The demo connect flow dials the same two numbers for every request;
+    # don't space those calls out, or the scheduler dominates the run
+    provider_service.call_scheduler = CallScheduler(
+        per_number_max_concurrent=args.concurrency * 4,
+        per_number_interval_seconds=0,
+    )
+    provider_service.PROVIDER_SOURCE = "remote"
+    return behaviors
+
+
+async def run(args, data_dir):
+    fixtures = load_requests(args.fixtures)
+    behaviors = install_stand_ins(args, fixtures, data_dir)
+    poller = asyncio.create_task(
+        provider_service.call_registry.run_fallback_poller(
+            provider_service.call_api_client.get_call, 0.5
+        )
+    )
+
+    latencies = []
+    status_codes = Counter()
+    stage_timings = defaultdict(list)
+    next_request = 0
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=APP_BASE_URL, timeout=None
+    ) as client:
+
+        async def send(fixture):
+            body = {
+                "zipCode": fixture["zipCode"],
+                "symptomDescription": fixture["symptomDescription"],
+                "radius": fixture.get("radius", 25),
+                "patientInfo": PATIENT_INFO,
+            }
+            start = time.perf_counter()
+            try:
+                response = await client.post("/providers/recommend", json=body)
+            except Exception as e:
+                status_codes[type(e).__name__] += 1
+                return None
+            return response, time.perf_counter() - start
+
+        async def worker(total, measured):
+            nonlocal next_request
+            while next_request < total:
+                fixture = fixtures[next_request % len(fixtures)]
+                next_request += 1
+                result = await send(fixture)
+                if result is None or not measured:
+                    continue
+                response, elapsed = result
+                status_codes[response.status_code] += 1
+                latencies.append(elapsed)
+                for name, duration in parse_server_timing(
+                    response.headers.get("server-timing")
+                ).items():
+                    stage_timings[name].append(duration)
+
+        if args.warmup:
+            await asyncio.gather(*[worker(args.warmup, False) for _ in range(args.concurrency)])
+        next_request = 0
+        start = time.perf_counter()
+        await asyncio.gather(
+            *[worker(args.requests, True) for _ in range(args.concurrency)]
+        )
+        wall = time.perf_counter() - start
+
+    poller.cancel()
+    await provider_service.call_scheduler.aclose()
+    await provider_service.specialty_router.flush_decision_log()
+    for client in (
+        provider_service.llm_client,
+        provider_service.care_compare_client,
+        provider_service.call_api_client,
+    ):
+        await client.aclose()
+
+    ok = status_codes.get(200, 0)
+    return {
+        "config": {
+            key: value for key, value in vars(args).items() if key not in ("output", "fixtures")
+        },
+        "requests": len(latencies),
+        "status_codes": {str(code): count for code, count in status_codes.items()},
+        "error_rate": round(1 - ok / len(latencies), 4) if latencies else None,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "latency_ms": {
+            "mean": round(statistics.mean(latencies) * 1000, 1) if latencies else None,
+            "p50": round(percentile(latencies, 50) * 1000, 1) if latencies else None,
+            "p95": round(percentile(latencies, 95) * 1000, 1) if latencies else None,
+            "p99": round(percentile(latencies, 99) * 1000, 1) if latencies else None,
+            "max": round(max(latencies) * 1000, 1) if latencies else None,
+        },
+        # ru_maxrss is in KiB on Linux
+        "peak_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "stage_p50_ms": {
+            name: round(statistics.median(values), 1) for name, values in stage_timings.items()
+        },
+        "upstream": {name: behavior.stats() for name, behavior in behaviors.items()},
+        "service": {
+            "provider_cache": provider_service.provider_search_cache.stats(),
+            "specialty_router": provider_service.specialty_router.stats(),
+            "transcript_fast_path": provider_service.transcript_fast_path.stats(),
+            "transcript_batcher": provider_service.transcript_batcher.stats(),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--fixtures", default=REQUESTS_FIXTURE_PATH)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=0, help="Unmeasured requests first")
+    parser.add_argument("--llm", default="800:3000", help="LLM time to first token")
+    parser.add_argument("--token-interval-ms", type=float, default=5.0)
+    parser.add_argument("--care-compare", default="300:1500")
+    parser.add_argument("--call-api", default="50:200")
+    parser.add_argument("--call-delay", type=float, default=0.5, help="Seconds until a call completes")
+    parser.add_argument("--webhook-drop-rate", type=float, default=0.0)
+    parser.add_argument("--provider-density", type=float, default=2.0, help="Per square mile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        report = asyncio.run(run(args, directory))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Allocation benchmark: eager ProviderInfo models vs compact provider rows.
+
+Builds a synthetic radius-search result and selects the closest providers
+for a few specialties, once by building a ProviderInfo for every provider
+and once with ProviderRow/ProviderTable, which only builds models for the
+selected providers. Reports peak traced memory and wall time for each.
+
+Usage:
+    python -m benchmarks.bench_provider_table --providers 5000
+"""
+
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from app.models.schemas import ProviderInfo
+from app.utils.care_compare import project_provider
+from app.utils.provider_table import ProviderRow, ProviderTable, materialize
+from app.utils.specialties import SpecialtyCatalog
+
+SELECTED_SPECIALTIES = ["Dermatology", "Internal medicine", "Family practice"]
+PER_SPECIALTY = 5
+
+
+def synthetic_records(count, catalog, seed=0):
+    """Provider records shaped like Care Compare results, closest first."""
+    rng = random.Random(seed)
+    specialties = catalog.specialties
+    records = []
+    for i in range(count):
+        chosen = rng.sample(specialties, 2)
+        records.append(
+            {
+                "id": str(i),
+                "name": f"Dr. Provider {i}",
+                "distance": i * 0.01,
+                "type": "Physician",
+                "providerId": str(1000000 + i),
+                "sortName": f"Provider, Dr. {i}",
+                "firstName": "Dr.",
+                "lastName": f"Provider {i}",
+                "addressState": "CA",
+                "physician": {
+                    "name": f"Dr. Provider {i}",
+                    "id": str(i),
+                    "addressLine1": f"{i} Market St",
+                    "addressCity": "San Francisco",
+                    "addressState": "CA",
+                    "addressZipcode": "94105",
+                    "phone": f"415555{i % 10000:04d}",
+                    "medicalSchoolName": "Some Medical School",
+                    "graduationYear": "2001",
+                    "specialties": [
+                        {
+                            "id": s["id"],
+                            "specialtyName": s["specialtyName"],
+                            "specialtyId": s.get("specialtyId"),
+                            "description": s.get("description"),
+                            "physicianSpecialty": {"isPrimary": True},
+                        }
+                        for s in chosen
+                    ],
+                    "groupAffiliations": [
+                        {"name": f"Group {i % 50}", "pacId": str(i % 50)}
+                    ],
+                    "boardCertifications": {
+                        "boardCertifications": [{"name": "Board", "source": "ABMS"}]
+                    },
+                },
+            }
+        )
+    return records
+
+
+def eager(records, catalog):
+    """The previous path: a ProviderInfo per provider, then an index."""
+    providers = [ProviderInfo(**record) for record in records]
+    table = ProviderTable(
+        [ProviderRow.from_record(record, catalog) for record in records], catalog
+    )
+    positions = {row.id: position for position, row in enumerate(table.rows)}
+    return [
+        [providers[positions[row.id]] for row in table.select(specialty, PER_SPECIALTY)]
+        for specialty in SELECTED_SPECIALTIES
+    ]
+
+
+def compact(records, catalog):
+    """Projected rows, models built only for the selected providers."""
+    rows = [ProviderRow.from_record(project_provider(r), catalog) for r in records]
+    table = ProviderTable(rows, catalog)
+    return [
+        materialize(table.select(specialty, PER_SPECIALTY))
+        for specialty in SELECTED_SPECIALTIES
+    ]
+
+
+def measure(fn, records, catalog, repeat):
+    gc.collect()
+    tracemalloc.start()
+    result = fn(records, catalog)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(records, catalog)
+        timings.append(time.perf_counter() - start)
+    return result, {
+        "peak_kib": round(peak / 1024, 1),
+        "best_ms": round(min(timings) * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--providers", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    catalog = SpecialtyCatalog.load()
+    records = synthetic_records(args.providers, catalog)
+
+    eager_result, eager_stats = measure(eager, records, catalog, args.repeat)
+    compact_result, compact_stats = measure(compact, records, catalog, args.repeat)
+    # Both paths must pick the same providers
+    assert [[p.id for p in group] for group in eager_result] == [
+        [p.id for p in group] for group in compact_result
+    ]
+
+    report = {
+        "providers": args.providers,
+        "eager": eager_stats,
+        "compact": compact_stats,
+        "peak_memory_ratio": round(eager_stats["peak_kib"] / compact_stats["peak_kib"], 1),
+        "speedup": round(eager_stats["best_ms"] / compact_stats["best_ms"], 1),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
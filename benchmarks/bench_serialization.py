@@ -0,0 +1,107 @@
+"""
+Encoding benchmark for /providers/recommend responses.
+
+Serializes a synthetic response of full provider records, first the way
+FastAPI's response_model path does (validate, then jsonable_encoder and
+json.dumps) and then with the prebuilt serializer, with and without a
+fields= projection and compression. Reports encode time and body size.
+
+Usage:
+    python -m benchmarks.bench_serialization --specialties 3 --providers 5
+"""
+
+import argparse
+import json
+import time
+from typing import List
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models.schemas import ProviderConfirmationInfo, ProviderInfo, ProviderRecommendations
+from app.utils.serialization import dump_recommendations, encode_response
+from app.utils.specialties import SpecialtyCatalog
+from benchmarks.bench_provider_table import synthetic_records
+
+RENDERED_FIELDS = ["id", "name", "distance", "physician.phone", "physician.addressLine1"]
+
+
+def synthetic_response(specialties, providers, catalog):
+    records = synthetic_records(specialties * providers, catalog)
+    return [
+        ProviderRecommendations(
+            provider_infos=[
+                ProviderInfo(**record)
+                for record in records[i * providers : (i + 1) * providers]
+            ],
+            specialty=f"Specialty {i}",
+            reasoning="Based on your symptoms and location.",
+            confidence="High",
+            provider_confirmation_infos=[
+                ProviderConfirmationInfo(is_in_network=True, available_timeslot=[])
+                for _ in range(providers)
+            ],
+        )
+        for i in range(specialties)
+    ]
+
+
+def response_model_path(recommendations):
+    # What FastAPI does for response_model=List[ProviderRecommendations]
+    validated = TypeAdapter(List[ProviderRecommendations]).validate_python(
+        jsonable_encoder(recommendations, by_alias=True)
+    )
+    return json.dumps(jsonable_encoder(validated, by_alias=True)).encode()
+
+
+def measure(fn, repeat):
+    body = fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return {"best_ms": round(min(timings) * 1000, 3), "bytes": len(body)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--specialties", type=int, default=3)
+    parser.add_argument("--providers", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    recommendations = synthetic_response(
+        args.specialties, args.providers, SpecialtyCatalog.load()
+    )
+    report = {
+        "response_model": measure(lambda: response_model_path(recommendations), args.repeat),
+        "fast": measure(
+            lambda: encode_response(dump_recommendations(recommendations)).body,
+            args.repeat,
+        ),
+        "fast_projected": measure(
+            lambda: encode_response(
+                dump_recommendations(recommendations, RENDERED_FIELDS)
+            ).body,
+            args.repeat,
+        ),
+        "fast_gzip": measure(
+            lambda: encode_response(
+                dump_recommendations(recommendations), accept_encoding="gzip"
+            ).body,
+            args.repeat,
+        ),
+        "fast_projected_gzip": measure(
+            lambda: encode_response(
+                dump_recommendations(recommendations, RENDERED_FIELDS),
+                accept_encoding="gzip",
+            ).body,
+            args.repeat,
+        ),
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Startup benchmark: import time and time to ready.
+
+Each run starts a fresh interpreter, imports app.main, then runs the app's
+lifespan until /ready turns green (or startup fails). Reported per run:
+seconds to import, seconds from lifespan start to ready and each startup
+step's duration.
+
+The packaged zip code index is used when it exists. Otherwise a small one
+is built from the benchmark request fixture so the run stays offline; the
+report says which. Warm-up searches are not exercised here, since they
+depend on Care Compare latency rather than on startup work.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 5 [--zip-index app/data/us_zipcodes.npz]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from app.utils.constants import ZIP_INDEX_PATH
+from app.utils.geocoding import ZipCodeIndex
+from benchmarks.bench_end_to_end import REQUESTS_FIXTURE_PATH, load_requests
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the child interpreter
+CHILD = """
+import asyncio, json, time
+start = time.perf_counter()
+from app.main import app
+from app.services.startup import startup_state
+imported = time.perf_counter() - start
+
+async def main():
+    async with app.router.lifespan_context(app):
+        while not startup_state.finished:
+            await asyncio.sleep(0.001)
+    return startup_state.stats()
+
+stats = asyncio.run(main())
+print(json.dumps({"import_seconds": imported, **stats}))
+"""
+
+
+def fixture_zip_index(directory):
+    fixtures = load_requests(REQUESTS_FIXTURE_PATH)
+    path = Path(directory) / "zip_index.npz"
+    ZipCodeIndex(
+        [int(f["zipCode"]) for f in fixtures],
+        [f["latitude"] for f in fixtures],
+        [f["longitude"] for f in fixtures],
+    ).save(path)
+    return path
+
+
+def run_once(env):
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(values):
+    return {
+        "median": round(statistics.median(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--zip-index", default=ZIP_INDEX_PATH)
+    parser.add_argument("--output", help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        zip_index = Path(args.zip_index)
+        if not zip_index.exists():
+            zip_index = fixture_zip_index(directory)
+        env = {
+            **os.environ,
+            "ZIP_INDEX_PATH": str(zip_index),
+            # Keep the benchmark from rewriting the app's data files
+            "SYMPTOM_CACHE_PATH": str(Path(directory) / "symptom_cache.json"),
+            "WARMUP_ZIP_CODES": "",
+            "LOG_LEVEL": "WARNING",
+        }
+        runs = [run_once(env) for _ in range(args.runs)]
+
+    ready = [run for run in runs if run["status"] == "ready"]
+    steps = {}
+    for run in runs:
+        for name, step in run["steps"].items():
+            steps.setdefault(name, []).append(step["seconds"])
+    report = {
+        "runs": len(runs),
+        "zip_index": str(args.zip_index) if zip_index == Path(args.zip_index) else "fixture",
+        "statuses": [run["status"] for run in runs],
+        "import_seconds": summarize([run["import_seconds"] for run in runs]),
+        "seconds_to_ready": (
+            summarize([run["seconds_to_ready"] for run in ready]) if ready else None
+        ),
+        "step_seconds": {name: summarize(values) for name, values in steps.items()},
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
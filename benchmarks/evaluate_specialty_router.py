@@ -0,0 +1,120 @@
+"""
+Offline evaluation of the local specialty classifier against logged LLM decisions.
+
+Trains the classifier on the specialty catalog plus a training share of the
+decision log, then replays the held-out decisions and reports how often the
+classifier would have answered, how often it agrees with the LLM, and the
+latency of each tier.
+
+Usage:
+    python -m benchmarks.evaluate_specialty_router --log app/data/specialty_decisions.jsonl
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+
+from app.services.specialty_router import SpecialtyRouter
+from app.utils.constants import (
+    SPECIALTY_CLASSIFIER_THRESHOLD,
+    SPECIALTY_DECISION_LOG_PATH,
+)
+from app.utils.specialties import SpecialtyCatalog
+from app.utils.specialty_classifier import SpecialtyClassifier, read_decision_log
+
+
+def _percentile(values, percentile):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+def evaluate(decisions, threshold, train_fraction=0.8, seed=0):
+    """
+    Compare classifier answers with the LLM's on held-out decisions.
+
+    Returns:
+        Dictionary of agreement, coverage and latency figures
+    """
+    decisions = list(decisions)
+    random.Random(seed).shuffle(decisions)
+    split = int(len(decisions) * train_fraction)
+    train, test = decisions[:split], decisions[split:]
+
+    catalog = SpecialtyCatalog.load()
+    classifier = SpecialtyClassifier.train(catalog.specialties, train)
+    router = SpecialtyRouter(
+        classifier=classifier,
+        catalog=catalog,
+        llm_mapper=None,
+        confidence_threshold=threshold,
+    )
+
+    answered = top1_agree = any_agree = top1_agree_all = 0
+    classifier_latencies = []
+    for decision in test:
+        expected = decision.get("specialties") or []
+        start = time.perf_counter()
+        predictions = classifier.predict(decision["symptom_description"], top_k=2)
+        results = router.classify(decision["symptom_description"])
+        classifier_latencies.append((time.perf_counter() - start) * 1000)
+
+        if predictions and expected and predictions[0][0] == expected[0]:
+            top1_agree_all += 1
+        if not results:
+            continue
+        answered += 1
+        names = [name for name, _, _ in results]
+        if expected and names[0] == expected[0]:
+            top1_agree += 1
+        if set(names) & set(expected):
+            any_agree += 1
+
+    llm_latencies = [d["latency_ms"] for d in test if "latency_ms" in d]
+    return {
+        "train_size": len(train),
+        "test_size": len(test),
+        "threshold": threshold,
+        "coverage": answered / len(test) if test else 0.0,
+        "top1_agreement_when_answered": top1_agree / answered if answered else None,
+        "any_agreement_when_answered": any_agree / answered if answered else None,
+        "top1_agreement_overall": top1_agree_all / len(test) if test else None,
+        "classifier_latency_ms": {
+            "p50": _percentile(classifier_latencies, 50),
+            "p95": _percentile(classifier_latencies, 95),
+        },
+        "llm_latency_ms": {
+            "p50": _percentile(llm_latencies, 50),
+            "p95": _percentile(llm_latencies, 95),
+            "mean": statistics.mean(llm_latencies) if llm_latencies else None,
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--log", default=SPECIALTY_DECISION_LOG_PATH)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        nargs="+",
+        default=[SPECIALTY_CLASSIFIER_THRESHOLD],
+        help="One or more confidence thresholds to evaluate",
+    )
+    parser.add_argument("--train-fraction", type=float, default=0.8)
+    args = parser.parse_args()
+
+    decisions = read_decision_log(args.log)
+    if not decisions:
+        parser.error(f"No logged decisions found in {args.log}")
+    report = [
+        evaluate(decisions, threshold, args.train_fraction) for threshold in args.threshold
+    ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,86 @@
-import React from 'react';
+import React, { useEffect, useRef, useState } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
-import { Card, Button, Row, Col, Badge, ListGroup } from 'react-bootstrap';
+import { Card, Button, Row, Col, Badge, ListGroup, Spinner } from 'react-bootstrap';
+import providerService from '../services/providerService';
 
 const ProviderResults = () => {
   const location = useLocation();
   const navigate = useNavigate();
-  const results = location.state?.results || [];
+  // Read the submitted search once; the history entry is cleared below so a
+  // refresh or back navigation does not place the provider calls again
+  const [searchData] = useState(location.state?.searchData);
+  const [results, setResults] = useState(location.state?.results || []);
+  const [loading, setLoading] = useState(Boolean(searchData));
+  const runRef = useRef(null);
+
+  useEffect(() => {
+    if (!searchData) return undefined;
+    const current = runRef.current;
+    if (current && current.searchData === searchData) {
+      // StrictMode remounts the component straight away; keep the stream
+      // that is already running instead of starting a second one
+      clearTimeout(current.abortTimer);
+      return () => {
+        current.abortTimer = setTimeout(() => current.controller.abort());
+      };
+    }
+    const controller = new AbortController();
+    const run = { searchData, controller, abortTimer: null };
+    runRef.current = run;
+    navigate(location.pathname, { replace: true, state: {} });
+
+    // Render each recommendation as soon as it arrives, then fill in
+    // provider confirmations as their calls resolve
+    const handleEvent = (event) => {
+      if (event.event === 'recommendation') {
+        setResults((prev) => {
+          const next = [...prev];
+          next[event.index] = { ...event.data, provider_confirmation_infos: [] };
+          return next;
+        });
+      } else if (event.event === 'confirmation') {
+        setResults((prev) => {
+          const next = [...prev];
+          const recommendation = next[event.index];
+          if (!recommendation) return prev;
+          const confirmations = [...recommendation.provider_confirmation_infos];
+          confirmations[event.provider_index] = event.data;
+          next[event.index] = { ...recommendation, provider_confirmation_infos: confirmations };
+          return next;
+        });
+      } else if (event.event === 'done' || event.event === 'error') {
+        setLoading(false);
+      }
+    };
+
+    providerService
+      .streamProviderRecommendations(searchData, handleEvent, controller.signal)
+      .catch((error) => {
+        if (error.name !== 'AbortError') {
+          console.error('Error fetching provider recommendations:', error);
+          alert('Error fetching provider recommendations. Please try again.');
+        }
+      })
+      .finally(() => setLoading(false));
+
+    return () => {
+      run.abortTimer = setTimeout(() => controller.abort());
+    };
+  }, [searchData]); // eslint-disable-line react-hooks/exhaustive-deps
 
   const handleBack = () => {
     navigate('/');
   };
 
+  if (!results.length && loading) {
+    return (
+      <div className="text-center my-5">
+        <Spinner animation="border" role="status" className="mb-3" />
+        <h3>Finding providers...</h3>
+      </div>
+    );
+  }
+
   if (!results.length) {
     return (
       <div className="text-center my-5">
@@ -26,13 +96,18 @@ const ProviderResults = () => {
   return (
     <div>
       <div className="d-flex justify-content-between align-items-center mb-4">
-        <h2>Provider Results</h2>
+        <h2>
+          Provider Results
+          {loading && <Spinner animation="border" size="sm" className="ms-2" />}
+        </h2>
         <Button variant="outline-primary" onClick={handleBack}>
           New Search
         </Button>
       </div>
 
-      {results.map((recommendation, index) => (
+      {results.map((recommendation, index) => recommendation && (
+        // index is the recommendation's position in the stream, which does
+        // not shift while earlier recommendations are still missing
         <Card key={index} className="mb-4 shadow-sm">
           <Card.Header className="bg-light">
             <h3>{recommendation.specialty || 'Medical Provider'}</h3>
@@ -54,9 +129,6 @@ const ProviderResults = () => {
                recommendation.provider_infos.map((provider, idx) => {
                 const confirmationInfo = recommendation.provider_confirmation_infos[idx];
                 
-                // Skip providers without confirmation info
-                if (!confirmationInfo) return null;
-                
                 return (
                   <Col key={provider.id || idx} md={6} lg={4} className="mb-3">
                     <Card className="h-100">
@@ -64,9 +136,13 @@ const ProviderResults = () => {
                         <div>
                           <strong>{provider.name || `${provider.first_name} ${provider.last_name}`}</strong>
                         </div>
-                        <Badge bg={confirmationInfo.is_in_network ? "success" : "warning"}>
-                          {confirmationInfo.is_in_network ? "In Network" : "Out of Network"}
-                        </Badge>
+                        {confirmationInfo ? (
+                          <Badge bg={confirmationInfo.is_in_network ? "success" : "warning"}>
+                            {confirmationInfo.is_in_network ? "In Network" : "Out of Network"}
+                          </Badge>
+                        ) : (
+                          <Badge bg="secondary">Calling...</Badge>
+                        )}
                       </Card.Header>
                       <Card.Body>
                         {provider.physician && (
@@ -79,7 +155,9 @@ const ProviderResults = () => {
                         )}
                         
                         <h6>Available Time Slots:</h6>
-                        {confirmationInfo.available_timeslot && confirmationInfo.available_timeslot.length > 0 ? (
+                        {!confirmationInfo ? (
+                          <p className="text-muted">Checking availability...</p>
+                        ) : confirmationInfo.available_timeslot && confirmationInfo.available_timeslot.length > 0 ? (
                           <ListGroup className="mb-3">
                             {confirmationInfo.available_timeslot.map((slot, slotIdx) => (
                               <ListGroup.Item key={slotIdx} action className="py-2">
@@ -91,7 +169,7 @@ const ProviderResults = () => {
                           <p className="text-muted">No available time slots</p>
                         )}
                         
-                        {confirmationInfo.error && (
+                        {confirmationInfo && confirmationInfo.error && (
                           <div className="text-danger mt-2">
                             <small>{confirmationInfo.error}</small>
                           </div>
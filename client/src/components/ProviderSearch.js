@@ -1,11 +1,9 @@
 import React, { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { Form, Button, Card, Col, Row, Spinner } from 'react-bootstrap';
-import providerService from '../services/providerService';
+import { Form, Button, Card, Col, Row } from 'react-bootstrap';
 
 const ProviderSearch = () => {
   const navigate = useNavigate();
-  const [loading, setLoading] = useState(false);
   const [formData, setFormData] = useState({
     zipCode: '94118',
     medicareNumber: '7G91HP2Q3R4',
@@ -20,22 +18,10 @@ const ProviderSearch = () => {
     setFormData({ ...formData, [name]: value });
   };
 
-  const handleSubmit = async (e) => {
+  const handleSubmit = (e) => {
     e.preventDefault();
-    setLoading(true);
-
-    try {
-      // Use the provider service to make the API call
-      const results = await providerService.getProviderRecommendations(formData);
-      
-      // Navigate to results page with the data
-      navigate('/results', { state: { results } });
-    } catch (error) {
-      console.error('Error fetching provider recommendations:', error);
-      alert('Error fetching provider recommendations. Please try again.');
-    } finally {
-      setLoading(false);
-    }
+    // Results are streamed in by the results page as they become available
+    navigate('/results', { state: { searchData: formData } });
   };
 
   return (
@@ -119,13 +105,8 @@ const ProviderSearch = () => {
             </Form.Group>
 
             <div className="d-grid gap-2">
-              <Button variant="primary" type="submit" disabled={loading}>
-                {loading ? (
-                  <>
-                    <Spinner as="span" animation="border" size="sm" role="status" aria-hidden="true" className="me-2" />
-                    Searching...
-                  </>
-                ) : 'Find Providers'}
+              <Button variant="primary" type="submit">
+                Find Providers
               </Button>
             </div>
           </Form>
@@ -10,20 +10,22 @@ const api = axios.create({
   },
 });
 
+// Format the request data according to the backend schema
+const buildRequestData = (searchData) => ({
+  zipCode: parseInt(searchData.zipCode),
+  patientInfo: {
+    name: searchData.name,
+    policyNum: searchData.medicareNumber,
+    insuranceCompany: searchData.insuranceCompany || 'Medicare',
+    dateTimeRange: searchData.availability
+  },
+  symptomDescription: searchData.symptomDescription,
+  radius: 25.0
+});
+
 export const getProviderRecommendations = async (searchData) => {
   try {
-    // Format the request data according to the backend schema
-    const requestData = {
-      zipCode: parseInt(searchData.zipCode),
-      patientInfo: {
-        name: searchData.name,
-        policyNum: searchData.medicareNumber,
-        insuranceCompany: searchData.insuranceCompany || 'Medicare',
-        dateTimeRange: searchData.availability
-      },
-      symptomDescription: searchData.symptomDescription,
-      radius: 25.0
-    };
+    const requestData = buildRequestData(searchData);
 
     const response = await api.post('/recommend', requestData);
     return response.data;
@@ -33,6 +35,36 @@ export const getProviderRecommendations = async (searchData) => {
   }
 };
 
+// Stream recommendations as NDJSON, calling onEvent for every event as it
+// arrives: "recommendation", "confirmation", "error" and finally "done"
+export const streamProviderRecommendations = async (searchData, onEvent, signal) => {
+  const response = await fetch(`${API_URL}/recommend/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify(buildRequestData(searchData)),
+    signal,
+  });
+  if (!response.ok) {
+    throw new Error(`Request failed with status ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    const lines = buffer.split('\n');
+    buffer = lines.pop();
+    lines.filter((line) => line.trim()).forEach((line) => onEvent(JSON.parse(line)));
+  }
+  if (buffer.trim()) {
+    onEvent(JSON.parse(buffer));
+  }
+};
+
 export default {
-  getProviderRecommendations
+  getProviderRecommendations,
+  streamProviderRecommendations
 };
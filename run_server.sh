@@ -7,5 +7,8 @@ source venv/bin/activate
 # Install required dependencies
 pip install -r requirements.txt
 
+# Build the zip code index once so startup never downloads it
+[ -f app/data/us_zipcodes.npz ] || python -m scripts.build_zip_index
+
 # Run the FastAPI server
 python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload --log-level info
@@ -0,0 +1,58 @@
+"""
+Build the zip code index shipped with the app.
+
+The app loads app/data/us_zipcodes.npz at startup and never downloads
+geocoding data itself; without the file it reports not ready. Build it once
+when packaging the app, from the GeoNames US postal code dump.
+
+Usage:
+    python -m scripts.build_zip_index [--geonames US.zip] [--output app/data/us_zipcodes.npz]
+"""
+
+import argparse
+import io
+import time
+import urllib.request
+import zipfile
+from pathlib import Path
+
+from app.utils.constants import ZIP_INDEX_PATH
+from app.utils.geocoding import ZipCodeIndex
+
+GEONAMES_US_URL = "https://download.geonames.org/export/zip/US.zip"
+
+
+def read_geonames(source):
+    """Return the lines of US.txt from a local .zip or .txt, or a URL."""
+    if str(source).startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=60) as response:
+            data = response.read()
+    else:
+        data = Path(source).read_bytes()
+    if zipfile.is_zipfile(io.BytesIO(data)):
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            data = archive.read("US.txt")
+    return data.decode("utf-8").splitlines()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--geonames", default=GEONAMES_US_URL, help="US.zip, US.txt or a URL")
+    parser.add_argument("--output", default=ZIP_INDEX_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = ZipCodeIndex.from_geonames(read_geonames(args.geonames))
+    output = Path(args.output)
+    index.save(output)
+    load_start = time.perf_counter()
+    ZipCodeIndex.load(output)
+    print(
+        f"Wrote {len(index)} zip codes to {output} ({output.stat().st_size} bytes) "
+        f"in {load_start - start:.2f}s; loads in "
+        f"{(time.perf_counter() - load_start) * 1000:.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Tests for micro-batched transcript extraction.
+"""
+import asyncio
+import json
+
+import pytest
+
+from app.services import provider_service
+from app.utils.batcher import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_items_within_window_share_one_batch():
+    batches = []
+
+    async def run_batch(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher("test", run_batch, max_batch_size=10, max_wait_seconds=0.02)
+    results = await asyncio.gather(*[batcher.submit(i) for i in range(4)])
+    assert results == [0, 2, 4, 6]
+    assert batches == [[0, 1, 2, 3]]
+    assert batcher.stats()["mean_batch_size"] == 4
+
+
+@pytest.mark.asyncio
+async def test_full_batch_is_sent_without_waiting_and_errors_fan_out():
+    batches = []
+
+    async def run_batch(items):
+        batches.append(list(items))
+        if 99 in items:
+            raise RuntimeError("endpoint down")
+        return items
+
+    batcher = MicroBatcher("test", run_batch, max_batch_size=2, max_wait_seconds=10)
+    assert await asyncio.wait_for(
+        asyncio.gather(batcher.submit(1), batcher.submit(2)), timeout=1
+    ) == [1, 2]
+
+    results = await asyncio.gather(
+        batcher.submit(3), batcher.submit(99), return_exceptions=True
+    )
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batches == [[1, 2], [3, 99]]
+
+
+@pytest.mark.asyncio
+async def test_transcripts_are_extracted_in_one_prompt(monkeypatch):
+    prompts = []
+
+    async def fake_completion(model, messages, temperature, max_tokens, timeout=None):
+        prompt = messages[0]["content"]
+        prompts.append(prompt)
+        if "transcriptions" in prompt:
+            # The answer for transcription 2 is missing
+            answer = [{"index": 1, "available_timeslot": ["2025-01-02 15:00 - 16:00"], "is_in_network": True}]
+        else:
+            answer = {"available_timeslot": [], "is_in_network": False}
+        content = f"```json\n{json.dumps(answer)}\n```"
+        return {"choices": [{"message": {"content": content}}]}
+
+    monkeypatch.setattr(
+        provider_service.llm_client, "make_chat_completions_request", fake_completion
+    )
+    monkeypatch.setattr(
+        provider_service,
+        "transcript_batcher",
+        MicroBatcher(
+            "transcript_extraction",
+            provider_service._extract_transcripts,
+            max_wait_seconds=0.02,
+        ),
+    )
+
+    first, second = await asyncio.gather(
+        provider_service.get_result_from_transcript("user: we have Thursday at 3pm\n"),
+        provider_service.get_result_from_transcript("user: we are out of network\n"),
+    )
+    assert first.is_in_network and first.available_timeslot == ["2025-01-02 15:00 - 16:00"]
+    assert not second.is_in_network and second.available_timeslot == []
+    # One batched prompt, plus a single retry for the missing answer
+    assert len(prompts) == 2
+    assert "transcription 2" in prompts[0]
+
+
+@pytest.mark.asyncio
+async def test_malformed_answer_only_retries_its_own_transcript(monkeypatch):
+    prompts = []
+
+    async def fake_completion(model, messages, temperature, max_tokens, timeout=None):
+        prompt = messages[0]["content"]
+        prompts.append(prompt)
+        if "transcriptions" in prompt:
+            answer = [
+                {"index": 1, "available_timeslot": [], "is_in_network": True},
+                {"index": 2, "available_timeslot": [], "is_in_network": "maybe"},
+            ]
+        else:
+            answer = {"available_timeslot": [], "is_in_network": False}
+        content = f"```json\n{json.dumps(answer)}\n```"
+        return {"choices": [{"message": {"content": content}}]}
+
+    monkeypatch.setattr(
+        provider_service.llm_client, "make_chat_completions_request", fake_completion
+    )
+    first, second = await provider_service._extract_transcripts(["user: a\n", "user: b\n"])
+    assert first.is_in_network
+    assert not second.is_in_network
+    assert len(prompts) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_does_not_leave_submitters_waiting():
+    started = asyncio.Event()
+
+    async def run_batch(items):
+        started.set()
+        await asyncio.sleep(10)
+        return items
+
+    batcher = MicroBatcher("test", run_batch, max_batch_size=1)
+    submitted = asyncio.ensure_future(batcher.submit(1))
+    await started.wait()
+    for task in list(batcher._tasks):
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(submitted, timeout=1)
+    assert not batcher._tasks
@@ -0,0 +1,55 @@
+"""
+Tests for the provider search cache.
+"""
+from app.models.schemas import Location, ProviderInfo
+from app.utils.cache import ProviderSearchCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+LOCATION = Location(latitude=37.78641, longitude=-122.38922)
+PROVIDERS = [ProviderInfo(id=str(i), distance=float(i)) for i in range(10)]
+
+
+def test_exact_and_superset_hits():
+    cache = ProviderSearchCache()
+    assert cache.get(LOCATION, 25) is None
+    cache.put(LOCATION, 25, PROVIDERS)
+
+    nearby = Location(latitude=37.78639, longitude=-122.38918)
+    assert len(cache.get(nearby, 25)) == 10
+    assert [p.id for p in cache.get(LOCATION, 3.5)] == ["0", "1", "2", "3"]
+    assert cache.get(LOCATION, 50) is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["superset_hits"], stats["misses"]) == (1, 1, 2)
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ProviderSearchCache(ttl_seconds=10, clock=clock)
+    cache.put(LOCATION, 25, PROVIDERS)
+    clock.now = 11
+    assert cache.get(LOCATION, 25) is None
+    assert cache.stats()["expirations"] == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_by_count_and_bytes():
+    cache = ProviderSearchCache(max_entries=2, max_bytes=1000)
+    cache.put(LOCATION, 5, PROVIDERS, nbytes=100)
+    cache.put(LOCATION, 10, PROVIDERS, nbytes=100)
+    cache.get(LOCATION, 5)
+    cache.put(LOCATION, 15, PROVIDERS, nbytes=100)
+    assert cache.get(LOCATION, 10) is not None  # served from radius 15
+    assert cache.stats()["evictions"] == 1
+
+    cache.put(LOCATION, 20, PROVIDERS, nbytes=950)
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == 950
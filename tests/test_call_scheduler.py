@@ -0,0 +1,146 @@
+"""
+Tests for the central call scheduler.
+"""
+import asyncio
+
+import pytest
+
+from app.services.call_scheduler import CallScheduler, SchedulerBusyError
+from app.utils.constants import (
+    CALL_MAX_CONCURRENT,
+    CALL_MAX_QUEUE_WAIT_SECONDS,
+    CALL_MAX_QUEUED,
+    CALL_PER_NUMBER_INTERVAL_SECONDS,
+    CALL_PER_NUMBER_MAX_CONCURRENT,
+)
+
+
+def make_call(log, name, duration=0.02):
+    async def call():
+        log.append(("start", name))
+        await asyncio.sleep(duration)
+        log.append(("end", name))
+        return name
+
+    return call
+
+
+@pytest.mark.asyncio
+async def test_global_concurrency_cap():
+    scheduler = CallScheduler(max_concurrent=2, per_number_interval_seconds=0)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    await asyncio.gather(*[scheduler.submit(str(i), call) for i in range(6)])
+    assert peak == 2
+    assert scheduler.stats()["completed"] == 6
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_one_call_at_a_time_per_number_with_interval():
+    scheduler = CallScheduler(per_number_interval_seconds=0.05)
+    log = []
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    results = await asyncio.gather(
+        scheduler.submit("+1555", make_call(log, "a", 0.01)),
+        scheduler.submit("+1555", make_call(log, "b", 0.01)),
+        scheduler.submit("+1666", make_call(log, "c", 0.01)),
+    )
+    assert results == ["a", "b", "c"]
+    # The other clinic is not held up; the repeat call waits out the interval
+    assert log.index(("start", "c")) < log.index(("start", "b"))
+    assert log.index(("end", "a")) < log.index(("start", "b"))
+    assert loop.time() - start >= 0.05
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_priority_order():
+    scheduler = CallScheduler(max_concurrent=1, per_number_interval_seconds=0)
+    log = []
+    blocker = asyncio.ensure_future(scheduler.submit("0", make_call(log, "first")))
+    await asyncio.sleep(0)
+    await asyncio.gather(
+        scheduler.submit("1", make_call(log, "low"), priority=2),
+        scheduler.submit("2", make_call(log, "high"), priority=0),
+        blocker,
+    )
+    starts = [name for event, name in log if event == "start"]
+    assert starts == ["first", "high", "low"]
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_the_caller():
+    scheduler = CallScheduler(per_number_interval_seconds=0)
+
+    async def call():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await scheduler.submit("1", call)
+    assert scheduler.stats()["failed"] == 1
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_new_calls():
+    scheduler = CallScheduler(per_number_interval_seconds=10, max_queued=1)
+    log = []
+    assert await scheduler.submit("+1555", make_call(log, "a", 0.01)) == "a"
+    # Waits out the interval behind the first call
+    second = asyncio.ensure_future(scheduler.submit("+1555", make_call(log, "b", 0.01)))
+    await asyncio.sleep(0.01)
+    with pytest.raises(SchedulerBusyError):
+        await scheduler.submit("+1555", make_call(log, "c", 0.01))
+    assert scheduler.stats()["rejected"] == 1
+    second.cancel()
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_call_that_waits_too_long_fails_without_running():
+    scheduler = CallScheduler(per_number_interval_seconds=10, max_queue_wait_seconds=0.05)
+    log = []
+    results = await asyncio.gather(
+        scheduler.submit("+1555", make_call(log, "a", 0.01)),
+        scheduler.submit("+1555", make_call(log, "b", 0.01)),
+        return_exceptions=True,
+    )
+    assert results[0] == "a"
+    assert isinstance(results[1], SchedulerBusyError)
+    assert ("start", "b") not in log
+    stats = scheduler.stats()
+    assert stats["rejected"] == 1
+    assert stats["queued"] == 0
+    await scheduler.aclose()
+
+
+@pytest.mark.asyncio
+async def test_default_limits_let_repeat_demo_calls_run_together():
+    # Every request dials the same demo numbers; with the default limits a
+    # fourth request must not queue behind the first three
+    scheduler = CallScheduler(
+        max_concurrent=CALL_MAX_CONCURRENT,
+        per_number_max_concurrent=CALL_PER_NUMBER_MAX_CONCURRENT,
+        per_number_interval_seconds=CALL_PER_NUMBER_INTERVAL_SECONDS,
+        max_queued=CALL_MAX_QUEUED,
+        max_queue_wait_seconds=CALL_MAX_QUEUE_WAIT_SECONDS,
+    )
+    log = []
+    results = await asyncio.gather(
+        *[scheduler.submit("+16507884580", make_call(log, i, 0.05)) for i in range(4)]
+    )
+    assert results == [0, 1, 2, 3]
+    assert [event for event, _ in log[:4]] == ["start"] * 4
+    assert scheduler.stats()["rejected"] == 0
+    await scheduler.aclose()
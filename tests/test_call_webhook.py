@@ -0,0 +1,180 @@
+"""
+End-to-end tests for webhook-driven call completion against the call API stand-in.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.main import app
+from app.models.schemas import PatientInfo, ProviderConfirmationInfo, ProviderInfo
+from app.services import provider_service
+from app.services.call_registry import CallRegistry
+from app.services.call_scheduler import CallScheduler
+from app.stubs.call_api import TRANSCRIPT_FIXTURE_PATH, create_app
+from app.utils.call_api import CallAPIClient
+
+PATIENT = PatientInfo(
+    name="Jane Doe",
+    policyNum="123",
+    insuranceCompany="Medicare",
+    dateTimeRange="05-20 14:00-16:00",
+)
+
+
+def use_stub(monkeypatch, registry, **stub_options):
+    stub = create_app(
+        webhook_transport=httpx.ASGITransport(app=app), seed=0, **stub_options
+    )
+    client = CallAPIClient(
+        api_key="test",
+        base_url="http://call-api/v1",
+        transport=httpx.ASGITransport(app=stub),
+    )
+    transcripts = []
+
+    async def fake_result(transcript):
+        transcripts.append(transcript)
+        return ProviderConfirmationInfo(is_in_network=True, available_timeslot=["slot"])
+
+    monkeypatch.setattr(provider_service, "call_api_client", client)
+    monkeypatch.setattr(provider_service, "call_registry", registry)
+    monkeypatch.setattr(
+        provider_service, "call_scheduler", CallScheduler(per_number_interval_seconds=0)
+    )
+    monkeypatch.setattr("app.routers.calls.call_registry", registry)
+    monkeypatch.setattr(provider_service, "CALL_WEBHOOK_URL", "http://test/calls/webhook")
+    monkeypatch.setattr(provider_service, "get_result_from_transcript", fake_result)
+    return stub, client, transcripts
+
+
+@pytest.mark.asyncio
+async def test_worker_wakes_on_webhook(monkeypatch):
+    registry = CallRegistry(webhook_grace_seconds=60)
+    stub, client, transcripts = use_stub(
+        monkeypatch, registry, completion_delay_seconds=0.05
+    )
+
+    provider, confirmation = await provider_service.connect_provider_worker(
+        0, 0, ProviderInfo(id="1", name="Dr. A"), PATIENT
+    )
+
+    # The recorded transcript is formulaic enough for the rule-based path
+    assert confirmation.is_in_network
+    assert [slot[-13:] for slot in confirmation.available_timeslot] == ["10:00 - 11:00"]
+    assert transcripts == []
+    assert stub.state.webhooks_sent == 1
+    assert registry.stats()["resolved_by_webhook"] == 1
+    assert registry.stats()["polls"] == 0
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_fallback_poller_covers_dropped_webhooks(monkeypatch):
+    registry = CallRegistry(webhook_grace_seconds=0.1)
+    stub, client, transcripts = use_stub(
+        monkeypatch, registry, completion_delay_seconds=0.05, webhook_drop_rate=1.0
+    )
+    poller = asyncio.create_task(registry.run_fallback_poller(client.get_call, 0.05))
+    try:
+        results = await asyncio.gather(
+            *[
+                provider_service.connect_provider_worker(
+                    idx, 0, ProviderInfo(id=str(idx), name="Dr. A"), PATIENT
+                )
+                for idx in range(2)
+            ]
+        )
+    finally:
+        poller.cancel()
+        await client.aclose()
+
+    assert [c.is_in_network for _, c in results] == [True, True]
+    assert stub.state.webhooks_dropped == 2
+    assert registry.stats()["resolved_by_poll"] == 2
+
+
+@pytest.mark.asyncio
+async def test_early_webhook_is_kept_until_registration():
+    registry = CallRegistry()
+    assert not registry.resolve("abc", {"call_id": "abc", "completed": True})
+    assert await registry.wait("abc", timeout=0.1) == {"call_id": "abc", "completed": True}
+
+
+def test_early_webhooks_are_capped():
+    registry = CallRegistry(max_early_results=2)
+    for call_id in ("a", "b", "c"):
+        registry.resolve(call_id, {"call_id": call_id})
+    assert list(registry._early) == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_webhook_secret_is_checked(monkeypatch):
+    monkeypatch.setattr("app.routers.calls.CALL_WEBHOOK_SECRET", "s3cret")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        forged = await client.post("/calls/webhook", json={"call_id": "abc"})
+        signed = await client.post(
+            "/calls/webhook", json={"call_id": "abc"}, headers={"X-Webhook-Secret": "s3cret"}
+        )
+    assert forged.status_code == 401
+    assert signed.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_webhook_url_without_secret_refuses_to_start(monkeypatch):
+    monkeypatch.setattr("app.main.CALL_WEBHOOK_URL", "http://example.com/calls/webhook")
+    monkeypatch.setattr("app.main.CALL_WEBHOOK_SECRET", "")
+    with pytest.raises(RuntimeError):
+        async with app.router.lifespan_context(app):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_wait_times_out():
+    registry = CallRegistry()
+    assert await registry.wait("abc", timeout=0.01) is None
+    assert registry.stats() == {
+        "pending": 0,
+        "early_results": 0,
+        "resolved_by_webhook": 0,
+        "resolved_by_poll": 0,
+        "timeouts": 1,
+        "polls": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_webhook_endpoint_requires_call_id():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/calls/webhook", json={"completed": True})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_transcript_falls_back_to_llm(monkeypatch, tmp_path):
+    with open(TRANSCRIPT_FIXTURE_PATH) as f:
+        call = json.load(f)
+    for log in call["pathway_logs"]:
+        if log.get("text") == "Yeah. That's the network.":
+            log["text"] = "Let me check with billing."
+    fixture_path = tmp_path / "transcript.json"
+    fixture_path.write_text(json.dumps(call))
+
+    registry = CallRegistry(webhook_grace_seconds=60)
+    stub, client, transcripts = use_stub(
+        monkeypatch,
+        registry,
+        completion_delay_seconds=0.05,
+        fixture_path=fixture_path,
+    )
+
+    provider, confirmation = await provider_service.connect_provider_worker(
+        0, 0, ProviderInfo(id="1", name="Dr. A"), PATIENT
+    )
+
+    assert confirmation.available_timeslot == ["slot"]
+    assert "assistant:" in transcripts[0]
+    await client.aclose()
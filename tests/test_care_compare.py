@@ -0,0 +1,106 @@
+"""
+Tests for the streaming Care Compare client and early-stopping provider search.
+"""
+import json
+
+import httpx
+import pytest
+
+from app.models.schemas import Location
+from app.services import provider_service
+from app.utils.care_compare import CareCompareClient, project_provider
+
+LOCATION = Location(latitude=37.79, longitude=-122.39)
+
+
+def make_record(i, specialty_id, specialty_name):
+    return {
+        "id": str(i),
+        "name": f"Dr. {i}",
+        "distance": i / 10,
+        "type": "Physician",
+        "physician": {
+            "phone": "5550000000",
+            "addressZipcode": "94105",
+            "specialties": [
+                {
+                    "specialtyId": specialty_id,
+                    "specialtyName": specialty_name,
+                    "description": "long text",
+                    "physicianSpecialty": {"isPrimary": True},
+                }
+            ],
+            "groupAffiliations": [{"name": "Group"}] * 20,
+            "boardCertifications": {"boardCertifications": [{"name": "Board"}]},
+        },
+    }
+
+
+def streaming_transport(records, requests_seen, chunk_size=64):
+    body = json.dumps({"results": records, "total": len(records)}).encode()
+    chunks = [body[i : i + chunk_size] for i in range(0, len(body), chunk_size)]
+    sent = []
+
+    class Body(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            for chunk in chunks:
+                sent.append(len(chunk))
+                yield chunk
+
+    def handler(request):
+        requests_seen.append(json.loads(request.content))
+        return httpx.Response(200, stream=Body())
+
+    return httpx.MockTransport(handler), sent, len(chunks)
+
+
+def test_projection_drops_unused_fields():
+    projected = project_provider(make_record(1, "93", "Emergency medicine"))
+    assert projected["physician"] == {
+        "phone": "5550000000",
+        "addressZipcode": "94105",
+        "specialties": [{"specialtyId": "93", "specialtyName": "Emergency medicine"}],
+    }
+    assert projected["distance"] == 0.1
+
+
+@pytest.mark.asyncio
+async def test_search_reads_whole_result_set():
+    records = [make_record(i, "93", "Emergency medicine") for i in range(30)]
+    seen = []
+    transport, sent, total_chunks = streaming_transport(records, seen)
+    client = CareCompareClient(url="http://care-compare/provider", transport=transport)
+    result = await client.search(LOCATION, 10)
+    assert result.complete
+    assert [r["id"] for r in result.records] == [str(i) for i in range(30)]
+    assert seen[0]["sort"] == ["closest"]
+    assert len(sent) == total_chunks
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_provider_search_stops_once_specialties_are_covered(monkeypatch):
+    records = [make_record(i, "93", "Emergency medicine") for i in range(6)]
+    records += [make_record(i, "02", "General surgery") for i in range(6, 12)]
+    records += [make_record(i, "93", "Emergency medicine") for i in range(12, 200)]
+    seen = []
+    transport, sent, total_chunks = streaming_transport(records, seen)
+    monkeypatch.setattr(
+        provider_service,
+        "care_compare_client",
+        CareCompareClient(url="http://care-compare/provider", transport=transport),
+    )
+    provider_service.provider_search_cache.clear()
+
+    providers = await provider_service.get_providers_by_location(
+        LOCATION,
+        10,
+        source="remote",
+        specialties=["Emergency medicine", "general surgery"],
+        per_specialty=5,
+    )
+    # Stops at the fifth general surgeon, well before the end of the body
+    assert len(providers) == 11
+    assert len(sent) < total_chunks
+    # A truncated result must not be served to other searches
+    assert provider_service.provider_search_cache.get(LOCATION, 10) is None
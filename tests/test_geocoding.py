@@ -0,0 +1,66 @@
+"""
+Tests for the array-backed zip code index.
+"""
+import math
+
+import pytest
+
+from app.utils.geocoding import ZipCodeIndex, load_zip_index, normalize_zip_code
+
+
+@pytest.fixture
+def zip_index():
+    return ZipCodeIndex(
+        zips=[94105, 10001, 2134],
+        latitudes=[37.7864, 40.7484, 42.3539],
+        longitudes=[-122.3892, -73.9967, -71.1337],
+    )
+
+
+def test_normalize_zip_code():
+    assert normalize_zip_code("94105") == 94105
+    assert normalize_zip_code("02134-1234") == 2134
+    assert normalize_zip_code(10001) == 10001
+    assert normalize_zip_code("abcde") == -1
+    assert normalize_zip_code(123456) == -1
+
+
+def test_lookup(zip_index):
+    latitude, longitude = zip_index.lookup("94105")
+    assert abs(latitude - 37.7864) < 1e-4
+    assert abs(longitude - (-122.3892)) < 1e-4
+    assert zip_index.lookup("02134") is not None
+    assert zip_index.lookup("99999") is None
+
+
+def test_lookup_many(zip_index):
+    latitudes, longitudes, found = zip_index.lookup_many(
+        ["10001", "99999", 94105, "bad"]
+    )
+    assert found.tolist() == [True, False, True, False]
+    assert abs(latitudes[0] - 40.7484) < 1e-4
+    assert math.isnan(longitudes[1])
+
+
+def test_save_and_load(zip_index, tmp_path):
+    path = tmp_path / "zips.npz"
+    zip_index.save(path)
+    loaded = ZipCodeIndex.load(path)
+    assert len(loaded) == 3
+    assert loaded.lookup(10001) == zip_index.lookup(10001)
+
+
+def test_from_geonames():
+    lines = [
+        "US\t94105\tSan Francisco\tCalifornia\tCA\tSan Francisco\t075\t\t\t37.7864\t-122.3892\t4\n",
+        "US\t0xxxx\tBad\tCalifornia\tCA\t\t\t\t\t1\t1\t4\n",
+        "US\t10001\tNew York\tNew York\tNY\tNew York\t061\t\t\t\t\t\n",
+    ]
+    index = ZipCodeIndex.from_geonames(lines)
+    assert len(index) == 1
+    assert index.lookup("94105") is not None
+
+
+def test_missing_index_is_not_downloaded(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_zip_index(tmp_path / "missing.npz")
@@ -0,0 +1,50 @@
+"""
+Tests for incremental JSON object extraction.
+"""
+import json
+
+from app.utils.json_stream import JSONObjectStream
+
+LLM_ANSWER = """```json
+[
+  {"RECOMMENDED_SPECIALTY": "Pulmonary disease", "REASONING": "Your \\"cough\\" {and} [breathing]", "CONFIDENCE": "High"},
+  {"RECOMMENDED_SPECIALTY": 4, "REASONING": "Back\\\\slash", "CONFIDENCE": "Low"}
+]
+```"""
+
+
+def _feed_in_chunks(stream, text, size):
+    objects = []
+    for i in range(0, len(text), size):
+        objects.extend(stream.feed(text[i : i + size]))
+    return objects
+
+
+def test_llm_array_objects_emitted_as_they_close():
+    stream = JSONObjectStream()
+    first_end = LLM_ANSWER.index("},") + 1
+    assert stream.feed(LLM_ANSWER[:first_end - 1]) == []
+    first = stream.feed(LLM_ANSWER[first_end - 1 : first_end])
+    assert first[0]["REASONING"] == 'Your "cough" {and} [breathing]'
+
+    for size in (1, 3, 7):
+        objects = _feed_in_chunks(JSONObjectStream(), LLM_ANSWER, size)
+        assert [o["RECOMMENDED_SPECIALTY"] for o in objects] == ["Pulmonary disease", 4]
+        assert objects[1]["REASONING"] == "Back\\slash"
+
+
+def test_keyed_array_inside_object():
+    payload = json.dumps(
+        {
+            "facets": [{"name": "ignored"}],
+            "results": [
+                {"id": str(i), "physician": {"specialties": [{"specialtyName": "x"}]}}
+                for i in range(3)
+            ],
+            "total": 3,
+        }
+    )
+    stream = JSONObjectStream(depth=2, key="results")
+    objects = _feed_in_chunks(stream, payload, 5)
+    assert [o["id"] for o in objects] == ["0", "1", "2"]
+    assert stream.done
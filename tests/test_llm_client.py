@@ -0,0 +1,107 @@
+"""
+Tests for the shared LLM client: pooling, timeouts, HTTP/2 fallback and closing.
+"""
+import json
+import sys
+
+import httpx
+import pytest
+
+from app.utils.llm_client import LLMClient, process_json_response
+from app.utils.resilience import DependencyGuard
+
+URL = "http://llm/v1/chat/completions"
+MESSAGES = [{"role": "user", "content": "cough"}]
+ANSWER = '[{"RECOMMENDED_SPECIALTY": 7, "REASONING": "x", "CONFIDENCE": "High"}]'
+
+
+def completion_transport(requests, status_code=200):
+    def handler(request):
+        requests.append(request)
+        body = json.loads(request.content)
+        if body["stream"]:
+            lines = [
+                "data: " + json.dumps({"choices": [{"delta": {"content": ANSWER[:10]}}]}),
+                "",
+                "data: " + json.dumps({"choices": [{"delta": {"content": ANSWER[10:]}}]}),
+                "data: [DONE]",
+            ]
+            return httpx.Response(status_code, text="\n".join(lines) + "\n")
+        return httpx.Response(
+            status_code, json={"choices": [{"message": {"content": ANSWER}}]}
+        )
+
+    return httpx.MockTransport(handler)
+
+
+@pytest.mark.asyncio
+async def test_request_sends_payload_and_default_or_per_call_timeout():
+    requests = []
+    client = LLMClient(
+        api_key="secret", url=URL, timeout=7, transport=completion_transport(requests)
+    )
+    response = await client.make_chat_completions_request("m", MESSAGES, 0.3, 100)
+    await client.make_chat_completions_request("m", MESSAGES, 0.3, 100, timeout=2)
+    await client.aclose()
+
+    assert process_json_response(response)[0]["RECOMMENDED_SPECIALTY"] == 7
+    assert requests[0].headers["authorization"] == "Bearer secret"
+    assert json.loads(requests[0].content) == {
+        "model": "m",
+        "messages": MESSAGES,
+        "temperature": 0.3,
+        "max_tokens": 100,
+        "stream": False,
+    }
+    assert requests[0].extensions["timeout"]["read"] == 7
+    assert requests[1].extensions["timeout"]["read"] == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_content_deltas():
+    requests = []
+    client = LLMClient(api_key="k", url=URL, transport=completion_transport(requests))
+    chunks = [chunk async for chunk in client.stream_chat_completions("m", MESSAGES, 0, 100)]
+    await client.aclose()
+    assert chunks == [ANSWER[:10], ANSWER[10:]]
+    assert json.loads(requests[0].content)["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_server_errors_raise_and_count_against_the_guard():
+    guard = DependencyGuard("llm")
+    client = LLMClient(
+        api_key="k", url=URL, guard=guard, transport=completion_transport([], 503)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.make_chat_completions_request("m", MESSAGES, 0, 100)
+    await client.aclose()
+    assert guard.failures == 1
+
+
+def test_pool_limits_and_http2_fallback(monkeypatch):
+    client = LLMClient(api_key="k", max_connections=3, max_keepalive_connections=1)
+    pool = client._get_client()._transport._pool
+    assert (pool._max_connections, pool._max_keepalive_connections) == (3, 1)
+    assert pool._http2 == client._http2
+
+    # Without the optional h2 package the client stays on HTTP/1.1
+    monkeypatch.setitem(sys.modules, "h2", None)
+    assert not LLMClient(api_key="k")._http2
+    assert not LLMClient(api_key="k", http2=False)._http2
+
+
+@pytest.mark.asyncio
+async def test_aclose_closes_the_pool_and_a_later_call_reopens_it():
+    requests = []
+    client = LLMClient(api_key="k", url=URL, transport=completion_transport(requests))
+    await client.make_chat_completions_request("m", MESSAGES, 0, 100)
+    pool = client._get_client()
+    await client.aclose()
+    assert pool.is_closed
+    await client.aclose()
+
+    await client.make_chat_completions_request("m", MESSAGES, 0, 100)
+    assert client._get_client() is not pool
+    await client.aclose()
+    assert len(requests) == 2
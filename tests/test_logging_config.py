@@ -0,0 +1,113 @@
+"""
+Tests for queue-based structured logging.
+"""
+import io
+import json
+import logging
+import queue
+
+import httpx
+import pytest
+
+from app.main import app
+from app.utils.logging_config import (
+    JsonFormatter,
+    LazyQueueHandler,
+    RequestIdFilter,
+    SamplingFilter,
+    configure_logging,
+    log_stats,
+    parse_rules,
+    request_id,
+    stop_logging,
+)
+
+
+def make_record(name="provider_finder.service", level=logging.INFO, msg="hello %s", args=("x",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_parse_rules():
+    assert parse_rules("provider_finder.service=0.1, provider_finder=5,bad,x=y") == {
+        "provider_finder.service": 0.1,
+        "provider_finder": 5.0,
+    }
+
+
+def test_sampling_uses_most_specific_rule_and_spares_warnings():
+    draws = iter([0.5, 0.05, 0.5])
+    sampler = SamplingFilter(
+        sampling={"provider_finder": 1.0, "provider_finder.service": 0.1},
+        rand=lambda: next(draws),
+    )
+    assert not sampler.filter(make_record())
+    assert sampler.filter(make_record())
+    assert sampler.filter(make_record(name="provider_finder.jobs"))
+    assert sampler.filter(make_record(level=logging.WARNING))
+    assert sampler.dropped == {("provider_finder.service", "sampled"): 1}
+
+
+def test_rate_limit_refills_per_second():
+    now = [0.0]
+    sampler = SamplingFilter(rate_limits={"provider_finder": 2}, clock=lambda: now[0])
+    results = [sampler.filter(make_record()) for _ in range(3)]
+    assert results == [True, True, False]
+    assert sampler.filter(make_record(level=logging.ERROR))
+    now[0] = 0.5
+    assert sampler.filter(make_record())
+    assert not sampler.filter(make_record())
+    assert sampler.dropped[("provider_finder.service", "rate_limited")] == 2
+
+
+def test_json_record_carries_request_id_and_extra_fields():
+    record = make_record()
+    record.stage_timings = {"geocode": 1.5}
+    token = request_id.set("abc123")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id.reset(token)
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hello x"
+    assert entry["request_id"] == "abc123"
+    assert entry["stage_timings"] == {"geocode": 1.5}
+    assert entry["logger"] == "provider_finder.service"
+
+
+def test_queued_records_are_formatted_by_the_listener():
+    stream = io.StringIO()
+    configure_logging(level="INFO", fmt="json", sampling="provider_finder.noisy=0", stream=stream)
+    try:
+        logging.getLogger("provider_finder.test").info("kept %d", 1)
+        logging.getLogger("provider_finder.test").debug("below level")
+        logging.getLogger("provider_finder.noisy").info("sampled out")
+        logging.getLogger("provider_finder.noisy").warning("always kept")
+        stats = log_stats()
+    finally:
+        stop_logging()
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert [line["message"] for line in lines] == ["kept 1", "always kept"]
+    assert stats["dropped"] == {"sampled": {"provider_finder.noisy": 1}}
+    configure_logging()
+
+
+def test_full_queue_writes_warnings_directly_and_drops_the_rest():
+    stream = io.StringIO()
+    overflow = logging.StreamHandler(stream)
+    handler = LazyQueueHandler(queue.Queue(maxsize=1), overflow=overflow)
+    handler.handle(make_record(msg="queued", args=()))
+    handler.handle(make_record(msg="dropped", args=()))
+    handler.handle(make_record(level=logging.ERROR, msg="written", args=()))
+    assert handler.queue.get_nowait().getMessage() == "queued"
+    assert stream.getvalue() == "written\n"
+    assert handler.queue_full == 1
+
+
+@pytest.mark.asyncio
+async def test_request_id_is_echoed_or_generated():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        given = await client.get("/", headers={"X-Request-ID": "req-1"})
+        generated = await client.get("/")
+    assert given.headers["x-request-id"] == "req-1"
+    assert len(generated.headers["x-request-id"]) == 32
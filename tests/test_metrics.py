@@ -0,0 +1,84 @@
+"""
+Tests for Prometheus metrics.
+"""
+import httpx
+import pytest
+
+from app.main import app
+from app.stubs import llm
+from app.utils.llm_client import LLMClient
+from app.utils.metrics import (
+    STAGE_SECONDS,
+    UPSTREAM_RESPONSES,
+    MetricsRegistry,
+    stats_families,
+    track_stage,
+)
+from app.utils.pipeline import Pipeline
+
+
+def test_histogram_and_counter_exposition():
+    registry = MetricsRegistry()
+    latency = registry.histogram("test_seconds", "Test latency", ["stage"], buckets=(0.1, 1))
+    latency.observe(0.05, stage="a")
+    latency.observe(0.1, stage="a")
+    latency.observe(5, stage="a")
+    registry.counter("test_total", "Test count").inc(2)
+    registry.add_collector(
+        lambda: stats_families("test_cache", {"hits": 3, "hit_ratio": 0.75, "name": "x"})
+    )
+
+    lines = registry.render().splitlines()
+    assert "# TYPE test_seconds histogram" in lines
+    assert 'test_seconds_bucket{stage="a",le="0.1"} 2' in lines
+    assert 'test_seconds_bucket{stage="a",le="+Inf"} 3' in lines
+    assert 'test_seconds_count{stage="a"} 3' in lines
+    assert "test_total 2" in lines
+    assert "# TYPE test_cache_hits_total counter" in lines
+    assert "test_cache_hit_ratio 0.75" in lines
+
+
+def sample_count(stage):
+    counts = STAGE_SECONDS._counts.get((("stage", stage),))
+    return sum(counts) if counts else 0
+
+
+@pytest.mark.asyncio
+async def test_pipeline_stages_and_upstream_responses_are_recorded():
+    before = sample_count("geocode")
+    pipeline = Pipeline(track=track_stage)
+
+    async def geocode():
+        return 1
+
+    pipeline.stage("geocode", geocode)
+    assert await pipeline.result("geocode") == 1
+    assert sample_count("geocode") == before + 1
+
+    key = (("dependency", "llm"), ("status", "200"))
+    responses = UPSTREAM_RESPONSES._values.get(key, 0)
+    client = LLMClient(
+        api_key="test",
+        url="http://llm" + llm.CHAT_COMPLETIONS_PATH,
+        transport=httpx.ASGITransport(app=llm.create_app()),
+    )
+    await client.make_chat_completions_request("m", [{"role": "user", "content": "x"}], 0, 1)
+    await client.aclose()
+    assert UPSTREAM_RESPONSES._values[key] == responses + 1
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    with track_stage("transcript_wait"):
+        pass
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'provider_finder_stage_seconds_count{stage="transcript_wait"}' in text
+    assert 'provider_finder_stage_in_flight{stage="transcript_wait"} 0' in text
+    assert 'provider_finder_cache_hit_ratio{cache="symptom"}' in text
+    assert 'provider_finder_dependency_circuit_state{dependency="llm",state="closed"} 1' in text
+    assert 'provider_finder_coalescing_deduplicated_total{operation="provider_search"}' in text
@@ -0,0 +1,125 @@
+"""
+Tests for concurrent pipeline stages and per-stage timings.
+"""
+import asyncio
+import gc
+import time
+
+import pytest
+
+from app.models.schemas import Location
+from app.services import provider_service
+from app.utils.pipeline import Pipeline, server_timing_header
+
+
+@pytest.mark.asyncio
+async def test_stages_wait_for_dependencies_and_branches_overlap():
+    pipeline = Pipeline()
+    order = []
+
+    async def step(name, value, delay=0.05):
+        await asyncio.sleep(delay)
+        order.append(name)
+        return value
+
+    pipeline.stage("geocode", lambda: step("geocode", 2))
+    pipeline.stage("search", lambda x: step("search", x * 10), after=["geocode"])
+    pipeline.stage("mapping", lambda: step("mapping", "derm", delay=0.1))
+
+    start = time.perf_counter()
+    assert await pipeline.result("search") == 20
+    assert await pipeline.result("mapping") == "derm"
+    elapsed = time.perf_counter() - start
+
+    assert order.index("geocode") < order.index("search")
+    # geocode -> search (0.1s) runs alongside mapping (0.1s)
+    assert elapsed < 0.18
+    summary = pipeline.summary()
+    assert set(summary) == {"geocode", "search", "mapping", "total"}
+    assert summary["search"]["start_ms"] >= summary["geocode"]["duration_ms"]
+
+
+@pytest.mark.asyncio
+async def test_failed_dependency_leaves_no_unretrieved_errors():
+    loop = asyncio.get_running_loop()
+    unhandled = []
+    previous = loop.get_exception_handler()
+    loop.set_exception_handler(lambda loop, context: unhandled.append(context))
+    try:
+        pipeline = Pipeline()
+
+        async def geocode():
+            raise ValueError("unknown zip code")
+
+        async def search(location):
+            return [location]
+
+        pipeline.stage("geocode", geocode)
+        pipeline.stage("search", search, after=["geocode"])
+        with pytest.raises(ValueError):
+            await pipeline.result("geocode")
+        await asyncio.sleep(0)
+        pipeline.cancel()
+        del pipeline
+        gc.collect()
+    finally:
+        loop.set_exception_handler(previous)
+    assert unhandled == []
+
+
+def test_unknown_dependency_is_rejected():
+    pipeline = Pipeline()
+    with pytest.raises(ValueError):
+        pipeline.stage("search", lambda location: None, after=["geocode"])
+
+
+def test_timed_blocks_accumulate_and_format_as_server_timing():
+    now = [0.0]
+    pipeline = Pipeline(clock=lambda: now[0])
+    for _ in range(2):
+        with pipeline.timed("select"):
+            now[0] += 0.002
+    assert pipeline.timings["select"]["duration_ms"] == pytest.approx(4.0)
+    assert server_timing_header(pipeline.summary()) == "select;dur=4.0, total;dur=4.0"
+    assert server_timing_header(None) == ""
+
+
+@pytest.mark.asyncio
+async def test_symptom_mapping_overlaps_provider_search(monkeypatch):
+    async def fake_location(zip_code):
+        await asyncio.sleep(0.1)
+        return Location(latitude=37.79, longitude=-122.39)
+
+    async def fake_search(location, radius, *args):
+        return []
+
+    async def fake_stream(symptom_description):
+        await asyncio.sleep(0.1)
+        yield ("Dermatology", "Skin.", "High")
+
+    monkeypatch.setattr(provider_service, "get_location_from_zip", fake_location)
+    monkeypatch.setattr(provider_service, "search_providers", fake_search)
+    monkeypatch.setattr(provider_service, "stream_symptoms_to_specialties", fake_stream)
+    monkeypatch.setattr(
+        provider_service.specialty_router, "peek", lambda symptom_description: None
+    )
+
+    timings = {}
+    start = time.perf_counter()
+    recommendations = [
+        r
+        async for r in provider_service.iter_provider_recommendations(
+            "94105", "rash", 5, timings=timings
+        )
+    ]
+    elapsed = time.perf_counter() - start
+
+    assert [r.specialty for r in recommendations] == ["Dermatology"]
+    assert elapsed < 0.18
+    assert {
+        "geocode",
+        "provider_search",
+        "specialty_mapping",
+        "provider_selection",
+        "total",
+    } <= set(timings)
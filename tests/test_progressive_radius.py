@@ -0,0 +1,93 @@
+"""
+Tests for progressive radius expansion.
+"""
+import pytest
+
+from app.models.schemas import Location
+from app.services import provider_service
+from app.utils.provider_table import ProviderRow
+
+LOCATION = Location(latitude=37.79, longitude=-122.39)
+
+
+def test_radius_steps():
+    steps = [5, 10, 25, 50]
+    radius_steps = provider_service.radius_steps
+    assert radius_steps(25, "progressive", steps, 50, True) == [5, 10, 25, 50]
+    assert radius_steps(8, "progressive", steps, 25, True) == [5, 8, 10, 25]
+    assert radius_steps(25, "fixed", steps, 50, True) == [25]
+    assert radius_steps(None, "progressive", steps, 50, True) == [5, 10, 25, 50]
+    assert radius_steps(None, "fixed", steps, 50, True) == [25.0]
+
+
+def test_radius_steps_stop_at_requested_radius_unless_widening():
+    steps = [5, 10, 25, 50]
+    assert provider_service.radius_steps(10, "progressive", steps, 50) == [5, 10]
+    assert provider_service.radius_steps(8, "progressive", steps, 50) == [5, 8]
+    assert provider_service.radius_steps(None, "progressive", steps, 50) == [5, 10, 25.0]
+    assert provider_service.radius_steps(10, "progressive", steps, 50, False) == [5, 10]
+
+
+def make_searcher(providers_by_radius, searched):
+    """Fake search where each radius finds the given specialty names."""
+
+    async def fake_search(location, radius, source, specialties, per_specialty):
+        searched.append(radius)
+        return [
+            ProviderRow.from_record(
+                {
+                    "id": f"{radius}-{i}",
+                    "distance": float(i),
+                    "physician": {"specialties": [{"specialtyName": name}]},
+                },
+                provider_service.specialty_catalog,
+            )
+            for i, name in enumerate(providers_by_radius[radius])
+        ]
+
+    return fake_search
+
+
+@pytest.mark.asyncio
+async def test_dense_area_stops_at_first_radius(monkeypatch):
+    searched = []
+    monkeypatch.setattr(
+        provider_service,
+        "search_providers",
+        make_searcher({5: ["Dermatology"] * 5, 10: ["Dermatology"] * 9}, searched),
+    )
+    rows, step = await provider_service.search_providers_progressive(
+        LOCATION, [5, 10], ["Dermatology"], per_specialty=5
+    )
+    assert searched == [5]
+    assert (len(rows), step) == (5, 0)
+
+
+@pytest.mark.asyncio
+async def test_sparse_area_widens_until_each_specialty_is_filled(monkeypatch):
+    searched = []
+    monkeypatch.setattr(
+        provider_service,
+        "search_providers",
+        make_searcher(
+            {
+                5: ["Dermatology"] * 5 + ["Cardiology"],
+                10: ["Dermatology"] * 6 + ["Cardiology"] * 3,
+                25: ["Dermatology"] * 7 + ["Cardiology"] * 5,
+                50: ["Dermatology"] * 9 + ["Cardiology"] * 9,
+            },
+            searched,
+        ),
+    )
+    rows, step = await provider_service.search_providers_progressive(
+        LOCATION, [5, 10, 25, 50], ["Dermatology", "Cardiology"], per_specialty=5
+    )
+    assert searched == [5, 10, 25]
+    assert step == 2
+
+    # Gives up at the maximum radius
+    searched.clear()
+    _, step = await provider_service.search_providers_progressive(
+        LOCATION, [5, 10], ["Pediatric medicine"], per_specialty=5
+    )
+    assert (searched, step) == ([5, 10], 1)
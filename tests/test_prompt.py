@@ -0,0 +1,35 @@
+"""
+Tests for the specialty matching prompts.
+"""
+from app.utils.prompt import PromptGenerator
+
+prompt_generator = PromptGenerator()
+NAMES = [specialty["specialtyName"] for specialty in prompt_generator.specialties]
+
+
+def test_compact_prompt_lists_only_candidates_by_catalog_id():
+    candidates = [NAMES[3], NAMES[0], NAMES[3], "Not a specialty"]
+    prompt = prompt_generator.create_compact_specialty_matching_prompt("rash", candidates)
+    lines = [line for line in prompt.splitlines() if line[:1].isdigit()]
+    assert lines == [
+        f"3: {NAMES[3]} - {prompt_generator.specialties[3]['description']}",
+        f"0: {NAMES[0]} - {prompt_generator.specialties[0]['description']}",
+    ]
+    assert "Symptoms: rash" in prompt
+
+
+def test_specialty_name_for_id():
+    assert prompt_generator.specialty_name_for_id(3) == NAMES[3]
+    assert prompt_generator.specialty_name_for_id("3") == NAMES[3]
+    assert prompt_generator.specialty_name_for_id("Dermatology") == "Dermatology"
+    assert prompt_generator.specialty_name_for_id(-1) is None
+    assert prompt_generator.specialty_name_for_id(len(NAMES)) is None
+
+
+def test_specialty_name_for_id_rejects_ids_that_were_not_offered():
+    candidates = [NAMES[3], NAMES[0]]
+    assert prompt_generator.specialty_name_for_id(0, candidates) == NAMES[0]
+    assert prompt_generator.specialty_name_for_id(1, candidates) is None
+    assert prompt_generator.specialty_name_for_id(NAMES[3], candidates) == NAMES[3]
+    assert prompt_generator.specialty_name_for_id(NAMES[1], candidates) is None
+    assert prompt_generator.specialty_name_for_id("Astrology", candidates) is None
@@ -5,6 +5,18 @@ import pytest
 import asyncio
 from app.services.provider_service import get_location_from_zip
 from app.models.schemas import Location
+from app.utils import geocoding
+from app.utils.geocoding import ZipCodeIndex
+
+
+@pytest.fixture(autouse=True)
+def zip_index(monkeypatch):
+    # Stands in for the prebuilt index loaded at startup
+    monkeypatch.setattr(
+        geocoding,
+        "_zip_index",
+        ZipCodeIndex([94105, 10001], [37.7864, 40.7484], [-122.3892, -73.9967]),
+    )
 
 
 @pytest.mark.asyncio
@@ -28,6 +40,13 @@ async def test_get_location_from_zip_valid():
     assert abs(location.longitude - (-122.39)) < 0.1
 
 
+@pytest.mark.asyncio
+async def test_get_location_from_zip_unknown():
+    """Unknown zip codes raise ValueError rather than fetching anything."""
+    with pytest.raises(ValueError):
+        await get_location_from_zip("99999")
+
+
 if __name__ == "__main__":
     asyncio.run(test_get_location_from_zip_valid())
     # Skip the error tests when running directly
\ No newline at end of file
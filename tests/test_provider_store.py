@@ -0,0 +1,58 @@
+"""
+Tests for the local provider snapshot store.
+"""
+import json
+
+import pytest
+
+from app.models.schemas import Location
+from app.services.provider_store import ProviderStore, build_spatial_index
+
+
+def _record(provider_id, latitude, longitude):
+    return {
+        "id": provider_id,
+        "name": f"Dr. {provider_id}",
+        "latitude": latitude,
+        "longitude": longitude,
+        "physician": {"phone": "5550000000", "specialties": []},
+    }
+
+
+RECORDS = [
+    _record("far", 37.3382, -121.8863),  # San Jose, ~42 miles away
+    _record("near", 37.7890, -122.3900),
+    _record("mid", 37.8044, -122.2712),  # Oakland
+    _record("near", 37.7890, -122.3900),  # duplicate
+]
+
+
+def test_query_sorted_by_distance():
+    index = build_spatial_index(RECORDS)
+    assert len(index) == 3
+
+    results = index.query(37.7864, -122.3892, 10)
+    assert [record["id"] for _, record in results] == ["near", "mid"]
+    assert results[0][0] < results[1][0] <= 10
+
+    results = index.query(37.7864, -122.3892, 100)
+    assert [record["id"] for _, record in results] == ["near", "mid", "far"]
+
+
+@pytest.mark.asyncio
+async def test_store_query_and_refresh(tmp_path):
+    path = tmp_path / "providers.jsonl"
+    path.write_text("\n".join(json.dumps(r) for r in RECORDS[:2]))
+
+    store = ProviderStore(path)
+    assert await store.refresh(force=True)
+    location = Location(latitude=37.7864, longitude=-122.3892)
+    results = store.query(location, 100)
+    assert [record["id"] for _, record in results] == ["near", "far"]
+    assert results[0][0] < 1
+
+    assert not await store.refresh()
+    path.write_text("\n".join(json.dumps(r) for r in RECORDS))
+    store._loaded_mtime = None
+    assert await store.refresh()
+    assert len(store.query(location, 100)) == 3
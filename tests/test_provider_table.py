@@ -0,0 +1,83 @@
+"""
+Tests for compact provider rows and lazy model materialization.
+"""
+import pytest
+
+from app.models.schemas import Location, ProviderInfo
+from app.services import provider_service
+from app.utils.provider_table import ProviderRow, ProviderTable, materialize
+from app.utils.specialties import SpecialtyCatalog
+
+
+def make_record(i, specialty_name):
+    return {
+        "id": str(i),
+        "name": f"Dr. {i}",
+        "distance": float(i),
+        "physician": {
+            "phone": f"555000{i:04d}",
+            "specialties": [{"specialtyId": None, "specialtyName": specialty_name}],
+        },
+    }
+
+
+@pytest.fixture
+def catalog():
+    return SpecialtyCatalog.load()
+
+
+def test_rows_select_closest_first_and_materialize(catalog):
+    records = [make_record(i, "Dermatology" if i % 2 else "Cardiology") for i in range(10)]
+    table = ProviderTable(
+        [ProviderRow.from_record(record, catalog) for record in records], catalog
+    )
+    rows = table.select("dermatologist", k=3)
+    assert [row.id for row in rows] == ["1", "3", "5"]
+    assert rows[0].phone == "5550000001"
+    assert table.count("Cardiovascular disease (cardiology)") == 5
+
+    providers = materialize(rows)
+    assert all(isinstance(provider, ProviderInfo) for provider in providers)
+    assert providers[0].physician.specialties[0].specialty_name == "Dermatology"
+
+
+def test_distance_override_for_local_records(catalog):
+    record = {k: v for k, v in make_record(1, "Dermatology").items() if k != "distance"}
+    row = ProviderRow.from_record(record, catalog, distance=2.5)
+    assert row.to_provider_info().distance == 2.5
+    assert "distance" not in record
+
+
+@pytest.mark.asyncio
+async def test_only_recommended_providers_are_materialized(monkeypatch, catalog):
+    rows = [ProviderRow.from_record(make_record(i, "Dermatology"), catalog) for i in range(50)]
+    built = []
+    original = ProviderRow.to_provider_info
+
+    def counting(self):
+        built.append(self.id)
+        return original(self)
+
+    async def fake_location(zip_code):
+        return Location(latitude=37.79, longitude=-122.39)
+
+    async def fake_search(location, radius, *args):
+        return rows
+
+    async def fake_stream(symptom_description):
+        yield ("Dermatology", "Skin.", "High")
+
+    monkeypatch.setattr(ProviderRow, "to_provider_info", counting)
+    monkeypatch.setattr(provider_service, "get_location_from_zip", fake_location)
+    monkeypatch.setattr(provider_service, "search_providers", fake_search)
+    monkeypatch.setattr(provider_service, "stream_symptoms_to_specialties", fake_stream)
+    monkeypatch.setattr(
+        provider_service.specialty_router, "peek", lambda symptom_description: None
+    )
+
+    recommendations = [
+        r
+        async for r in provider_service.iter_provider_recommendations("94105", "rash")
+    ]
+    assert len(recommendations[0].provider_infos) == 5
+    assert built == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,203 @@
+"""
+Tests for the streaming recommendation endpoint.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.main import app
+from app.models.schemas import (
+    ProviderConfirmationInfo,
+    ProviderInfo,
+    ProviderRecommendations,
+)
+from app.services import provider_service
+from app.services.call_scheduler import SchedulerBusyError
+from app.services.jobs import JobStore
+
+REQUEST = {
+    "zipCode": 94105,
+    "symptomDescription": "cough",
+    "patientInfo": {
+        "name": "Jane Doe",
+        "policyNum": "123",
+        "insuranceCompany": "Medicare",
+        "dateTimeRange": "05-20 14:00-16:00",
+    },
+}
+
+
+@pytest.mark.asyncio
+async def test_stream_emits_recommendations_then_confirmations(monkeypatch):
+    async def fake_recommendations(zip_code, symptom_description, radius):
+        for specialty in ("Pulmonary disease", "Internal medicine"):
+            yield ProviderRecommendations(
+                specialty=specialty,
+                provider_infos=[ProviderInfo(id=f"{specialty}-{i}") for i in range(2)],
+            )
+
+    async def fake_worker(idx, inner_idx, provider, patient_info):
+        await asyncio.sleep(0.01 * (2 - inner_idx))
+        return provider, ProviderConfirmationInfo(
+            is_in_network=True, available_timeslot=[provider.id]
+        )
+
+    monkeypatch.setattr(
+        provider_service, "iter_provider_recommendations", fake_recommendations
+    )
+    monkeypatch.setattr(provider_service, "connect_provider_worker", fake_worker)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/providers/recommend/stream", json=REQUEST)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+
+    assert [e["event"] for e in events[:2]] == ["recommendation", "recommendation"]
+    assert events[-1] == {"event": "done"}
+    confirmations = [e for e in events if e["event"] == "confirmation"]
+    assert len(confirmations) == 4
+    # Faster calls are reported first
+    assert confirmations[0]["provider_index"] == 1
+    first = next(e for e in confirmations if e["index"] == 0 and e["provider_index"] == 0)
+    assert first["data"]["available_timeslot"] == ["Pulmonary disease-0"]
+
+
+@pytest.mark.asyncio
+async def test_job_mode_returns_immediately_and_fills_in(monkeypatch):
+    release = asyncio.Event()
+
+    async def fake_recommendations(zip_code, symptom_description, radius):
+        yield ProviderRecommendations(
+            specialty="Pulmonary disease",
+            provider_infos=[ProviderInfo(id=str(i)) for i in range(2)],
+        )
+
+    async def fake_worker(idx, inner_idx, provider, patient_info):
+        if inner_idx == 1:
+            await release.wait()
+        return provider, ProviderConfirmationInfo(
+            is_in_network=True, available_timeslot=[provider.id]
+        )
+
+    monkeypatch.setattr(
+        provider_service, "iter_provider_recommendations", fake_recommendations
+    )
+    monkeypatch.setattr(provider_service, "connect_provider_worker", fake_worker)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/providers/recommend/jobs", json=REQUEST)
+        assert response.status_code == 202
+        job_id = response.json()["job_id"]
+
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            job = (await client.get(f"/providers/recommend/jobs/{job_id}")).json()
+            if job["recommendations"] and job["recommendations"][0][
+                "provider_confirmation_infos"
+            ][0]:
+                break
+        assert job["status"] == "running"
+        assert job["recommendations"][0]["provider_confirmation_infos"][1] is None
+
+        release.set()
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            job = (await client.get(f"/providers/recommend/jobs/{job_id}")).json()
+            if job["status"] != "running":
+                break
+        assert job["status"] == "complete"
+        confirmations = job["recommendations"][0]["provider_confirmation_infos"]
+        assert [c["available_timeslot"] for c in confirmations] == [["0"], ["1"]]
+
+        missing = await client.get("/providers/recommend/jobs/nope")
+        assert missing.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_jobs_are_rejected_while_the_store_is_full(monkeypatch):
+    release = asyncio.Event()
+
+    async def fake_recommendations(zip_code, symptom_description, radius):
+        await release.wait()
+        return
+        yield
+
+    monkeypatch.setattr(
+        provider_service, "iter_provider_recommendations", fake_recommendations
+    )
+    store = JobStore(max_jobs=1)
+    monkeypatch.setattr("app.routers.providers.job_store", store)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        first = await client.post("/providers/recommend/jobs", json=REQUEST)
+        rejected = await client.post("/providers/recommend/jobs", json=REQUEST)
+        release.set()
+        for _ in range(20):
+            await asyncio.sleep(0.01)
+            if store.stats()["running"] == 0:
+                break
+        accepted = await client.post("/providers/recommend/jobs", json=REQUEST)
+    assert first.status_code == 202
+    assert rejected.status_code == 503
+    assert "retry-after" in rejected.headers
+    assert accepted.status_code == 202
+    await store.aclose()
+
+
+@pytest.mark.asyncio
+async def test_buffered_recommend_returns_503_when_calls_cannot_be_queued(monkeypatch):
+    async def fake_recommend(zip_code, symptom_description, radius, timings=None):
+        return [
+            ProviderRecommendations(
+                specialty="Pulmonary disease", provider_infos=[ProviderInfo(id="0")]
+            )
+        ]
+
+    async def busy(idx, providers, patient_info):
+        raise SchedulerBusyError("queue is full")
+
+    monkeypatch.setattr("app.routers.providers.recommend_providers", fake_recommend)
+    monkeypatch.setattr("app.routers.providers.connect_providers", busy)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/providers/recommend", json=REQUEST)
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+
+@pytest.mark.asyncio
+async def test_refused_call_cancels_the_other_specialties_calls(monkeypatch):
+    async def fake_recommend(zip_code, symptom_description, radius, timings=None):
+        return [
+            ProviderRecommendations(
+                specialty=specialty, provider_infos=[ProviderInfo(id="0")]
+            )
+            for specialty in ("Pulmonary disease", "Internal medicine")
+        ]
+
+    cancelled = []
+
+    async def connect(idx, providers, patient_info):
+        if idx == 1:
+            await asyncio.sleep(0)
+            raise SchedulerBusyError("queue is full")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(idx)
+            raise
+
+    monkeypatch.setattr("app.routers.providers.recommend_providers", fake_recommend)
+    monkeypatch.setattr("app.routers.providers.connect_providers", connect)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post("/providers/recommend", json=REQUEST)
+    assert response.status_code == 503
+    assert cancelled == [0]
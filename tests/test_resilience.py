@@ -0,0 +1,173 @@
+"""
+Tests for circuit breakers and adaptive concurrency limits.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.main import app
+from app.utils.resilience import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    AdaptiveLimiter,
+    CircuitBreaker,
+    CircuitOpenError,
+    ConcurrencyLimitExceededError,
+    DependencyGuard,
+    is_dependency_failure,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+async def fail(guard):
+    with pytest.raises(httpx.ConnectError):
+        async with guard.protect():
+            raise httpx.ConnectError("upstream down")
+
+
+def status_error(status_code):
+    request = httpx.Request("POST", "http://llm")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status_code, request=request)
+    )
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens_fails_fast_and_recovers():
+    clock = FakeClock()
+    guard = DependencyGuard(
+        "llm",
+        breaker=CircuitBreaker(failure_threshold=2, reset_timeout_seconds=10, clock=clock),
+    )
+    await fail(guard)
+    assert guard.breaker.state == CIRCUIT_CLOSED
+    await fail(guard)
+    assert guard.breaker.state == CIRCUIT_OPEN
+
+    with pytest.raises(CircuitOpenError):
+        async with guard.protect():
+            pytest.fail("call should not run while the circuit is open")
+
+    clock.now = 10
+    assert guard.breaker.state == CIRCUIT_HALF_OPEN
+    # A failed probe reopens the circuit straight away
+    await fail(guard)
+    assert guard.breaker.state == CIRCUIT_OPEN
+
+    clock.now = 20
+    async with guard.protect():
+        pass
+    assert guard.breaker.state == CIRCUIT_CLOSED
+    assert guard.stats()["circuit"]["times_opened"] == 2
+
+
+@pytest.mark.asyncio
+async def test_half_open_lets_one_probe_through():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_seconds=1, clock=clock)
+    breaker.record_failure()
+    clock.now = 1
+    assert breaker.allow()
+    assert not breaker.allow()
+
+
+def test_limiter_additive_increase_multiplicative_decrease():
+    limiter = AdaptiveLimiter(initial_limit=10, min_limit=2, latency_threshold_seconds=1.0)
+    for _ in range(10):
+        assert limiter.try_acquire()
+        limiter.release(0.1, succeeded=True)
+    assert limiter.limit == 10  # about one slot per window of successes
+    assert limiter.try_acquire()
+    limiter.release(0.1, succeeded=True)
+    assert limiter.limit == 11
+
+    assert limiter.try_acquire()
+    limiter.release(5.0, succeeded=True)  # too slow
+    assert limiter.limit == 9
+    for _ in range(30):
+        limiter.try_acquire()
+        limiter.release(0.1, succeeded=False)
+    assert limiter.limit == 2
+
+
+@pytest.mark.asyncio
+async def test_guard_sheds_load_beyond_limit():
+    guard = DependencyGuard("care_compare", limiter=AdaptiveLimiter(initial_limit=2))
+    release = asyncio.Event()
+
+    async def call():
+        async with guard.protect():
+            await release.wait()
+
+    tasks = [asyncio.create_task(call()) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(ConcurrencyLimitExceededError):
+        async with guard.protect():
+            pass
+    release.set()
+    await asyncio.gather(*tasks)
+    assert guard.stats()["concurrency"] == {"limit": 2, "in_flight": 0, "rejected": 1}
+    # Shedding load does not count against the dependency's health
+    assert guard.breaker.state == CIRCUIT_CLOSED
+
+
+@pytest.mark.asyncio
+async def test_status_endpoint_lists_dependencies():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/status")
+    body = response.json()
+    assert set(body["dependencies"]) == {"llm", "care_compare", "call_api"}
+    assert body["dependencies"]["llm"]["circuit"]["state"] in (
+        CIRCUIT_CLOSED,
+        CIRCUIT_OPEN,
+        CIRCUIT_HALF_OPEN,
+    )
+
+
+def test_only_upstream_errors_count_as_failures():
+    assert is_dependency_failure(httpx.ConnectError("down"))
+    assert is_dependency_failure(httpx.ReadTimeout("slow"))
+    assert is_dependency_failure(asyncio.TimeoutError())
+    assert is_dependency_failure(status_error(503))
+    assert not is_dependency_failure(status_error(404))
+    assert not is_dependency_failure(KeyError("call_id"))
+    assert not is_dependency_failure(ValueError("bad JSON"))
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_open_the_breaker():
+    guard = DependencyGuard("call_api", breaker=CircuitBreaker(failure_threshold=1))
+    for error in (status_error(400), KeyError("call_id")):
+        with pytest.raises(type(error)):
+            async with guard.protect():
+                raise error
+    assert guard.breaker.state == CIRCUIT_CLOSED
+    assert guard.failures == 0
+    with pytest.raises(httpx.HTTPStatusError):
+        async with guard.protect():
+            raise status_error(502)
+    assert guard.breaker.state == CIRCUIT_OPEN
+
+
+@pytest.mark.asyncio
+async def test_latency_stops_at_the_response():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial_limit=10, latency_threshold_seconds=1.0)
+    guard = DependencyGuard("llm", limiter=limiter, clock=clock)
+    async with guard.protect() as call:
+        clock.now = 0.5
+        call.responded()
+        # A slow consumer of the stream is not upstream latency
+        clock.now = 5.0
+    assert limiter.limit == 10
+    assert call.latency() == 0.5
@@ -0,0 +1,57 @@
+"""
+Tests for the symptom to specialty cache.
+"""
+from app.utils.semantic_cache import SymptomCache
+
+CHEST = [("Cardiovascular disease (cardiology)", "Heart related.", "High")]
+SKIN = [("Dermatology", "Skin related.", "High")]
+
+
+def test_exact_and_near_hits():
+    cache = SymptomCache(similarity_threshold=0.6)
+    cache.put("Chest pain when climbing stairs", CHEST)
+    cache.put("Itchy red rash on my arms", SKIN)
+
+    assert cache.get("chest pain when climbing stairs!") == CHEST
+    assert cache.get("I get chest pains climbing the stairs") == CHEST
+    assert cache.get("Blurry vision at night") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["near_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_eviction_and_persistence(tmp_path):
+    path = tmp_path / "symptoms.json"
+    cache = SymptomCache(max_entries=1, similarity_threshold=None, path=path)
+    cache.put("Chest pain when climbing stairs", CHEST)
+    cache.put("Itchy red rash on my arms", SKIN)
+    assert len(cache) == 1
+    assert cache.get("Chest pain when climbing stairs") is None
+    cache.save()
+
+    restored = SymptomCache(path=path)
+    assert restored.load()
+    assert restored.get("itchy red rash on my arms") == SKIN
+
+
+def test_merge_keeps_entries_cached_since_startup(tmp_path):
+    path = tmp_path / "symptoms.json"
+    saved = SymptomCache(path=path)
+    saved.put("Itchy red rash on my arms", SKIN)
+    saved.save()
+
+    cache = SymptomCache(path=path)
+    data = cache.read()
+    cache.put("Itchy red rash on my arms", CHEST)
+    cache.merge(data)
+    assert cache.get("itchy red rash on my arms") == CHEST
+    assert SymptomCache(path=tmp_path / "missing.json").read() is None
+
+
+def test_negation_is_not_a_near_hit_at_default_threshold():
+    cache = SymptomCache()
+    cache.put("Chest pain when climbing stairs", CHEST)
+    cache.put("Itchy red rash on my arms", SKIN)
+    assert cache.get("I get chest pains when climbing the stairs") == CHEST
+    assert cache.get("No chest pain when climbing stairs") is None
+    assert cache.get("Not an itchy red rash on my arms") is None
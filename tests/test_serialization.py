@@ -0,0 +1,111 @@
+"""
+Tests for fast recommendation response encoding and field projection.
+"""
+import gzip
+import json
+
+import httpx
+import pytest
+
+from app.main import app
+from app.models.schemas import (
+    ProviderConfirmationInfo,
+    ProviderInfo,
+    ProviderRecommendations,
+)
+from app.routers import providers
+from app.utils.serialization import (
+    dump_recommendations,
+    encode_response,
+    parse_fields,
+)
+
+REQUEST = {
+    "zipCode": 94105,
+    "symptomDescription": "rash",
+    "patientInfo": {
+        "name": "Jane Doe",
+        "policyNum": "123",
+        "insuranceCompany": "Medicare",
+        "dateTimeRange": "05-20 14:00-16:00",
+    },
+}
+
+
+def make_recommendation(count=2):
+    return ProviderRecommendations(
+        specialty="Dermatology",
+        provider_infos=[
+            ProviderInfo(
+                id=str(i),
+                name=f"Dr. {i}",
+                distance=float(i),
+                sortName=f"{i}, Dr.",
+                physician={"phone": f"555{i}", "addressLine1": f"{i} Main St"},
+                extraField="kept",
+            )
+            for i in range(count)
+        ],
+    )
+
+
+def test_matches_response_model_output():
+    recommendation = make_recommendation()
+    assert dump_recommendations([recommendation]) == [
+        recommendation.model_dump(mode="json", by_alias=True)
+    ]
+
+
+def test_projection_keeps_selected_and_nested_fields():
+    data = dump_recommendations(
+        [make_recommendation()], parse_fields("id, name,physician.phone,unknown")
+    )
+    assert data[0]["provider_infos"][1] == {
+        "id": "1",
+        "name": "Dr. 1",
+        "physician": {"phone": "5551"},
+    }
+    assert data[0]["specialty"] == "Dermatology"
+    assert parse_fields(" , ") is None
+
+
+def test_large_bodies_are_compressed_when_accepted():
+    data = dump_recommendations([make_recommendation(50)])
+    response = encode_response(data, accept_encoding="gzip, deflate")
+    assert response.headers["content-encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.body)) == data
+
+    assert "content-encoding" not in encode_response(data, accept_encoding="gzip;q=0").headers
+    small = encode_response({"ok": True}, accept_encoding="gzip")
+    assert "content-encoding" not in small.headers
+
+
+@pytest.mark.asyncio
+async def test_recommend_endpoint_projects_fields(monkeypatch):
+    async def fake_recommend(zip_code, symptom_description, radius, timings=None):
+        timings["geocode"] = {"start_ms": 0.0, "duration_ms": 1.5}
+        return [make_recommendation()]
+
+    async def fake_connect(idx, provider_infos, patient_info):
+        return [
+            (provider, ProviderConfirmationInfo(is_in_network=True, available_timeslot=[]))
+            for provider in provider_infos
+        ]
+
+    monkeypatch.setattr(providers, "recommend_providers", fake_recommend)
+    monkeypatch.setattr(providers, "connect_providers", fake_connect)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.post(
+            "/providers/recommend", params={"fields": "name,distance"}, json=REQUEST
+        )
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"] == "geocode;dur=1.5"
+    body = response.json()
+    assert body[0]["provider_infos"] == [
+        {"name": "Dr. 0", "distance": 0.0},
+        {"name": "Dr. 1", "distance": 1.0},
+    ]
+    assert body[0]["provider_confirmation_infos"][0]["is_in_network"] is True
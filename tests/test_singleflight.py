@@ -0,0 +1,102 @@
+"""
+Tests for coalescing identical in-flight calls.
+"""
+import asyncio
+
+import pytest
+
+from app.models.schemas import Location
+from app.services import provider_service
+from app.utils.singleflight import SingleFlight, key_digest
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight("test")
+    executions = 0
+
+    async def fetch():
+        nonlocal executions
+        executions += 1
+        await asyncio.sleep(0.01)
+        return ["result"]
+
+    results = await asyncio.gather(*[flight.do("key", fetch) for _ in range(5)])
+    assert results == [["result"]] * 5
+    assert executions == 1
+    stats = flight.stats()
+    assert (stats["leaders"], stats["deduplicated"], stats["in_flight"]) == (1, 4, 0)
+    assert stats["top_keys"] == [{"key": key_digest("key"), "deduplicated": 4}]
+
+    # Once finished, the next call runs again
+    await flight.do("key", fetch)
+    assert executions == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_reach_every_caller_and_cancellation_is_isolated():
+    flight = SingleFlight("test")
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        raise RuntimeError("upstream down")
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    release.set()
+    with pytest.raises(RuntimeError):
+        await second
+
+
+@pytest.mark.asyncio
+async def test_followers_replay_and_follow_a_shared_stream():
+    flight = SingleFlight("test")
+    starts = 0
+    step = asyncio.Event()
+
+    async def produce():
+        nonlocal starts
+        starts += 1
+        yield 1
+        await step.wait()
+        yield 2
+
+    async def consume():
+        return [item async for item in flight.stream("key", produce)]
+
+    leader = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    follower = asyncio.create_task(consume())
+    await asyncio.sleep(0.01)
+    step.set()
+    assert await leader == [1, 2]
+    assert await follower == [1, 2]
+    assert starts == 1
+
+
+@pytest.mark.asyncio
+async def test_provider_search_is_coalesced(monkeypatch):
+    calls = 0
+
+    async def fake_fetch(location, radius, *args):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return []
+
+    monkeypatch.setattr(provider_service, "_fetch_remote_providers", fake_fetch)
+    monkeypatch.setattr(
+        provider_service, "provider_search_flight", SingleFlight("provider_search")
+    )
+    provider_service.provider_search_cache.clear()
+    location = Location(latitude=37.79, longitude=-122.39)
+    await asyncio.gather(
+        *[
+            provider_service.get_providers_by_location(location, 25.0, source="remote")
+            for _ in range(3)
+        ]
+    )
+    assert calls == 1
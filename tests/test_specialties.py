@@ -0,0 +1,54 @@
+"""
+Tests for specialty normalization and selecting providers by specialty.
+"""
+from app.utils.provider_table import ProviderRow, ProviderTable
+from app.utils.specialties import SpecialtyCatalog, normalize_specialty_name
+
+
+def _provider(provider_id, distance, *specialties):
+    return {
+        "id": provider_id,
+        "distance": distance,
+        "physician": {"specialties": [dict(s) for s in specialties]},
+    }
+
+
+def test_normalize_specialty_name():
+    assert normalize_specialty_name("Internal  Medicine") == "internal medicine"
+    assert normalize_specialty_name("Obstetrics/Gynecology") == "obstetrics gynecology"
+
+
+def test_catalog_resolves_names_aliases_and_ids():
+    catalog = SpecialtyCatalog.load()
+    internal = catalog.resolve("Internal medicine")
+    assert internal == "11"
+    assert catalog.resolve("INTERNAL MEDICINE") == internal
+    assert catalog.resolve("11") == internal
+    cardiology = catalog.resolve("Cardiovascular disease (cardiology)")
+    assert catalog.resolve("Cardiology") == cardiology
+    assert catalog.resolve("cardiovascular disease") == cardiology
+    assert catalog.resolve("Family medicine") == catalog.resolve("Family practice")
+    assert catalog.resolve("Astrology") is None
+
+
+def test_provider_index_select():
+    catalog = SpecialtyCatalog.load()
+    providers = [
+        _provider("a", 1.0, {"specialtyName": "Internal medicine", "specialtyId": "11"}),
+        _provider("b", 2.0, {"specialtyName": "Dermatology"}),
+        _provider(
+            "c",
+            3.0,
+            {"specialtyName": "Internal Medicine"},
+            {"specialtyName": "Internal medicine", "specialtyId": "11"},
+        ),
+        _provider("d", 4.0, {"specialtyName": "Made up specialty"}),
+    ]
+    index = ProviderTable(
+        [ProviderRow.from_record(provider, catalog) for provider in providers], catalog
+    )
+    assert [p.id for p in index.select("internal medicine")] == ["a", "c"]
+    assert [p.id for p in index.select("Internal Medicine", k=1)] == ["a"]
+    assert [p.id for p in index.select("dermatologist")] == ["b"]
+    assert [p.id for p in index.select("Made Up Specialty")] == ["d"]
+    assert index.count("Neurology") == 0
@@ -0,0 +1,73 @@
+"""
+Tests for tiered symptom to specialty routing.
+"""
+import pytest
+
+from app.services.specialty_router import SpecialtyRouter
+from app.utils.semantic_cache import SymptomCache
+from app.utils.specialties import SpecialtyCatalog
+from app.utils.specialty_classifier import (
+    SpecialtyClassifier,
+    append_decision,
+    read_decision_log,
+)
+
+DECISIONS = [
+    {"symptom_description": "itchy red rash on my skin", "specialties": ["Dermatology"]},
+    {"symptom_description": "rash and itchy skin patches", "specialties": ["Dermatology"]},
+]
+
+
+@pytest.fixture
+def catalog():
+    return SpecialtyCatalog.load()
+
+
+@pytest.mark.asyncio
+async def test_route_tiers(catalog, tmp_path):
+    llm_calls = []
+
+    async def fake_llm(symptom_description):
+        llm_calls.append(symptom_description)
+        return [("Cardiology", "Heart related.", "High")]
+
+    log_path = tmp_path / "decisions.jsonl"
+    router = SpecialtyRouter(
+        classifier=SpecialtyClassifier.train(catalog.specialties, DECISIONS),
+        catalog=catalog,
+        llm_mapper=fake_llm,
+        cache=SymptomCache(),
+        decision_log_path=str(log_path),
+    )
+
+    assert router.peek("chest pain when climbing stairs") is None
+    assert router.peek("itchy rash on my skin")[0][0] == "Dermatology"
+
+    routing = await router.route("itchy rash on my skin")
+    assert routing.tier == "classifier"
+    assert routing.results[0][0] == "Dermatology"
+
+    routing = await router.route("chest pain when climbing stairs")
+    assert routing.tier == "llm"
+    assert routing.results == [("Cardiology", "Heart related.", "High")]
+
+    assert router.peek("Chest pain when climbing stairs")[0][0] == "Cardiology"
+    routing = await router.route("Chest pain when climbing stairs")
+    assert routing.tier == "cache"
+    assert len(llm_calls) == 1
+
+    await router.flush_decision_log()
+    logged = read_decision_log(log_path)
+    assert logged[0]["specialties"] == ["Cardiovascular disease (cardiology)"]
+    assert router.stats()["tiers"] == {"cache": 1, "classifier": 1, "llm": 1}
+
+
+def test_decision_log_rotates_at_max_bytes(tmp_path):
+    log_path = tmp_path / "decisions.jsonl"
+    append_decision(log_path, "itchy rash", ["Dermatology"], max_bytes=120)
+    append_decision(log_path, "chest pain on stairs", ["Cardiology"], max_bytes=120)
+    append_decision(log_path, "blurry vision", ["Ophthalmology"], max_bytes=120)
+
+    rotated = read_decision_log(f"{log_path}.1")
+    assert [d["specialties"] for d in rotated] == [["Dermatology"], ["Cardiology"]]
+    assert read_decision_log(log_path)[0]["symptom_description"] == "blurry vision"
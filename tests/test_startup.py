@@ -0,0 +1,123 @@
+"""
+Tests for startup warm-up and the /ready endpoint.
+"""
+import httpx
+import pytest
+
+from app.main import app
+from app.models.schemas import Location
+from app.services import startup
+from app.services.provider_service import get_location_from_zip
+from app.services.startup import StartupState, startup_state, warm_up, warm_zip_codes
+from app.utils import geocoding
+from app.utils.specialty_classifier import append_decision
+
+
+async def get_ready():
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get("/ready")
+
+
+@pytest.mark.asyncio
+async def test_ready_only_after_warm_up(monkeypatch, tmp_path):
+    monkeypatch.setattr(startup, "get_zip_index", lambda: None)
+    monkeypatch.setattr(
+        startup.specialty_router, "decision_log_path", str(tmp_path / "decisions.jsonl")
+    )
+    monkeypatch.setattr(
+        startup.specialty_router, "classifier", startup.specialty_router.classifier
+    )
+    startup_state.begin()
+    response = await get_ready()
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    await warm_up(startup_state, [], 25, "remote")
+    response = await get_ready()
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "ready"
+    assert body["steps"]["zip_index"]["status"] == "ok"
+    assert body["steps"]["specialty_classifier"]["status"] == "ok"
+    assert body["seconds_to_ready"] is not None
+
+
+@pytest.mark.asyncio
+async def test_specialty_classifier_learns_logged_decisions_at_warm_up(
+    monkeypatch, tmp_path
+):
+    log_path = tmp_path / "decisions.jsonl"
+    symptom = "zorbly flimflam"
+    for _ in range(3):
+        append_decision(log_path, symptom, ["Dermatology"])
+    router = startup.specialty_router
+    monkeypatch.setattr(router, "decision_log_path", str(log_path))
+    monkeypatch.setattr(router, "classifier", router.classifier)
+    assert router.classifier.predict(symptom) == []
+
+    await startup.load_specialty_classifier()
+    assert router.classifier.predict(symptom)[0][0] == "Dermatology"
+
+
+@pytest.mark.asyncio
+async def test_failed_required_step_is_not_ready():
+    state = StartupState()
+
+    async def fail():
+        raise OSError("no zip code index")
+
+    async def succeed():
+        return None
+
+    await state.run_step("zip_index", fail)
+    await state.run_step("symptom_cache", succeed, required=False)
+    state.finish()
+    stats = state.stats()
+    assert not state.ready
+    assert stats["status"] == "failed"
+    assert stats["steps"]["zip_index"]["error"] == "no zip code index"
+
+
+@pytest.mark.asyncio
+async def test_warm_zip_codes_searches_widest_radius(monkeypatch):
+    searches = []
+
+    async def fake_location(zip_code):
+        if zip_code == "00000":
+            raise ValueError("unknown zip code")
+        return Location(latitude=37.79, longitude=-122.39)
+
+    async def fake_search(location, radius, source):
+        searches.append(radius)
+        return []
+
+    monkeypatch.setattr(startup, "get_location_from_zip", fake_location)
+    monkeypatch.setattr(startup, "search_providers", fake_search)
+
+    assert await warm_zip_codes(["94105", "00000", "10001"], 25, "remote") == 2
+    # Searches stop at the requested radius unless widening is enabled
+    assert searches == [25, 25]
+    assert await warm_zip_codes(["94105"], 25, "local") == 0
+
+
+@pytest.mark.asyncio
+async def test_local_source_needs_the_provider_snapshot(monkeypatch, tmp_path):
+    monkeypatch.setattr(startup, "get_zip_index", lambda: None)
+    monkeypatch.setattr(
+        startup.provider_store, "snapshot_path", tmp_path / "providers.jsonl"
+    )
+    state = StartupState()
+    await warm_up(state, [], 25, "local")
+    stats = state.stats()
+    assert stats["status"] == "failed"
+    assert stats["steps"]["provider_snapshot"]["status"] == "failed"
+    await warm_up(state, [], 25, "remote")
+    assert state.ready
+
+
+@pytest.mark.asyncio
+async def test_geocoding_fails_fast_until_the_index_is_loaded(monkeypatch):
+    monkeypatch.setattr(geocoding, "_zip_index", None)
+    with pytest.raises(ValueError):
+        await get_location_from_zip("94105")
@@ -0,0 +1,79 @@
+"""
+Tests for the LLM and Care Compare stand-ins used by the offline benchmark.
+"""
+import httpx
+import pytest
+
+from app.models.schemas import Location
+from app.stubs import care_compare, llm
+from app.stubs.behavior import UpstreamBehavior
+from app.utils.care_compare import CareCompareClient
+from app.utils.llm_client import LLMClient, process_json_response
+
+
+def llm_client(stub):
+    return LLMClient(
+        api_key="test",
+        url="http://llm" + llm.CHAT_COMPLETIONS_PATH,
+        transport=httpx.ASGITransport(app=stub),
+    )
+
+
+@pytest.mark.asyncio
+async def test_llm_stand_in_answers_compact_prompt_streamed_and_not():
+    client = llm_client(llm.create_app(chunk_chars=4))
+    prompt = "Specialties (id: name - description):\n7: Dermatology - Skin\n3: Allergy - x\nSymptoms: rash\n"
+    messages = [{"role": "user", "content": prompt}]
+
+    response = await client.make_chat_completions_request("m", messages, 0, 100)
+    answer = process_json_response(response)
+    assert [item["RECOMMENDED_SPECIALTY"] for item in answer] == [7, 3]
+
+    chunks = [chunk async for chunk in client.stream_chat_completions("m", messages, 0, 100)]
+    assert len(chunks) > 1
+    assert "".join(chunks) == response["choices"][0]["message"]["content"]
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_llm_stand_in_injects_errors():
+    stub = llm.create_app(UpstreamBehavior(error_rate=1.0, seed=0))
+    client = llm_client(stub)
+    with pytest.raises(httpx.HTTPStatusError):
+        await client.make_chat_completions_request("m", [{"role": "user", "content": "x"}], 0, 1)
+    assert stub.state.behavior.stats() == {"requests": 1, "errors": 1}
+    await client.aclose()
+
+
+def test_batched_transcript_answer_has_one_entry_per_transcript():
+    content = llm.answer_for(
+        [{"role": "user", "content": "Here are 3 transcriptions of assistant and user calls."}]
+    )
+    assert content.count('"index"') == 3
+
+
+@pytest.mark.asyncio
+async def test_care_compare_stand_in_is_closest_first_and_deterministic():
+    client = CareCompareClient(
+        url="http://care-compare" + care_compare.PROVIDER_SEARCH_PATH,
+        transport=httpx.ASGITransport(
+            app=care_compare.create_app(providers_per_square_mile=1.0, chunk_bytes=1024)
+        ),
+    )
+    location = Location(latitude=37.79, longitude=-122.39)
+    first = await client.search(location, 5)
+    second = await client.search(location, 5)
+    await client.aclose()
+
+    distances = [record["distance"] for record in first.records]
+    assert first.complete and len(distances) == 78
+    assert distances == sorted(distances) and distances[-1] <= 5
+    assert first.records == second.records
+
+
+def test_latency_spec():
+    behavior = UpstreamBehavior.from_spec("100:400:0.05", seed=1)
+    draws = sorted(behavior.latency() for _ in range(2000))
+    assert 0.08 < draws[1000] < 0.12
+    assert 0.3 < draws[1980] < 0.5
+    assert behavior.error_rate == 0.05
@@ -0,0 +1,80 @@
+"""
+Tests for rule-based transcript extraction.
+"""
+import json
+from datetime import date
+
+import pytest
+
+from app.services.provider_service import parse_transcript
+from app.stubs.call_api import TRANSCRIPT_FIXTURE_PATH
+from app.utils.transcript_parser import TranscriptFastPath, extract_confirmation
+
+# A Saturday
+TODAY = date(2025, 5, 17)
+QUESTION = "Could you tell me what appointment times you have open, and do you accept Aetna insurance?"
+
+
+def call(*replies):
+    logs = [{"role": None, "text": None}, {"role": "assistant", "text": QUESTION}]
+    logs += [{"role": "user", "text": reply} for reply in replies]
+    return {"pathway_logs": logs}
+
+
+def test_recorded_transcript():
+    with open(TRANSCRIPT_FIXTURE_PATH) as f:
+        recorded = json.load(f)
+    confirmation = extract_confirmation(recorded, TODAY)
+    assert confirmation.is_in_network
+    assert confirmation.available_timeslot == ["2025-05-18 10:00 - 11:00"]
+
+    transcript = parse_transcript(recorded)
+    assert transcript.startswith("assistant: Hi there")
+    assert "user: 10 o'clock to 11. In the morning.\n" in transcript
+    assert "None" not in transcript
+
+
+@pytest.mark.parametrize(
+    "replies, in_network, slots",
+    [
+        (["Yes we accept it. We have Tuesday at 3pm."], True, ["2025-05-20 15:00 - 16:00"]),
+        (["We don't take that insurance, sorry.", "We're fully booked."], False, []),
+        (
+            ["We're out of network. Thursday 9:30 to 10:15 a.m. and Friday 2-4pm"],
+            False,
+            ["2025-05-22 09:30 - 10:15", "2025-05-23 14:00 - 16:00"],
+        ),
+        (["Yep, in network.", "Tomorrow afternoon at 2"], True, ["2025-05-18 14:00 - 15:00"]),
+    ],
+)
+def test_formulaic_replies(replies, in_network, slots):
+    confirmation = extract_confirmation(call(*replies), TODAY)
+    assert confirmation.is_in_network is in_network
+    assert confirmation.available_timeslot == slots
+
+
+@pytest.mark.parametrize(
+    "replies",
+    [
+        ["Let me check, can you hold?"],
+        ["Yes we take it. We have 3 openings on Tuesday."],
+        ["We take Aetna.", "We don't take the PPO plan. Tuesday at 3pm."],
+        ["Yes, in network. Monday and Tuesday at 3pm."],
+        ["Yes, in network. We can do 3pm."],
+        # The rules can't tell which of the named plans the patient has
+        ["We take Aetna and Medicare but not Blue Cross.", "Tuesday at 3pm."],
+        ["We're in network with most plans except Blue Shield.", "Tuesday at 3pm."],
+        # The refused slot must not be reported as offered
+        ["Yes, in network.", "No, Monday at 9am is taken, but Tuesday at 2pm works."],
+        ["Yes, in network.", "Monday at 9am doesn't work, we're booked."],
+    ],
+)
+def test_ambiguous_replies_fall_back(replies):
+    assert extract_confirmation(call(*replies), TODAY) is None
+
+
+def test_hit_rate():
+    fast_path = TranscriptFastPath()
+    fast_path.extract(call("Yes we take it, Monday at 9am."), TODAY)
+    fast_path.extract(call("Hmm."), TODAY)
+    assert fast_path.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}